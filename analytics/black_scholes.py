@@ -0,0 +1,117 @@
+# region imports
+from AlgorithmImports import *
+import numpy as np
+from scipy.special import ndtr
+# endregion
+
+class BlackScholes:
+    """
+    Vectorized Black-Scholes pricing, greeks and implied volatility.
+    Every argument may be a scalar or an array; they broadcast together.
+    t is in years, sigma / r / q are annualized decimals.
+    Greek conventions follow LEAN: theta per year (theta / 365 = per day), vega per 1 vol point.
+    """
+    SQRT_2PI = np.sqrt(2.0 * np.pi)
+    MIN_T = 1.0 / (365.0 * 24.0 * 60.0)  # one minute
+    MIN_SIGMA = 1e-4
+    MAX_SIGMA = 5.0
+
+    @staticmethod
+    def _d1_d2(s, k, t, sigma, r, q):
+        sqrt_t = np.sqrt(t)
+        vol_t = sigma * sqrt_t
+        d1 = (np.log(s / k) + (r - q + 0.5 * sigma * sigma) * t) / vol_t
+        return d1, d1 - vol_t, sqrt_t
+
+    @staticmethod
+    def _pdf(x):
+        return np.exp(-0.5 * x * x) / BlackScholes.SQRT_2PI
+
+    @staticmethod
+    def price(s, k, t, sigma, is_call, r=0.0, q=0.0) -> np.ndarray:
+        s, k, sigma, is_call = np.asarray(s, np.float64), np.asarray(k, np.float64), np.asarray(sigma, np.float64), np.asarray(is_call, bool)
+        t = np.maximum(np.asarray(t, np.float64), BlackScholes.MIN_T)
+        d1, d2, _ = BlackScholes._d1_d2(s, k, t, sigma, r, q)
+        df_r = np.exp(-r * t)
+        df_q = np.exp(-q * t)
+        call = s * df_q * ndtr(d1) - k * df_r * ndtr(d2)
+        put = k * df_r * ndtr(-d2) - s * df_q * ndtr(-d1)
+        return np.where(is_call, call, put)
+
+    @staticmethod
+    def _price_vega(s, k, t, sigma, is_call, df_r, df_q, r, q):
+        """Price and raw vega (per 1.00 of vol), the two quantities the IV solver needs"""
+        d1, d2, sqrt_t = BlackScholes._d1_d2(s, k, t, sigma, r, q)
+        sign = np.where(is_call, 1.0, -1.0)
+        price = sign * (s * df_q * ndtr(sign * d1) - k * df_r * ndtr(sign * d2))
+        vega = s * df_q * BlackScholes._pdf(d1) * sqrt_t
+        return price, vega
+
+    @staticmethod
+    def greeks(s, k, t, sigma, is_call, r=0.0, q=0.0) -> dict[str, np.ndarray]:
+        """Returns {"price", "delta", "gamma", "theta", "vega"} arrays"""
+        s, k, sigma, is_call = np.asarray(s, np.float64), np.asarray(k, np.float64), np.asarray(sigma, np.float64), np.asarray(is_call, bool)
+        t = np.maximum(np.asarray(t, np.float64), BlackScholes.MIN_T)
+        d1, d2, sqrt_t = BlackScholes._d1_d2(s, k, t, sigma, r, q)
+        df_r = np.exp(-r * t)
+        df_q = np.exp(-q * t)
+        pdf_d1 = BlackScholes._pdf(d1)
+        nd1, nd2 = ndtr(d1), ndtr(d2)
+        n_d1, n_d2 = 1.0 - nd1, 1.0 - nd2
+
+        price = np.where(is_call, s * df_q * nd1 - k * df_r * nd2, k * df_r * n_d2 - s * df_q * n_d1)
+        delta = np.where(is_call, df_q * nd1, -df_q * n_d1)
+        gamma = df_q * pdf_d1 / (s * sigma * sqrt_t)
+        decay = -s * df_q * pdf_d1 * sigma / (2.0 * sqrt_t)
+        theta = np.where(is_call,
+            decay - r * k * df_r * nd2 + q * s * df_q * nd1,
+            decay + r * k * df_r * n_d2 - q * s * df_q * n_d1)
+        vega = s * df_q * pdf_d1 * sqrt_t / 100.0
+        return {"price": price, "delta": delta, "gamma": gamma, "theta": theta, "vega": vega}
+
+    @staticmethod
+    def implied_vol(price, s, k, t, is_call, r=0.0, q=0.0, tol: float = 1e-6, max_iter: int = 50) -> np.ndarray:
+        """
+        Vectorized safeguarded Newton solver. Each element keeps a [lo, hi] bracket;
+        a Newton step that leaves the bracket (or has no vega to work with) falls back
+        to bisection, so every element converges like Brent/bisection in the worst case.
+        Prices outside the no-arbitrage bounds come back as NaN.
+        """
+        price, s, k, t, is_call = np.broadcast_arrays(
+            np.asarray(price, np.float64), np.asarray(s, np.float64), np.asarray(k, np.float64),
+            np.maximum(np.asarray(t, np.float64), BlackScholes.MIN_T), np.asarray(is_call, bool))
+        shape = price.shape
+        price, s, k, t, is_call = (np.atleast_1d(a).ravel() for a in (price, s, k, t, is_call))
+        df_r = np.exp(-r * t)
+        df_q = np.exp(-q * t)
+
+        intrinsic = np.where(is_call, np.maximum(s * df_q - k * df_r, 0.0), np.maximum(k * df_r - s * df_q, 0.0))
+        upper = np.where(is_call, s * df_q, k * df_r)
+        valid = np.isfinite(price) & (price > intrinsic) & (price < upper)
+
+        lo = np.full(price.shape, BlackScholes.MIN_SIGMA)
+        hi = np.full(price.shape, BlackScholes.MAX_SIGMA)
+        # Brenner-Subrahmanyam ATM approximation as the starting point
+        sigma = np.clip(np.sqrt(2.0 * np.pi / t) * price / s, 0.05, 1.0)
+        idx = np.flatnonzero(valid)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for _ in range(max_iter):
+                if len(idx) == 0:
+                    break
+                sig = sigma[idx]
+                model, vega = BlackScholes._price_vega(s[idx], k[idx], t[idx], sig, is_call[idx], df_r[idx], df_q[idx], r, q)
+                diff = model - price[idx]
+                # price is increasing in sigma, so the sign of diff tells which side of the root we are on
+                lo_i = np.where(diff < 0, sig, lo[idx])
+                hi_i = np.where(diff > 0, sig, hi[idx])
+                step = sig - diff / vega
+                use_bisect = ~np.isfinite(step) | (step <= lo_i) | (step >= hi_i)
+                new_sig = np.where(use_bisect, 0.5 * (lo_i + hi_i), step)
+                # a price already within tol keeps the sigma that priced it, not the next step
+                priced = np.abs(diff) < tol
+                lo[idx], hi[idx], sigma[idx] = lo_i, hi_i, np.where(priced, sig, new_sig)
+                done = priced | (np.abs(new_sig - sig) < tol) | ((hi_i - lo_i) < tol)
+                idx = idx[~done]
+
+        return np.where(valid, sigma, np.nan).reshape(shape)
@@ -0,0 +1,51 @@
+# region imports
+from AlgorithmImports import *
+import numpy as np
+from scipy.special import ndtr
+from analytics.black_scholes import BlackScholes
+# endregion
+
+class CondorProbability:
+    """
+    Lognormal probability terms for iron condors, in bulk.
+    Per-vertical inputs are computed once per side with vertical_terms, then combined for
+    every put x call pair by broadcasting in pair_terms (or for one pair with scalars).
+    The terminal price is lognormal around the expiry's forward. Probabilities use each short
+    leg's own IV, so put skew is priced in; the expected loss uses the flat ATM IV, so the
+    expected value measures the credit against an unskewed distribution.
+    """
+
+    @staticmethod
+    def vertical_terms(short_k: np.ndarray, long_k: np.ndarray, short_iv: np.ndarray, is_call: bool,
+        forward: float, t_years: float, atm_iv: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (P(S_T > short strike), expected payout at expiry) per vertical of one side, both
+        undiscounted. A short leg without an IV (NaN) falls back to atm_iv.
+        """
+        sigma = np.where(short_iv > 0, short_iv, atm_iv)
+
+        t = max(t_years, BlackScholes.MIN_T)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vol = sigma * np.sqrt(t)
+            d2 = (np.log(forward / short_k) - 0.5 * vol * vol) / vol
+        p_above = ndtr(d2)
+
+        # spread value with spot = forward and no rates is its undiscounted expected payout
+        payout = (BlackScholes.price(forward, short_k, t, atm_iv, is_call)
+            - BlackScholes.price(forward, long_k, t, atm_iv, is_call))
+        return p_above, np.maximum(payout, 0.0)
+
+    @staticmethod
+    def pair_terms(put_p_above, put_payout, call_p_above, call_payout, total_credit, max_loss) -> tuple:
+        """
+        (pop, touch, ev_ratio) for put / call inputs that broadcast against each other.
+        pop is P(short put < S_T < short call). touch is the reflection-principle estimate
+        of either short strike trading before expiry, 2 x P(finishing beyond it), capped at 1.
+        ev_ratio is credit minus expected payout per unit of max loss (0 when max_loss <= 0).
+        """
+        pop = np.maximum(put_p_above - call_p_above, 0.0)
+        touch = np.minimum(2.0 * ((1.0 - put_p_above) + call_p_above), 1.0)
+        ev = total_credit - put_payout - call_payout
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ev_ratio = np.where(max_loss > 0, ev / max_loss, 0.0)
+        return pop, touch, ev_ratio
@@ -1,6 +1,7 @@
 # region imports
 from AlgorithmImports import *
 from models import VerticalCandidate, IronCondorCandidate
+import numpy as np
 # endregion
 class OptionMetrics:
 
@@ -42,6 +43,9 @@ class OptionMetrics:
             credit_ratio=credit_ratio,
             short_delta=float(short_delta) if short_delta is not None else None,
             long_delta=float(long_delta) if long_delta is not None else None,
+            short_strike=float(short.strike),
+            long_strike=float(long.strike),
+            conservative_credit=conservative_credit,
         )
 
     @staticmethod
@@ -130,8 +134,8 @@ class OptionMetrics:
           put credit spread:  short strike > long strike
           call credit spread: short strike < long strike
         """
-        s = OptionMetrics._strike(v.short)
-        l = OptionMetrics._strike(v.long)
+        s = v.short_strike
+        l = v.long_strike
 
         if v.side == "put":
             return s > l
@@ -160,10 +164,10 @@ class OptionMetrics:
         if not OptionMetrics._is_credit_vertical(call_v):
             return False
 
-        lp = OptionMetrics._strike(put_v.long)
-        sp = OptionMetrics._strike(put_v.short)
-        sc = OptionMetrics._strike(call_v.short)
-        lc = OptionMetrics._strike(call_v.long)
+        lp = put_v.long_strike
+        sp = put_v.short_strike
+        sc = call_v.short_strike
+        lc = call_v.long_strike
 
         # Proper condor ordering
         if not (lp < sp < sc < lc):
@@ -187,8 +191,8 @@ class OptionMetrics:
         1.0 means short strikes are equally far from spot.
         0.0 means very lopsided or doesn't bracket spot.
         """
-        sp = OptionMetrics._strike(put_v.short)
-        sc = OptionMetrics._strike(call_v.short)
+        sp = put_v.short_strike
+        sc = call_v.short_strike
 
         d_put = underlying_price - sp
         d_call = sc - underlying_price
@@ -257,8 +261,8 @@ class OptionMetrics:
 
     @staticmethod
     def _is_credit_vertical(v: VerticalCandidate) -> bool:
-        s = OptionMetrics._strike(v.short)
-        l = OptionMetrics._strike(v.long)
+        s = v.short_strike
+        l = v.long_strike
 
         if v.side == "put":
             # credit put spread: short put strike ABOVE long put strike
@@ -272,6 +276,26 @@ class OptionMetrics:
     def _strike(c) -> float:
         return float(getattr(c, "strike"))
 
+    @staticmethod
+    def _ic_centering_score_matrix(short_put_strikes: np.ndarray, short_call_strikes: np.ndarray,
+        underlying_price: float, eps: float = 1e-9) -> np.ndarray:
+        """_ic_centering_score for every (put, call) pair, puts along axis 0."""
+        d_put = (underlying_price - short_put_strikes)[:, None]
+        d_call = (short_call_strikes - underlying_price)[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = np.minimum(d_put, d_call) / (np.maximum(d_put, d_call) + eps)
+        return np.where((d_put > 0) & (d_call > 0), score, 0.0)
+
+    @staticmethod
+    def _ic_delta_balance_score_matrix(short_put_deltas: np.ndarray, short_call_deltas: np.ndarray,
+        eps: float = 1e-9, missing_score: float = 0.0) -> np.ndarray:
+        """_ic_delta_balance_score for every (put, call) pair; NaN deltas get missing_score."""
+        spd = short_put_deltas[:, None]
+        scd = short_call_deltas[None, :]
+        imbalance = np.abs(scd + spd) / (np.abs(scd) + np.abs(spd) + eps)
+        score = np.clip(1.0 - imbalance, 0.0, 1.0)
+        return np.where(np.isnan(spd) | np.isnan(scd), float(missing_score), score)
+
     @staticmethod
     def _ic_total_credit(put_v: VerticalCandidate, call_v: VerticalCandidate) -> float:
         return put_v.credit + call_v.credit
@@ -297,9 +321,7 @@ class OptionMetrics:
 
     @staticmethod
     def _short_strikes(put_v: VerticalCandidate, call_v: VerticalCandidate) -> tuple[float, float]:
-        sp = float(getattr(put_v.short, "strike"))
-        sc = float(getattr(call_v.short, "strike"))
-        return sp, sc
+        return put_v.short_strike, call_v.short_strike
 
     @staticmethod
     def _em_ok(short_put_strike: float, short_call_strike: float, lo: float, hi: float) -> bool:
@@ -0,0 +1,61 @@
+# region imports
+from AlgorithmImports import *
+# endregion
+
+class SelectionFunnel:
+    """
+    Counter-based funnel of the selection pipeline: how many contracts, short legs,
+    verticals and condors each stage took in and removed, why ticks ended without a
+    condor, and the seconds spent per stage. Counters are plain name -> number dicts,
+    summed per tick, rolled into the day when the next tick starts and into the run total.
+    Nothing is allocated per candidate.
+
+    Stages, in pipeline order:
+      contracts_in, contracts_untradeable                    per scored expiry
+      shorts_in, shorts_filtered, shorts_no_long_leg         short-leg candidates
+      verticals_in, verticals_<width|min_credit|min_credit_ratio|top_n>
+      condors_in, condors_bound_pruned, condors_<CondorGate name>, condors_gated
+    Outcomes: ticks, ticks_found, ticks_no_chain, ticks_no_expiry, ticks_no_result,
+      expiries_no_candidates, expiries_no_verticals, expiries_no_condors
+    Timings: seconds_candidates, seconds_select, seconds_rank
+    """
+    def __init__(self):
+        self.tick: dict = {}
+        self.day: dict = {}
+        self.total: dict = {}
+        self.days: list[dict] = []
+        self._date = None
+
+    def begin_tick(self, now_time):
+        """Closes the previous tick, and its day when now_time is on a new date"""
+        self._roll_tick()
+        date = now_time.date()
+        if self._date != date:
+            self._roll_day()
+            self._date = date
+        self.add("ticks")
+
+    def add(self, name: str, count=1):
+        if count:
+            self.tick[name] = self.tick.get(name, 0) + count
+
+    def add_counts(self, counts: dict):
+        for name, count in counts.items():
+            self.add(name, count)
+
+    def _roll_tick(self):
+        for name, count in self.tick.items():
+            self.day[name] = self.day.get(name, 0) + count
+            self.total[name] = self.total.get(name, 0) + count
+        self.tick = {}
+
+    def _roll_day(self):
+        if self.day:
+            self.days.append({"date": self._date.strftime("%Y-%m-%d"), **self.day})
+        self.day = {}
+
+    def to_dict(self) -> dict:
+        """Per-day counters and the run total, closing the open tick and day"""
+        self._roll_tick()
+        self._roll_day()
+        return {"days": list(self.days), "total": dict(self.total)}
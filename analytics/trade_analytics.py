@@ -14,23 +14,19 @@ class TradeAnalytics:
         position_rows = []
         for k, position in trades.items():   
             pos_stats = self.get_close_position_stats(position)
-            ic = self.get_iron_condor_candidate_technicals(position.ic_candidate)
+            ic = position.get_ic_candidate_dict()
             position_rows.append({"pos": pos_stats, "ic": ic})
         
         return position_rows
 
-    def get_iron_condor_candidate_technicals(self, ic: IronCondorCandidate):
-        return ic.to_dict()
-        
-
     def get_close_position_stats(self, position):
         pnl = position.get_exit_pnl()
         pnl_pct = position.get_exit_pnl_pct()
         position_stats = {
             'pnl': pnl, 
             'pnl_pct': pnl_pct,
-            'entry': position.opening_legs.get_total_fill_price(),
-            'exit': position.closing_legs.get_total_fill_price(),
+            'entry': position.get_opening_total_fill_price(),
+            'exit': position.get_closing_total_fill_price(),
             'underlying_price_change': 0,
             'position': position.to_dict()
             
@@ -8,6 +8,8 @@ from utils.snapshot_helpers import (
 class TradeSnapshots:
     def __init__(self):
         self.trade_snapshots = []
+        self.delta_ladder_snapshots = []
+        self.strategy_snapshots = []
     
     def add_snapshot(
         self,
@@ -20,6 +22,12 @@ class TradeSnapshots:
         close_mid: float,
         close_bid: float,
         close_ask: float,
+        atm_iv: float = None,
+        expected_move: float = None,
+        dte_days: float = None,
+        forward: float = None,
+        short_put_iv: float = None,
+        short_call_iv: float = None,
     ):
         msmo = minutes_since_open(now_time)
         mse = minutes_since_entry(trade_entry_time, now_time)
@@ -36,5 +44,40 @@ class TradeSnapshots:
             "pnl_norm": pnl_norm,
             "close_mid": close_mid,
             "close_ask": close_ask,
-            "close_bid": close_bid
+            "close_bid": close_bid,
+            "atm_iv": atm_iv,
+            "expected_move": expected_move,
+            "dte_days": dte_days,
+            "forward": forward,
+            "short_put_iv": short_put_iv,
+            "short_call_iv": short_call_iv
+        })
+
+    def add_delta_ladder_snapshot(self, now_time, spot: float, delta_target: float, expiry, ic_summary: dict):
+        """What the best condor at `delta_target` looked like at this tick (ic_summary is None if none was found)"""
+        self.delta_ladder_snapshots.append({
+            "ts": now_time.strftime("%Y-%m-%d, %H:%M:%S"),
+            "minutes_since_market_open": minutes_since_open(now_time),
+            "underlying": spot,
+            "delta_target": delta_target,
+            "expiry": expiry.strftime("%Y-%m-%d") if expiry else None,
+            "ic": ic_summary
+        })
+
+    def add_strategy_snapshot(self, now_time, spot: float, picks: dict):
+        """
+        Each selection strategy's best condor at this tick, side by side in one record.
+        picks maps strategy name to (expiry, ic_summary), both None if it found nothing.
+        """
+        self.strategy_snapshots.append({
+            "ts": now_time.strftime("%Y-%m-%d, %H:%M:%S"),
+            "minutes_since_market_open": minutes_since_open(now_time),
+            "underlying": spot,
+            "strategies": {
+                name: {
+                    "expiry": expiry.strftime("%Y-%m-%d") if expiry else None,
+                    "ic": ic_summary
+                }
+                for name, (expiry, ic_summary) in picks.items()
+            }
         })
@@ -0,0 +1,61 @@
+# region imports
+from AlgorithmImports import *
+import numpy as np
+# endregion
+
+class VolSmile:
+    """
+    Implied-volatility smile of one expiry at one slice time.
+    Strike-sorted OTM IVs (puts below the forward, calls at and above it),
+    linearly interpolated between strikes and held flat past the wings.
+    """
+    def __init__(self, expiry, strikes: np.ndarray, ivs: np.ndarray, forward: float):
+        self.expiry = expiry
+        self.strikes: np.ndarray = strikes
+        self.ivs: np.ndarray = ivs
+        self.forward: float = forward
+        self.atm_iv: float = self.iv_at(forward) if forward is not None else np.nan
+
+    def __len__(self):
+        return len(self.strikes)
+
+    def iv_at(self, strikes):
+        """IV at one strike (float) or an array of strikes (ndarray). NaN if the smile is empty."""
+        if len(self.strikes) == 0:
+            return np.nan if np.isscalar(strikes) else np.full(np.shape(strikes), np.nan)
+        ivs = np.interp(strikes, self.strikes, self.ivs)
+        return float(ivs) if np.isscalar(strikes) else ivs
+
+    @staticmethod
+    def from_columns(expiry, call_columns, put_columns, underlying_price: float, t_years: float, r: float = 0.0) -> "VolSmile":
+        forward = VolSmile.implied_forward(call_columns, put_columns, underlying_price, t_years, r)
+        pieces_k, pieces_iv = [], []
+        if put_columns is not None:
+            ok = (put_columns.iv > 0) & (put_columns.bid > 0) & (put_columns.strike < forward)
+            pieces_k.append(put_columns.strike[ok])
+            pieces_iv.append(put_columns.iv[ok])
+        if call_columns is not None:
+            ok = (call_columns.iv > 0) & (call_columns.bid > 0) & (call_columns.strike >= forward)
+            pieces_k.append(call_columns.strike[ok])
+            pieces_iv.append(call_columns.iv[ok])
+        if not pieces_k:
+            return VolSmile(expiry, np.empty(0), np.empty(0), forward)
+        # put strikes are all below the forward and call strikes at or above it, so this stays sorted
+        return VolSmile(expiry, np.concatenate(pieces_k), np.concatenate(pieces_iv), forward)
+
+    @staticmethod
+    def implied_forward(call_columns, put_columns, underlying_price: float, t_years: float, r: float = 0.0) -> float:
+        """
+        Put-call parity forward, F = K + e^(rT) * (C - P), at the quoted strike where the
+        call and put mids are closest. Falls back to the underlying price.
+        """
+        if call_columns is None or put_columns is None:
+            return underlying_price
+        _, ci, pi = np.intersect1d(call_columns.strike, put_columns.strike, assume_unique=True, return_indices=True)
+        quoted = (call_columns.bid[ci] > 0) & (call_columns.ask[ci] > 0) & (put_columns.bid[pi] > 0) & (put_columns.ask[pi] > 0)
+        if not quoted.any():
+            return underlying_price
+        ci, pi = ci[quoted], pi[quoted]
+        diff = call_columns.mid[ci] - put_columns.mid[pi]
+        i = int(np.argmin(np.abs(diff)))
+        return float(call_columns.strike[ci[i]] + np.exp(r * t_years) * diff[i])
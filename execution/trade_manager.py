@@ -24,6 +24,7 @@ class TradeManager:
         self.on_position_closed = None
         self.on_order_cancelled = None
         self.on_order_submitted = None
+        self.on_trade_group_archived = None
 
     
     def buy(self, position: IronCondorPosition, num_orders: int, tag):
@@ -68,10 +69,11 @@ class TradeManager:
     def get_similar_position_from_chain(self, position: IronCondorPosition) -> IronCondorLegs:
         short_put, short_call, long_put, long_call = None, None, None, None
         
-        short_put = self.option_chain_analyzer.get_contract_from_chain(position.get_opening_legs().get_short_put(), position.symbol)
-        short_call = self.option_chain_analyzer.get_contract_from_chain(position.get_opening_legs().get_short_call(), position.symbol)
-        long_put = self.option_chain_analyzer.get_contract_from_chain(position.get_opening_legs().get_long_put(), position.symbol)
-        long_call = self.option_chain_analyzer.get_contract_from_chain(position.get_opening_legs().get_long_call(), position.symbol)
+        opening_legs = position.get_opening_legs()
+        short_put = self.option_chain_analyzer.get_contract_from_chain(opening_legs.get_short_put(), position.symbol)
+        short_call = self.option_chain_analyzer.get_contract_from_chain(opening_legs.get_short_call(), position.symbol)
+        long_put = self.option_chain_analyzer.get_contract_from_chain(opening_legs.get_long_put(), position.symbol)
+        long_call = self.option_chain_analyzer.get_contract_from_chain(opening_legs.get_long_call(), position.symbol)
 
         if all(c != None for c in [short_put, short_call, long_put, long_call]):
             # self.opening_legs = IronCondorLegs(order_type, long_put, short_put, short_call, long_call)
@@ -120,6 +122,11 @@ class TradeManager:
         self.close_position(position, closing_legs, trade_group_id)
 
     def add_trade_snapshot(self, underlying, now_time, position: IronCondorPosition, pnl_obj):
+        opening_legs = position.get_opening_legs()
+        short_put, short_call = opening_legs.get_short_put(), opening_legs.get_short_call()
+        expiry = short_put.expiry
+        expiry_stats = self.option_chain_analyzer.get_expiry_stats(position.symbol, expiry, underlying)
+        smile = self.option_chain_analyzer.get_smile(position.symbol, expiry, underlying) if expiry_stats else None
         self.trade_snapshots.add_snapshot(
             trade_id=position.trade_id,
             now_time=now_time,
@@ -129,7 +136,13 @@ class TradeManager:
             pnl_norm=pnl_obj["pnl_norm"],
             close_mid=pnl_obj["close_mid"],
             close_bid=pnl_obj["close_bid"],
-            close_ask=pnl_obj["close_ask"]
+            close_ask=pnl_obj["close_ask"],
+            atm_iv=expiry_stats.iv if expiry_stats else None,
+            expected_move=expiry_stats.em if expiry_stats else None,
+            dte_days=expiry_stats.dte_days if expiry_stats else None,
+            forward=expiry_stats.forward if expiry_stats else None,
+            short_put_iv=smile.iv_at(float(short_put.strike)) if smile else None,
+            short_call_iv=smile.iv_at(float(short_call.strike)) if smile else None
         )
 
     def manage_opened_position(self, position: IronCondorPosition, trade_group_id):
@@ -214,12 +227,11 @@ class TradeManager:
         trade_group = self.trade_groups[trade_group_id]
         if order_group_type == 'OPEN':
             for o in trade_group.opening_orders:
-                if not trade_group.is_order_of_status("OPEN", o.order_id, "FILLED"):
+                if o.status not in ("FILLED", "CANCELED"):
                     self.algo.transactions.cancel_order(o.order_id)
-            # del self.trade_groups[trade_group_id]
         elif order_group_type == 'CLOSE':
             for o in trade_group.closing_orders:
-                if not trade_group.is_order_of_status("CLOSE", o.order_id, "FILLED"):
+                if o.status not in ("FILLED", "CANCELED"):
                     self.algo.transactions.cancel_order(o.order_id)
 
 
@@ -242,8 +254,7 @@ class TradeManager:
                 # Only NOW fire the callback - entire position is open
                 if self.on_position_closed:
                     self.on_position_closed(trade_group)
-                    # Optional: clean up completed trade
-                    # del self.trade_groups[trade_group_id]
+                self._archive_trade_group(trade_group)
 
             
 
@@ -253,8 +264,25 @@ class TradeManager:
         trade_group_id = self.order_to_group[order_id]
         trade_group = self.trade_groups[trade_group_id]
         
+        trade_group.set_order_status(order_id, order_type, "CANCELED")
+        
         self._cancel_trade_group_orders(trade_group_id, order_type)
-        self.on_order_cancelled(trade_group, order_group_type = order_type)
+        if self.on_order_cancelled:
+            self.on_order_cancelled(trade_group, order_type)
+        # nothing was opened and every leg's cancel is confirmed, so no later fill can arrive
+        if order_type == "OPEN" and trade_group.are_all_orders_of_status("OPEN", "CANCELED"):
+            self._archive_trade_group(trade_group)
+
+    def _archive_trade_group(self, trade_group: TradeGroup):
+        """
+        Drops a completed trade group and its order ids, so the lookups don't grow over the
+        run; later events for its orders are ignored by on_order_event.
+        """
+        self.trade_groups.pop(trade_group.trade_group_id, None)
+        for o in list(trade_group.opening_orders) + list(trade_group.closing_orders):
+            self.order_to_group.pop(o.order_id, None)
+        if self.on_trade_group_archived:
+            self.on_trade_group_archived(trade_group)
 
     def on_order_event(self, order_event: OrderEvent):
         """Handle order fills/cancellations"""
@@ -282,15 +310,14 @@ class TradeManager:
 
         if order_status == OrderStatus.SUBMITTED:
             if order_type == "OPEN":
-                if not trade_group.is_order_in_opening(order_id):
-                    trade_group.add_opening_order(order_id)
+                trade_order = trade_group.add_opening_order(order_id)
                 trade_group.set_order_status(order_id, order_type, "SUBMITTED")
-                trade_group.get_opening_order(order_id).symbol = order_event.symbol
+                trade_order.symbol = order_event.symbol
             if order_type == "CLOSE":
-                if not trade_group.is_order_in_closing(order_id):
-                    trade_group.add_closing_order(order_id)
-                trade_group.set_order_status(order_id, order_type, "SUBMITTED")   
-                trade_group.get_closing_order(order_id).symbol = order_event.symbol  
+                trade_order = trade_group.add_closing_order(order_id)
+                if trade_order is not None:
+                    trade_group.set_order_status(order_id, order_type, "SUBMITTED")
+                    trade_order.symbol = order_event.symbol
                 
         if order_status == OrderStatus.FILLED:
             self._on_filled_order(order_event, trade_group_id, order_type)
@@ -14,9 +14,6 @@ from selection.iron_condor_scorer import IronCondorScorer
 from analytics.trade_analytics import TradeAnalytics
 from analytics.trade_snapshots import TradeSnapshots
 
-# TODO 
-# add reason contract or position was rejected 
-
 class SimpleShortIronCondorStrategy(QCAlgorithm):
     def initialize(self):
         self.SetTimeZone(TimeZones.NewYork)
@@ -74,6 +71,7 @@ class SimpleShortIronCondorStrategy(QCAlgorithm):
         self.trade_manager.on_position_opened = self.portfolio_manager.on_position_opened
         self.trade_manager.on_order_cancelled = self.portfolio_manager.on_order_cancelled
         self.trade_manager.on_order_submitted = self.portfolio_manager.on_order_submitted
+        self.trade_manager.on_trade_group_archived = self.portfolio_manager.on_trade_group_archived
         
         self.daily_bar_consolidator = TradeBarConsolidator(timedelta(days=1), start_time=timedelta(hours=9, minutes=30))
         self.daily_bar_consolidator.data_consolidated += self._on_daily_bar
@@ -87,7 +85,8 @@ class SimpleShortIronCondorStrategy(QCAlgorithm):
             logger=self.logger, 
             portfolio_manager=self.portfolio_manager, 
             trade_manager=self.trade_manager, 
-            iron_condor_finder=self.iron_condor_finder)
+            iron_condor_finder=self.iron_condor_finder,
+            trade_snapshots=self.trade_snapshots)
 
         self.schedule.on(self.date_rules.every_day(), self.time_rules.every(TimeSpan.from_minutes(self.algo_config.scheduling_minutes)), self.on_data_on_schedule)
         self.schedule.on(
@@ -167,6 +166,11 @@ class SimpleShortIronCondorStrategy(QCAlgorithm):
         algo_obj_unique_key = self.get_obj_store_unique_key()
         self.save_file_in_obj_store(algo_obj_unique_key, 'trade_analytics.json',trade_analytics)
         self.save_file_in_obj_store(algo_obj_unique_key, 'trade_snapshots.json',trade_snapshots)
+        if self.trade_snapshots.delta_ladder_snapshots:
+            self.save_file_in_obj_store(algo_obj_unique_key, 'delta_ladder_snapshots.json', self.trade_snapshots.delta_ladder_snapshots)
+        if self.trade_snapshots.strategy_snapshots:
+            self.save_file_in_obj_store(algo_obj_unique_key, 'strategy_snapshots.json', self.trade_snapshots.strategy_snapshots)
+        self.save_file_in_obj_store(algo_obj_unique_key, 'selection_funnel.json', self.iron_condor_finder.funnel.to_dict())
         # self.save_file_in_obj_store('algo_config.json',algo_config_json)
         # self.save_file_in_obj_store('stats.json',stats)
         return None
@@ -8,7 +8,11 @@ from .position.iron_condor_position import IronCondorPosition
 from .position.position_order_status import PositionOrderStatus
 from .position.position_status import PositionStatus
 from .position.trade_group import TradeOrder, TradeGroup
+from .position.archived_position import ArchivedPosition
 
 from .selection.finder_result import FinderResult, ContractSelectorResult
 from .selection.scorer_result import ScorerResult, OptionChainFinderResult, RuleResult, ScoreData
 from .selection.candidates import VerticalCandidate, IronCondorCandidate, ScoredIronCondor
+from .selection.expiry_stats import ExpiryStats
+from .selection.vertical_spreads import VerticalSpreadArrays
+from .selection.condor_gates import CondorGate
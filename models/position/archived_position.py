@@ -0,0 +1,80 @@
+# region imports
+from AlgorithmImports import *
+from .position_status import PositionStatus
+# endregion
+
+
+class ArchivedPosition:
+    """
+    Compact record of a closed or cancelled position: ids, fill prices, timestamps and the
+    exit metrics, computed once when its trade group completes. Holds no OptionContract,
+    order ticket or IronCondorCandidate, so the live position can be released.
+    Reads like an IronCondorPosition for the end-of-run stats and analytics.
+    """
+    __slots__ = ("trade_group_id", "trade_id", "symbol", "name", "status", "total_legs",
+        "entry_time", "exit_time", "exit_reason", "underlying_at_buy", "underlying_at_sell",
+        "opening_total_fill_price", "closing_total_fill_price", "exit_pnl", "exit_pnl_pct",
+        "opening_legs_strikes", "opening_legs_dict", "closing_legs_dict", "technicals", "ic_candidate_dict")
+
+    def __init__(self, trade_group_id, position):
+        self.trade_group_id = trade_group_id
+        self.trade_id = position.trade_id
+        self.symbol = str(position.symbol)
+        self.name = position.name
+        self.status = position.status
+        self.total_legs = position.total_legs
+        self.entry_time = position.entry_time
+        self.exit_time = position.exit_time
+        self.exit_reason = position.exit_reason
+        self.underlying_at_buy = position.underlying_at_buy
+        self.underlying_at_sell = position.underlying_at_sell
+        self.technicals = position.technicals
+        self.opening_legs_strikes = position.get_opening_legs_strikes_json()
+        self.opening_legs_dict = position.opening_legs.to_dict()
+        self.closing_legs_dict = position.closing_legs.to_dict() if position.closing_legs else None
+        self.ic_candidate_dict = position.get_ic_candidate_dict()
+        # fills and pnl only exist once both phases filled
+        self.opening_total_fill_price = None
+        self.closing_total_fill_price = None
+        self.exit_pnl = None
+        self.exit_pnl_pct = None
+        if position.status == PositionStatus.CLOSED:
+            self.opening_total_fill_price = position.get_opening_total_fill_price()
+            self.closing_total_fill_price = position.get_closing_total_fill_price()
+            self.exit_pnl = position.get_exit_pnl()
+            self.exit_pnl_pct = position.get_exit_pnl_pct()
+
+    def get_exit_pnl(self):
+        return self.exit_pnl
+
+    def get_exit_pnl_pct(self):
+        return self.exit_pnl_pct
+
+    def get_opening_total_fill_price(self):
+        return self.opening_total_fill_price
+
+    def get_closing_total_fill_price(self):
+        return self.closing_total_fill_price
+
+    def get_opening_legs_strikes_json(self):
+        return self.opening_legs_strikes
+
+    def get_ic_candidate_dict(self):
+        return self.ic_candidate_dict
+
+    def to_dict(self):
+        return {
+            "trade_id": self.trade_id,
+            "symbol": self.symbol,
+            "strategy": self.name,
+            "status": self.status.name,
+            "total_legs": self.total_legs,
+            "underlying_at_entry": self.underlying_at_buy,
+            "underlying_at_exit": self.underlying_at_sell,
+            "entry_time": self.entry_time.isoformat() if self.entry_time else None,
+            "exit_time": self.exit_time.isoformat() if self.exit_time else None,
+            "exit_reason": self.exit_reason,
+            "opening_legs": self.opening_legs_dict,
+            "closing_legs": self.closing_legs_dict,
+            "technicals": self.technicals
+        }
@@ -127,6 +127,12 @@ class IronCondorPosition:
     
     def get_opening_total_fill_price(self):
         return self.opening_legs.get_total_fill_price()
+
+    def get_closing_total_fill_price(self):
+        return self.closing_legs.get_total_fill_price()
+
+    def get_ic_candidate_dict(self):
+        return self.ic_candidate.to_dict() if self.ic_candidate else None
         
     def get_position_status(self) -> PositionStatus:
         return self.status
@@ -4,85 +4,97 @@ from AlgorithmImports import *
 
 
 class TradeOrder:
+    __slots__ = ("order_id", "fill_price", "status", "symbol")
+
     def __init__(self, order_id):
         self.order_id = order_id
         self.fill_price = None
         self.status = None
         # SUBMITTED, FILLED, CANCELED, INVALID?
+        self.symbol = None
 
 class TradeGroup:
+    """
+    Orders of one position, per phase ("OPEN" / "CLOSE") in dicts keyed by order id, with a
+    count of orders per status so lookups and the all-legs checks are O(1).
+    Statuses must be changed through set_order_status to keep the counts right.
+    """
     def __init__(self, trade_group_id, total_legs, symbol, strategy):
         self.trade_group_id = trade_group_id
-        self.opening_orders: list[TradeOrder] = []
-        self.closing_orders: list[TradeOrder] = []
+        self._orders: dict[str, dict] = {"OPEN": {}, "CLOSE": {}}
+        # {phase: {status: number of the phase's orders with it}}
+        self._status_counts: dict[str, dict] = {"OPEN": {}, "CLOSE": {}}
         self.total_legs = total_legs
         self.symbol = symbol
         self.strategy = strategy
+
+    @property
+    def opening_orders(self):
+        return self._orders["OPEN"].values()
+
+    @property
+    def closing_orders(self):
+        return self._orders["CLOSE"].values()
         
     def is_order_in_opening(self, order_id):
-        return any(o.order_id == order_id for o in self.opening_orders)
+        return order_id in self._orders["OPEN"]
     
     def is_order_in_closing(self, order_id):
-        return any(o.order_id == order_id for o in self.closing_orders)
+        return order_id in self._orders["CLOSE"]
 
-    def add_opening_order(self, order_id):
-        if not self.is_order_in_opening(order_id):
-            trade_order = TradeOrder(order_id)
-            self.opening_orders.append(trade_order)
+    def add_opening_order(self, order_id) -> TradeOrder:
+        """The opening TradeOrder for order_id, added if it isn't tracked yet"""
+        orders = self._orders["OPEN"]
+        trade_order = orders.get(order_id)
+        if trade_order is None:
+            trade_order = orders[order_id] = TradeOrder(order_id)
+        return trade_order
     
-    def add_closing_order(self, order_id):
-        if not self.is_order_in_closing(order_id) and not self.is_order_in_opening(order_id):
-            trade_order = TradeOrder(order_id)
-            self.closing_orders.append(trade_order)
+    def add_closing_order(self, order_id) -> TradeOrder:
+        """The closing TradeOrder for order_id, added unless it's already tracked in either phase"""
+        orders = self._orders["CLOSE"]
+        trade_order = orders.get(order_id)
+        if trade_order is None and not self.is_order_in_opening(order_id):
+            trade_order = orders[order_id] = TradeOrder(order_id)
+        return trade_order
     
     def get_opening_order(self, order_id) -> TradeOrder:
-        return next((o for o in self.opening_orders if o.order_id == order_id), None)
+        return self._orders["OPEN"].get(order_id)
 
     def get_closing_order(self, order_id) -> TradeOrder:
-        return next((o for o in self.closing_orders if o.order_id == order_id), None)
+        return self._orders["CLOSE"].get(order_id)
     
     def are_all_orders_of_status(self, order_type, status):
-        if order_type == "OPEN":
-            if len(self.opening_orders) == self.total_legs:
-                if all(o.status == status for o in self.opening_orders):
-                    return True
-        elif order_type == "CLOSE":
-            if len(self.closing_orders) == self.total_legs:
-                if all(o.status == status for o in self.closing_orders):
-                    return True
-        return False
+        orders = self._orders.get(order_type)
+        if orders is None or len(orders) != self.total_legs:
+            return False
+        return self._status_counts[order_type].get(status, 0) == self.total_legs
         
+    def count_orders_of_status(self, order_type, status):
+        return self._status_counts[order_type].get(status, 0)
+
     def are_all_opening_filled(self):
-        if len(self.opening_orders) == self.total_legs:
-            if all(o.status == "FILLED" for o in self.opening_orders):
-                return True
-        return False
+        return self.are_all_orders_of_status("OPEN", "FILLED")
     
     def are_all_closing_filled(self):
-        if len(self.closing_orders) == self.total_legs:
-            if all(o.status == "FILLED" for o in self.closing_orders):
-                return True
-        return False
+        return self.are_all_orders_of_status("CLOSE", "FILLED")
     
     def get_opening_avg_fill_price(self):
-        avg_fill_price = sum(o.fill_price for o in self.opening_orders) / self.total_legs
+        return sum(o.fill_price for o in self.opening_orders) / self.total_legs
     
     def get_closing_avg_fill_price(self):
-        avg_fill_price = sum(o.fill_price for o in self.closing_orders) / self.total_legs
+        return sum(o.fill_price for o in self.closing_orders) / self.total_legs
 
     def is_order_of_status(self, order_type, order_id, status):
-        if order_type == "OPEN":
-            if self.get_opening_order(order_id).status == status:
-                return True
-        elif order_type == "CLOSE":
-            if self.get_closing_order(order_id).status == status:
-                return True
-        return False
+        trade_order = self._orders.get(order_type, {}).get(order_id)
+        return trade_order is not None and trade_order.status == status
     
     def set_order_status(self, order_id, order_type, status):
-        if order_type == "OPEN":
-            if self.is_order_in_opening(order_id):
-                self.get_opening_order(order_id).status = status
-        elif order_type == "CLOSE":
-            if self.is_order_in_closing(order_id):
-                self.get_closing_order(order_id).status = status
+        trade_order = self._orders.get(order_type, {}).get(order_id)
+        if trade_order is None or trade_order.status == status:
+            return
+        counts = self._status_counts[order_type]
+        if trade_order.status is not None:
+            counts[trade_order.status] -= 1
+        counts[status] = counts.get(status, 0) + 1
+        trade_order.status = status
@@ -2,18 +2,41 @@
 # region imports
 from dataclasses import dataclass
 from typing import Any, Optional
+from .condor_gates import CondorGate
 # endregion
   
 class VerticalCandidate:
-    def __init__(self, side, short, long, width, credit, credit_ratio, short_delta, long_delta):
+    # created by the thousands per tick, slots keep them free of a per-instance __dict__
+    __slots__ = ("side", "short", "long", "width", "credit", "credit_ratio", "conservative_credit",
+        "short_delta", "long_delta", "short_strike", "long_strike", "columns", "short_row", "long_row")
+
+    def __init__(self, side, short, long, width, credit, credit_ratio, short_delta, long_delta,
+        short_strike=None, long_strike=None, columns=None, short_row=None, long_row=None,
+        conservative_credit=None):
         self.side: str = side              
         self.short: OptionContract = short            
         self.long: OptionContract = long               
         self.width: float = width
         self.credit: float = credit
         self.credit_ratio: float = credit_ratio
+        self.conservative_credit: Optional[float] = conservative_credit
         self.short_delta: Optional[float] = short_delta
         self.long_delta: Optional[float] = long_delta
+        self.short_strike: float = short_strike if short_strike is not None else float(short.strike)
+        self.long_strike: float = long_strike if long_strike is not None else float(long.strike)
+        # optional ChainColumns view the legs were read from, so serialization
+        # doesn't have to go back to the contract objects
+        self.columns = columns
+        self.short_row: Optional[int] = short_row
+        self.long_row: Optional[int] = long_row
+
+    def rebind(self, columns, short_row: int, long_row: int):
+        """Points a reused candidate at a newer slice's columns holding the same legs."""
+        self.columns = columns
+        self.short_row = short_row
+        self.long_row = long_row
+        self.short = columns.contracts[short_row]
+        self.long = columns.contracts[long_row]
 
     def to_dict(self):
         return {
@@ -27,31 +50,58 @@ class VerticalCandidate:
 
     def to_dict_contract(self, direction):
         c: OptionContract = self.long
+        row = self.long_row
         if direction == "short":
             c = self.short
-    
+            row = self.short_row
+
+        if self.columns is None or row is None:
+            return {
+                "symbol": c.symbol.value,
+                "strike": c.strike,
+                "iv": c.implied_volatility,
+                "oi": c.open_interest,
+                "volume": c.volume,
+                "expiry": c.expiry.strftime("%Y-%m-%d, %H:%M:%S"),
+                "delta": c.greeks.delta,
+                "gamma": c.greeks.gamma,
+                "theta": c.greeks.theta,
+                "vega": c.greeks.vega,
+                "theta_per_day": c.greeks.theta_per_day,
+                "ask_size": c.ask_size,
+                "ask_price": c.ask_price,
+                "bid_size": c.bid_size,
+                "bid_price": c.bid_price,
+                "last_price": c.last_price
+            }
+
+        q = self.columns.row(row)
         return {
             "symbol": c.symbol.value,
-            "strike": c.strike,
-            "iv": c.implied_volatility,
-            "oi": c.open_interest,
-            "volume": c.volume,
-            "expiry": c.expiry.strftime("%Y-%m-%d, %H:%M:%S"),
-            "delta": c.greeks.delta,
-            "gamma": c.greeks.gamma,
-            "theta": c.greeks.theta,
-            "vega": c.greeks.vega,
-            "theta_per_day": c.greeks.theta_per_day,
+            "strike": q["strike"],
+            "iv": q["iv"],
+            "oi": q["oi"],
+            "volume": q["volume"],
+            "expiry": self.columns.expiry.strftime("%Y-%m-%d, %H:%M:%S"),
+            "delta": q["delta"],
+            "gamma": q["gamma"],
+            "theta": q["theta"],
+            "vega": q["vega"],
+            "theta_per_day": q["theta"] / 365.0 if q["theta"] is not None else None,
             "ask_size": c.ask_size,
-            "ask_price": c.ask_price,
+            "ask_price": q["ask_price"],
             "bid_size": c.bid_size,
-            "bid_price": c.bid_price,
-            "last_price": c.last_price
-
+            "bid_price": q["bid_price"],
+            "last_price": c.last_price,
+            "bs_filled": q["bs_filled"]
         }
     
 
 class IronCondorCandidate:
+    __slots__ = ("put", "call", "total_credit", "max_loss", "rr", "em_ok", "em", "cushion",
+        "defined_risk", "cushion_score", "rr_score", "center_score", "delta_balance_score",
+        "pop", "touch", "ev_ratio", "pop_score", "touch_score", "ev_score", "overall_score", "gates", "data")
+
     def __init__(self, put, call, total_credit, max_loss, rr, em_ok, cushion, em):
         self.put: VerticalCandidate = put
         self.call: VerticalCandidate = call
@@ -66,7 +116,18 @@ class IronCondorCandidate:
         self.rr_score: Optional[float] = 0.0 
         self.center_score: Optional[float] = 0.0
         self.delta_balance_score: Optional[float] = 0.0
+        # lognormal terms, None when the expiry's forward / IV weren't available
+        self.pop: Optional[float] = None
+        self.touch: Optional[float] = None
+        self.ev_ratio: Optional[float] = None
+        self.pop_score: float = 0.0
+        self.touch_score: float = 0.0
+        self.ev_score: float = 0.0
         self.overall_score: Optional[float] = 0.0
+        # CondorGate bits of the gates it failed, 0 = passed all, None = not checked
+        self.gates: Optional[int] = None
+        # raw check outputs keyed by check name, created on first use
+        self.data: Optional[dict] = None
 
     def get_expiry(self):
         return self.put.short.expiry
@@ -86,8 +147,38 @@ class IronCondorCandidate:
             "rr_score": self.rr_score,
             "center_score": self.center_score,
             "delta_balance_score": self.delta_balance_score,
+            "pop": self.pop,
+            "touch": self.touch,
+            "ev_ratio": self.ev_ratio,
+            "pop_score": self.pop_score,
+            "touch_score": self.touch_score,
+            "ev_score": self.ev_score,
+            "overall_score": self.overall_score,
+            "gates_failed": CondorGate.names(self.gates) if self.gates is not None else None
+        }
+    def to_summary_dict(self):
+        """Flat, contract-free summary for high-volume research logs"""
+        return {
+            "long_put_strike": self.put.long_strike,
+            "short_put_strike": self.put.short_strike,
+            "short_call_strike": self.call.short_strike,
+            "long_call_strike": self.call.long_strike,
+            "short_put_delta": self.put.short_delta,
+            "short_call_delta": self.call.short_delta,
+            "put_credit": self.put.credit,
+            "call_credit": self.call.credit,
+            "total_credit": self.total_credit,
+            "max_loss": self.max_loss,
+            "rr": self.rr,
+            "em": self.em,
+            "em_ok": self.em_ok,
+            "cushion": self.cushion,
+            "pop": self.pop,
+            "touch": self.touch,
+            "ev_ratio": self.ev_ratio,
             "overall_score": self.overall_score
         }
+
     def _to_dict(self):
         return {
             "put": put, "call": call, "total_credit": total_credit,
@@ -95,6 +186,8 @@ class IronCondorCandidate:
         }
     
     def set_defined_risk(self, defined_risk):
+        if self.data is None:
+            self.data = {}
         self.data["defined_risk"] = defined_risk
         self.defined_risk = defined_risk["check_passed"]
 
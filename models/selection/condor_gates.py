@@ -0,0 +1,25 @@
+# region imports
+from AlgorithmImports import *
+from enum import IntFlag
+import numpy as np
+# endregion
+
+class CondorGate(IntFlag):
+    """
+    Hard gates a condor must pass to be tradeable. A candidate's gate mask has the bit of
+    every gate it FAILED set, so 0 means it passed them all. Masks are uint8 per pair.
+    """
+    DEFINED_RISK = 1  # long put < short put < spot < short call < long call
+    EM_OK = 2  # both short strikes outside the buffered expected move
+    MAX_LOSS = 4  # max loss > 0
+    MIN_RR = 8  # reward / risk >= min_rr
+
+    @staticmethod
+    def names(mask: int) -> list[str]:
+        """Names of the gates failed in `mask`"""
+        return [gate.name for gate in CondorGate if mask & gate]
+
+    @staticmethod
+    def count_failures(masks: np.ndarray) -> dict[str, int]:
+        """{gate name: number of masks failing it}, over an array of masks"""
+        return {gate.name: int(np.count_nonzero(masks & gate.value)) for gate in CondorGate}
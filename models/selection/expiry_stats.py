@@ -0,0 +1,32 @@
+# region imports
+from AlgorithmImports import *
+# endregion
+
+class ExpiryStats:
+    """
+    ATM implied vol, expected move and time to expiry for one expiry at one slice time.
+    iv is the smile interpolated at the forward; atm_call_iv / atm_put_iv are the nearest-strike quotes.
+    """
+    def __init__(self, expiry, time, dte_days: float, underlying_price: float,
+        atm_call_iv: float, atm_put_iv: float, iv: float, em: float, forward: float = None):
+        self.expiry = expiry
+        self.time = time
+        self.dte_days: float = dte_days
+        self.underlying_price: float = underlying_price
+        self.atm_call_iv: float = atm_call_iv
+        self.atm_put_iv: float = atm_put_iv
+        self.iv: float = iv
+        self.em: float = em
+        self.forward: float = forward
+
+    def to_dict(self):
+        return {
+            "expiry": self.expiry.strftime("%Y-%m-%d"),
+            "dte_days": self.dte_days,
+            "underlying_price": self.underlying_price,
+            "atm_call_iv": self.atm_call_iv,
+            "atm_put_iv": self.atm_put_iv,
+            "iv": self.iv,
+            "em": self.em,
+            "forward": self.forward
+        }
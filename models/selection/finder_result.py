@@ -45,10 +45,14 @@ class FinderResult:
 class ContractSelectorResult:
 
     def __init__(self):
-        self.call_verticals: list[VerticalCandidate] = []
-        self.put_verticals: list[VerticalCandidate] = []
+        # VerticalSpreadArrays per side, materialized by the scorer only where needed
+        self.call_spreads = None
+        self.put_spreads = None
+        # SelectionFunnel short-leg counters: shorts_in, shorts_filtered, shorts_no_long_leg
+        self.funnel_counts: dict = {}
         self.had_error: bool = False
         self.exception = None
 
     def is_verticals_populated(self):
-        return len(self.call_verticals) > 0 and len(self.put_verticals) > 0
+        return (self.call_spreads is not None and self.put_spreads is not None
+            and len(self.call_spreads) > 0 and len(self.put_spreads) > 0)
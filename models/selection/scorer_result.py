@@ -1,31 +1,144 @@
 # region imports
 from AlgorithmImports import *
+import heapq
+import random
+import numpy as np
 from .candidates import IronCondorCandidate
+from .condor_gates import CondorGate
 # endregion
 
 class ScorerResult:
-
-    def __init__(self):
-        self.all_candidates: list[IronCondorCandidate] = []
-        self.best_by_expiry: dict[str, list[IronCondorCandidate]] = {}
+    """
+    Outcome of ranking one expiry's condors. Keeps only the top_k best candidates in a
+    bounded min-heap (all of them when top_k is None) plus streaming score statistics,
+    so memory per tick doesn't grow with the chain. With reservoir_size > 0 a uniform
+    reservoir sample of the candidates that didn't make the top_k is kept for research.
+    """
+    def __init__(self, top_k: int = None, reservoir_size: int = 0, seed: int = None):
+        self.top_k: int = top_k
+        self._heap: list = []
+        self._seq: int = 0
         self.best_overall: IronCondorCandidate = None
+        self._best_key: tuple = None
+        # per side vertical counts pruned at each gate, {"put": {...}, "call": {...}}
+        self.prune_counts: dict = None
+        # number of put x call pairs scored, all_candidates may hold only the top of them
+        self.scored_count: int = 0
+        # put x call pairs skipped by branch-and-bound
+        self.pruned_pairs: int = 0
+        # streaming stats over every observed score
+        self.score_count: int = 0
+        self.score_sum: float = 0.0
+        self.score_max: float = None
+        self.score_min: float = None
+        # candidates rejected before scoring, by reason
+        self.rejections: dict[str, int] = {}
+        # scored pairs failing each CondorGate, counted whether or not gates are enforced
+        self.gate_failures: dict[str, int] = {}
+        # scored pairs left out of the ranking for failing a gate (is_enforce_gates)
+        self.gated_pairs: int = 0
+        self.reservoir_size: int = reservoir_size
+        self.reservoir: list[IronCondorCandidate] = []
+        self._reservoir_seen: int = 0
+        self._rng = random.Random(seed) if reservoir_size > 0 else None
         self.had_error: bool = False
         self.exception = None
 
+    @property
+    def all_candidates(self) -> list[IronCondorCandidate]:
+        """Kept candidates, best first (equal scores in the order they were added)."""
+        return [item[2] for item in sorted(self._heap, reverse=True)]
+
+    @property
+    def score_mean(self) -> float:
+        return self.score_sum / self.score_count if self.score_count > 0 else None
+
     def get_best_overall_score(self):
         return self.best_overall.overall_score
         
-    def _add_best_overall(self, ic):
-        if not self.best_overall or (ic.overall_score > self.best_overall.overall_score):
+    def _add_best_overall(self, ic, key):
+        if not self.best_overall or key > self._best_key:
             self.best_overall = ic
-
+            self._best_key = key
 
     def add_candidate(self, ic: IronCondorCandidate):
-        self.all_candidates.append(ic)
-        self._add_best_overall(ic)
+        self.observe_score(ic.overall_score)
+        self.keep_candidate(ic)
+
+    def observe_score(self, score: float):
+        self.score_count += 1
+        self.score_sum += score
+        if self.score_max is None or score > self.score_max:
+            self.score_max = score
+        if self.score_min is None or score < self.score_min:
+            self.score_min = score
+
+    def observe_scores(self, scores: np.ndarray):
+        """Folds a whole array of scores into the streaming stats."""
+        if len(scores) == 0:
+            return
+        self.score_count += len(scores)
+        self.score_sum += float(scores.sum())
+        hi, lo = float(scores.max()), float(scores.min())
+        self.score_max = hi if self.score_max is None else max(self.score_max, hi)
+        self.score_min = lo if self.score_min is None else min(self.score_min, lo)
+
+    def keep_candidate(self, ic: IronCondorCandidate, seq: int = None):
+        """
+        Offers a candidate to the top_k heap without touching the score stats.
+        seq orders equal scores (lower wins); by default candidates are numbered as added.
+        """
+        if seq is None:
+            seq = self._seq
+            self._seq += 1
+        # -seq: on equal scores the earlier candidate ranks higher
+        item = (ic.overall_score, -seq, ic)
+        self._add_best_overall(ic, item[:2])
+        if self.top_k is None or len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, item)
+            return
+        dropped = heapq.heappushpop(self._heap, item)
+        self.sample_candidate(dropped[2])
+
+    def sample_candidate(self, ic: IronCondorCandidate):
+        """Algorithm R over candidates outside the top_k; a no-op unless reservoir_size > 0."""
+        if self.reservoir_size <= 0:
+            return
+        self._reservoir_seen += 1
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(ic)
+            return
+        j = self._rng.randrange(self._reservoir_seen)
+        if j < self.reservoir_size:
+            self.reservoir[j] = ic
+
+    def sample_indices(self, n: int) -> list[int]:
+        """
+        Uniform sample of up to reservoir_size positions out of range(n), for callers that hold
+        the candidates outside the top_k as an array rather than offering them one by one.
+        """
+        if self.reservoir_size <= 0 or n <= 0:
+            return []
+        self._reservoir_seen += n
+        return self._rng.sample(range(n), min(self.reservoir_size, n))
+
+    def add_rejections(self, reason: str, count: int = 1):
+        if count:
+            self.rejections[reason] = self.rejections.get(reason, 0) + count
+
+    def add_gate_failures(self, counts: dict[str, int]):
+        for name, count in counts.items():
+            if count:
+                self.gate_failures[name] = self.gate_failures.get(name, 0) + count
+
+    def add_gate_mask(self, mask: int):
+        """Counts one pair's failed gates"""
+        if mask:
+            for name in CondorGate.names(mask):
+                self.gate_failures[name] = self.gate_failures.get(name, 0) + 1
 
     def has_candidates(self):
-        if len(self.all_candidates) > 0:
+        if len(self._heap) > 0:
             return True
         return False
 
@@ -33,10 +146,26 @@ class OptionChainFinderResult:
     def __init__(self):
         self.calls = []
         self.puts = []
+        # struct-of-arrays chain view for the expiry and the selected rows in it
+        self.call_columns = None
+        self.put_columns = None
+        self.call_rows: list[int] = []
+        self.put_rows: list[int] = []
         self.iv = 0.0
         self.em = 0.0
+        self.expiry_stats = None
         self.had_error: bool = False
         self.exception = None
+
+    def set_calls(self, columns, rows: list[int]):
+        self.call_columns = columns
+        self.call_rows = rows
+        self.calls = [columns.contracts[i] for i in rows]
+
+    def set_puts(self, columns, rows: list[int]):
+        self.put_columns = columns
+        self.put_rows = rows
+        self.puts = [columns.contracts[i] for i in rows]
     
     def is_calls_and_puts_not_empty(self):
         return len(self.calls) > 0 and len(self.puts) > 0
@@ -0,0 +1,96 @@
+# region imports
+from AlgorithmImports import *
+import numpy as np
+from .candidates import VerticalCandidate
+# endregion
+
+class VerticalSpreadArrays:
+    """
+    Struct-of-arrays set of same-side vertical spreads over one ChainColumns partition.
+    Entry i is the spread selling row short_rows[i] and buying row long_rows[i].
+    credit is the mid credit, conservative_credit is short bid - long ask (both floored at 0).
+    Spreads stay arrays through pruning and matrix ranking; VerticalCandidate objects are
+    only built by materialize, for the spreads that are kept.
+    """
+    def __init__(self, side: str, columns, short_rows: np.ndarray, long_rows: np.ndarray,
+        width: np.ndarray, credit: np.ndarray, conservative_credit: np.ndarray, credit_ratio: np.ndarray):
+        self.side: str = side
+        self.columns = columns
+        self.short_rows: np.ndarray = short_rows
+        self.long_rows: np.ndarray = long_rows
+        self.width: np.ndarray = width
+        self.credit: np.ndarray = credit
+        self.conservative_credit: np.ndarray = conservative_credit
+        self.credit_ratio: np.ndarray = credit_ratio
+
+    def __len__(self):
+        return len(self.short_rows)
+
+    @property
+    def short_strike(self) -> np.ndarray:
+        return self.columns.strike[self.short_rows]
+
+    @property
+    def long_strike(self) -> np.ndarray:
+        return self.columns.strike[self.long_rows]
+
+    @property
+    def short_delta(self) -> np.ndarray:
+        """NaN where the short leg has no delta"""
+        return self.columns.delta[self.short_rows]
+
+    @property
+    def short_iv(self) -> np.ndarray:
+        return self.columns.iv[self.short_rows]
+
+    def take(self, idx) -> "VerticalSpreadArrays":
+        return VerticalSpreadArrays(self.side, self.columns, self.short_rows[idx], self.long_rows[idx],
+            self.width[idx], self.credit[idx], self.conservative_credit[idx], self.credit_ratio[idx])
+
+    def ranked(self, top_n: int = None) -> np.ndarray:
+        """Indices ordered by (credit_ratio, credit) descending, ties in generation order, cut to top_n."""
+        order = np.lexsort((np.arange(len(self)), -self.credit, -self.credit_ratio))
+        return order if top_n is None else order[:top_n]
+
+    def materialize(self, idx=None, cache=None) -> list[VerticalCandidate]:
+        """
+        VerticalCandidate objects for the spreads at idx (all of them by default), in that order.
+        With an IncrementalSelectionCache, verticals whose legs didn't change are reused.
+        """
+        spreads = self if idx is None else self.take(np.asarray(idx, dtype=np.intp))
+        columns, side = self.columns, self.side
+        short_rows = spreads.short_rows.tolist()
+        long_rows = spreads.long_rows.tolist()
+        short_strikes = spreads.short_strike.tolist()
+        long_strikes = spreads.long_strike.tolist()
+        # NaN (missing greeks) becomes None
+        short_deltas = [None if d != d else d for d in spreads.short_delta.tolist()]
+        long_deltas = [None if d != d else d for d in columns.delta[spreads.long_rows].tolist()]
+        width, credit = spreads.width.tolist(), spreads.credit.tolist()
+        conservative_credit, credit_ratio = spreads.conservative_credit.tolist(), spreads.credit_ratio.tolist()
+
+        verticals: list[VerticalCandidate] = []
+        for i in range(len(short_rows)):
+            short_row, long_row = short_rows[i], long_rows[i]
+            v = cache.get_vertical(columns, short_row, long_row) if cache is not None else None
+            if v is None:
+                v = VerticalCandidate(
+                    side=side,
+                    short=columns.contracts[short_row],
+                    long=columns.contracts[long_row],
+                    width=width[i],
+                    credit=credit[i],
+                    credit_ratio=credit_ratio[i],
+                    short_delta=short_deltas[i],
+                    long_delta=long_deltas[i],
+                    short_strike=short_strikes[i],
+                    long_strike=long_strikes[i],
+                    columns=columns,
+                    short_row=short_row,
+                    long_row=long_row,
+                    conservative_credit=conservative_credit[i],
+                )
+                if cache is not None:
+                    cache.put_vertical(columns, short_row, long_row, v)
+            verticals.append(v)
+        return verticals
@@ -1,6 +1,6 @@
 # region imports
 from AlgorithmImports import *
-from models import IronCondorPosition, PositionStatus, TradeGroup
+from models import IronCondorPosition, PositionStatus, TradeGroup, ArchivedPosition
 import json 
 # endregion
 
@@ -20,10 +20,13 @@ class PortfolioManager:
         self.trade_entered_today = False
         self.last_date = None
         self.open_positions_by_symbol = {}
+        # live positions only; closed / canceled ones move to ArchivedPosition records
+        # in closed_positions / canceled_positions once their trade group completes
         self.all_positions = {}
         self.open_positions = {}
         self.closed_positions = {}
         self.canceled_positions = {}
+        self.archived_count = 0
         self.date_to_position = {}
         self.trades_today = []
         
@@ -38,10 +41,12 @@ class PortfolioManager:
         now_date = now_time.date().strftime("%Y-%m-%d")
         if now_date not in self.date_to_position.keys():
             self.date_to_position[now_date] = []
+        # ids only, so the day index doesn't keep archived positions alive
         self.date_to_position[now_date].append({
-            "trade_group": trade_group,
-            "position": position
+            "trade_group_id": trade_group.trade_group_id,
+            "trade_id": position.trade_id
         })
+
     def on_position_opened(self, trade_group: TradeGroup):
         position = self.all_positions[trade_group.trade_group_id]
         position.set_position_status(PositionStatus.OPENED)
@@ -73,10 +78,28 @@ class PortfolioManager:
         return
     
     def on_order_cancelled(self, trade_group, order_type):
-        position = self.all_positions[trade_group.trade_group_id]
+        position = self.all_positions.get(trade_group.trade_group_id)
+        if position is None:
+            # already archived
+            return
         position.set_position_status(PositionStatus.CANCELED)
         self.canceled_positions[trade_group.trade_group_id] = position
         return    
+
+    def on_trade_group_archived(self, trade_group: TradeGroup):
+        """Replaces the group's closed or canceled position with an ArchivedPosition and releases it"""
+        trade_group_id = trade_group.trade_group_id
+        position = self.all_positions.pop(trade_group_id, None)
+        if position is None:
+            return
+        self.open_positions.pop(trade_group_id, None)
+        archived = ArchivedPosition(trade_group_id, position)
+        if trade_group_id in self.closed_positions:
+            self.closed_positions[trade_group_id] = archived
+        if trade_group_id in self.canceled_positions:
+            self.canceled_positions[trade_group_id] = archived
+        self.archived_count += 1
+        return
         
 
     def on_order_submitted(self, position: IronCondorPosition, trade_group):
@@ -147,7 +170,7 @@ class PortfolioManager:
                 close_hour_target_reached.append(pos)
                 
         stats = {
-            'all_pos_count': len(self.all_positions.keys()),
+            'all_pos_count': len(self.all_positions.keys()) + self.archived_count,
             'close_pos_count': len(self.closed_positions.keys()),
             'canceled_count': canceled_count,
             'profit_target_count': len(profit_target_reached),
@@ -326,8 +349,8 @@ class PortfolioManager:
         position_stats = {
             'pnl': pnl, 
             'pnl_pct': pnl_pct,
-            'entry': position.opening_legs.get_total_fill_price(),
-            'exit': position.closing_legs.get_total_fill_price(),
+            'entry': position.get_opening_total_fill_price(),
+            'exit': position.get_closing_total_fill_price(),
             'exit_reason': position.exit_reason,
             'underlying_on_entry': position.underlying_at_buy,
             'underlying_on_exit': position.underlying_at_sell,
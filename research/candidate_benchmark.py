@@ -0,0 +1,66 @@
+# region imports
+from AlgorithmImports import *
+import time
+import tracemalloc
+from types import SimpleNamespace
+from models.selection.candidates import VerticalCandidate, IronCondorCandidate
+# endregion
+
+# Memory and construction cost of the selection candidates, slotted (current) vs the
+# previous __dict__-backed layout. The dict-backed classes are rebuilt from the current
+# ones with the slots stripped, so both run the exact same __init__.
+
+def _unslotted(cls):
+    ns = {k: v for k, v in cls.__dict__.items()
+        if k not in cls.__slots__ and k not in ("__slots__", "__dict__", "__weakref__")}
+    return type(cls.__name__ + "Dict", (), ns)
+
+def _legs(n):
+    return [SimpleNamespace(strike=400.0 + i, symbol=f"SPY_{i}") for i in range(n + 1)]
+
+def _build(vertical_cls, condor_cls, n, legs):
+    verticals = [
+        vertical_cls("put", legs[i], legs[i + 1], 1.0, 0.35, 0.35, -0.16, -0.12)
+        for i in range(n)
+    ]
+    condors = [
+        condor_cls(verticals[i], verticals[-1 - i], 0.7, 0.3, 2.33, True, 1.5, 6.0)
+        for i in range(n)
+    ]
+    return verticals, condors
+
+def measure(vertical_cls, condor_cls, n=20000, repeat=5):
+    legs = _legs(n)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        _build(vertical_cls, condor_cls, n, legs)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    built = _build(vertical_cls, condor_cls, n, legs)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del built
+
+    # one vertical and one condor per i, list overhead included
+    return {
+        "layout": "__slots__" if "__slots__" in vertical_cls.__dict__ else "__dict__",
+        "n": n,
+        "bytes_per_pair": allocated / n,
+        "build_us_per_pair": best / n * 1e6
+    }
+
+def run_benchmark(n=20000, repeat=5):
+    rows = [
+        measure(_unslotted(VerticalCandidate), _unslotted(IronCondorCandidate), n, repeat),
+        measure(VerticalCandidate, IronCondorCandidate, n, repeat)
+    ]
+    for r in rows:
+        print(f"{r['layout']:<10} {r['bytes_per_pair']:8.1f} B/pair  {r['build_us_per_pair']:6.2f} us/pair")
+    return rows
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,142 @@
+# region imports
+from AlgorithmImports import *
+import numpy as np
+from selection.chain_snapshot import ChainSnapshot, ChainColumns
+# endregion
+
+class ChainDiff:
+    """
+    Which rows of `snapshot` changed since `prev`.
+    A row is unchanged when a row with the same strike existed in the previous snapshot's
+    (expiry, right) partition and its quote, greeks and IV are identical (NaN == NaN).
+    Masks are computed per partition on first use.
+    """
+    FIELDS = ("bid", "ask", "delta", "gamma", "theta", "vega", "iv")
+
+    def __init__(self, prev: ChainSnapshot, snapshot: ChainSnapshot):
+        self.prev = prev
+        self.snapshot = snapshot
+        self._changed: dict[tuple, np.ndarray] = {}
+        self._changed_lists: dict[tuple, list] = {}
+
+    def changed_mask(self, expiry, side: str) -> np.ndarray:
+        key = (expiry, side)
+        mask = self._changed.get(key)
+        if mask is None:
+            columns = self.snapshot.get_columns(expiry, side)
+            prev_columns = self.prev.get_columns(expiry, side) if self.prev is not None else None
+            mask = self._diff(prev_columns, columns)
+            self._changed[key] = mask
+        return mask
+
+    def count_changed(self) -> int:
+        return sum(int(self.changed_mask(expiry, side).sum()) for expiry, side in self.snapshot.columns)
+
+    def is_unchanged(self, columns: ChainColumns, *rows) -> bool:
+        key = (columns.expiry, columns.side)
+        changed = self._changed_lists.get(key)
+        if changed is None:
+            # plain list, row lookups from Python are much cheaper than on the ndarray
+            changed = self.changed_mask(columns.expiry, columns.side).tolist()
+            self._changed_lists[key] = changed
+        for i in rows:
+            if changed[i]:
+                return False
+        return True
+
+    @staticmethod
+    def _diff(prev: ChainColumns, cur: ChainColumns) -> np.ndarray:
+        if cur is None:
+            return np.zeros(0, dtype=bool)
+        if prev is None or len(prev) == 0:
+            return np.ones(len(cur), dtype=bool)
+        idx = np.clip(np.searchsorted(prev.strike, cur.strike), 0, len(prev) - 1)
+        same = prev.strike[idx] == cur.strike
+        for name in ChainDiff.FIELDS:
+            a = getattr(prev, name)[idx]
+            b = getattr(cur, name)
+            same &= (a == b) | (np.isnan(a) & np.isnan(b))
+        return ~same
+
+
+class IncrementalSelectionCache:
+    """
+    Verticals and scored condors carried over from the previous selection tick.
+    A vertical is reused when neither leg changed. A condor is returned when none of its
+    four legs changed, along with the spot, expected move and probability inputs it was scored
+    against, so the scorer can reuse it as is or recompute only the terms that depend on them.
+    Reused verticals are rebound to the current slice's contracts and columns.
+    Entries that aren't looked up during a tick are dropped at the next one.
+    Condor lookups are made by the per-pair rank path (is_vectorized_rank=False); rank_matrix
+    rescores the whole block and only goes through the cache for the verticals it keeps.
+    """
+    def __init__(self):
+        self.snapshot: ChainSnapshot = None
+        self.diff: ChainDiff = None
+        self._prev_verticals: dict = {}
+        self._verticals: dict = {}
+        self._prev_condors: dict = {}
+        self._condors: dict = {}
+        self.vertical_hits = 0
+        self.vertical_misses = 0
+        self.condor_hits = 0
+        self.condor_misses = 0
+
+    def begin_tick(self, snapshot: ChainSnapshot):
+        """Rolls the cache over when `snapshot` is a new slice; a no-op for the same slice."""
+        if snapshot is None or snapshot is self.snapshot:
+            return
+        self.diff = ChainDiff(self.snapshot, snapshot)
+        self.snapshot = snapshot
+        self._prev_verticals, self._verticals = self._verticals, {}
+        self._prev_condors, self._condors = self._condors, {}
+        self.vertical_hits = self.vertical_misses = 0
+        self.condor_hits = self.condor_misses = 0
+
+    @staticmethod
+    def vertical_key(columns: ChainColumns, short_row: int, long_row: int) -> tuple:
+        return (columns.expiry, columns.side, columns.strike[short_row], columns.strike[long_row])
+
+    def get_vertical(self, columns: ChainColumns, short_row: int, long_row: int):
+        key = self.vertical_key(columns, short_row, long_row)
+        v = self._verticals.get(key)
+        if v is None:
+            v = self._prev_verticals.get(key)
+            if v is None or not self.diff.is_unchanged(columns, short_row, long_row):
+                self.vertical_misses += 1
+                return None
+            v.rebind(columns, short_row, long_row)
+            self._verticals[key] = v
+        self.vertical_hits += 1
+        return v
+
+    def put_vertical(self, columns: ChainColumns, short_row: int, long_row: int, v):
+        self._verticals[self.vertical_key(columns, short_row, long_row)] = v
+
+    def get_condor(self, pv, cv) -> tuple:
+        """
+        (underlying_price, expected_move, ic, probability_inputs) last scored for this pair
+        of verticals, or None.
+        Condors are keyed on the vertical objects themselves: a vertical only survives into
+        the next tick through get_vertical, i.e. when neither of its legs changed.
+        """
+        entry = self._condors.get((pv, cv))
+        if entry is None:
+            entry = self._prev_condors.get((pv, cv))
+            if entry is None:
+                self.condor_misses += 1
+                return None
+            self._condors[(pv, cv)] = entry
+        self.condor_hits += 1
+        return entry
+
+    def put_condor(self, pv, cv, underlying_price: float, expected_move: float, ic, probability_inputs: tuple = None):
+        self._condors[(pv, cv)] = (underlying_price, expected_move, ic, probability_inputs)
+
+    def stats(self) -> dict:
+        return {
+            "vertical_hits": self.vertical_hits,
+            "vertical_misses": self.vertical_misses,
+            "condor_hits": self.condor_hits,
+            "condor_misses": self.condor_misses
+        }
@@ -0,0 +1,336 @@
+# region imports
+from AlgorithmImports import *
+from bisect import bisect_left, bisect_right
+import numpy as np
+# endregion
+
+class ChainColumns:
+    """
+    Struct-of-arrays view of one (expiry, right) partition of a chain, sorted by strike.
+    Every contract field the selection and scoring code needs is read across the
+    CLR boundary once, when the snapshot is built. Row i of every column belongs to
+    contracts[i]. Missing quotes are stored as 0.0, missing greeks / IV as NaN.
+    """
+    FIELDS = ("strike", "bid", "ask", "mid", "delta", "gamma", "theta", "vega", "iv", "oi", "volume")
+
+    def __init__(self, expiry, side: str, contracts: list, rows: list[tuple]):
+        self.expiry = expiry
+        self.side: str = side
+        self.contracts: list = contracts
+        data = np.array(rows, dtype=np.float64).reshape(len(rows), len(self.FIELDS)).T.copy()
+        self.strike: np.ndarray = data[0]
+        self.bid: np.ndarray = data[1]
+        self.ask: np.ndarray = data[2]
+        self.mid: np.ndarray = data[3]
+        self.delta: np.ndarray = data[4]
+        self.gamma: np.ndarray = data[5]
+        self.theta: np.ndarray = data[6]
+        self.vega: np.ndarray = data[7]
+        self.iv: np.ndarray = data[8]
+        self.oi: np.ndarray = data[9]
+        self.volume: np.ndarray = data[10]
+        # rows whose greeks / IV were computed locally rather than supplied by the data feed
+        self.bs_filled: np.ndarray = np.zeros(len(contracts), dtype=bool)
+        self._masks: dict[tuple, np.ndarray] = {}
+        self._delta_indexes: dict = {}
+
+    def __len__(self):
+        return len(self.contracts)
+
+    @staticmethod
+    def extract(c) -> tuple:
+        """Reads one contract's fields in a single pass."""
+        bid = c.bid_price
+        ask = c.ask_price
+        bid = float(bid) if bid is not None else 0.0
+        ask = float(ask) if ask is not None else 0.0
+        iv = c.implied_volatility
+        oi = c.open_interest
+        volume = c.volume
+
+        delta = gamma = theta = vega = np.nan
+        greeks = c.greeks
+        if greeks is not None:
+            delta = _float_or_nan(greeks.delta)
+            gamma = _float_or_nan(greeks.gamma)
+            theta = _float_or_nan(greeks.theta)
+            vega = _float_or_nan(greeks.vega)
+
+        return (
+            float(c.strike), bid, ask, (bid + ask) / 2.0,
+            delta, gamma, theta, vega,
+            _float_or_nan(iv),
+            float(oi) if oi is not None else 0.0,
+            float(volume) if volume is not None else 0.0,
+        )
+
+    def tradeable_mask(self, max_rel_spread: float = 0.50, min_oi: float = None, min_volume: float = None) -> np.ndarray:
+        """
+        Boolean liquidity mask over all rows, cached per filter settings for the life of the slice.
+        A row needs a two-sided, non-crossed quote whose spread relative to mid is within
+        max_rel_spread, and optionally minimum open interest and volume.
+        """
+        key = (max_rel_spread, min_oi, min_volume)
+        mask = self._masks.get(key)
+        if mask is None:
+            bid, ask = self.bid, self.ask
+            mask = (bid > 0) & (ask > 0) & (ask > bid)
+            mask &= (ask - bid) <= max_rel_spread * np.maximum(self.mid, 1e-6)
+            if min_oi is not None:
+                mask &= self.oi >= min_oi
+            if min_volume is not None:
+                mask &= self.volume >= min_volume
+            self._masks[key] = mask
+        return mask
+
+    def delta_index(self, name, mask: np.ndarray) -> "DeltaIndex":
+        """DeltaIndex over the rows selected by `mask`, cached under `name` for the slice."""
+        index = self._delta_indexes.get(name)
+        if index is None:
+            index = DeltaIndex(self, mask)
+            self._delta_indexes[name] = index
+        return index
+
+    def missing_greeks_mask(self) -> np.ndarray:
+        """Rows with a two-sided quote but no delta or no usable IV."""
+        quoted = (self.bid > 0) & (self.ask > 0)
+        return quoted & (np.isnan(self.delta) | ~(self.iv > 0))
+
+    def row(self, i: int) -> dict:
+        return {
+            "strike": float(self.strike[i]),
+            "bid_price": float(self.bid[i]),
+            "ask_price": float(self.ask[i]),
+            "mid_price": float(self.mid[i]),
+            "delta": _none_if_nan(self.delta[i]),
+            "gamma": _none_if_nan(self.gamma[i]),
+            "theta": _none_if_nan(self.theta[i]),
+            "vega": _none_if_nan(self.vega[i]),
+            "iv": _none_if_nan(self.iv[i]),
+            "oi": float(self.oi[i]),
+            "volume": float(self.volume[i]),
+            "bs_filled": bool(self.bs_filled[i]),
+        }
+
+
+class ChainSnapshot:
+    """
+    Per-slice index of an option chain.
+    The chain is walked once and partitioned by (expiry, right) into
+    strike-sorted ChainColumns so analyzer lookups don't rescan the whole chain.
+    """
+    CALL = "call"
+    PUT = "put"
+
+    def __init__(self, chain, time, underlying_price: float = None):
+        self.time = time
+        self.underlying_price = underlying_price
+        self.columns: dict[tuple, ChainColumns] = {}
+        self.strikes: dict[tuple, list[float]] = {}
+        # sorted expiries and their fractional DTE at `time`, index for index
+        self.expiries: list = []
+        self.expiry_dte: list[float] = []
+        self._dte_by_expiry: dict = {}
+        self.count: int = 0
+        self._ladders: dict[tuple, StrikeLadder] = {}
+        # per-expiry ExpiryStats memo, filled lazily by OptionChainAnalyzer
+        self.expiry_stats: dict = {}
+        # per-expiry VolSmile memo, filled lazily by OptionChainAnalyzer
+        self.smiles: dict = {}
+        # contract lookup indexes, built on first use (only needed while positions are open)
+        self._by_symbol: dict = None
+        self._by_strike: dict = None
+        self._build(chain)
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def right_key(right) -> str:
+        return ChainSnapshot.CALL if right == OptionRight.CALL else ChainSnapshot.PUT
+
+    def _build(self, chain):
+        rows_by_key: dict[tuple, list] = {}
+        for c in chain:
+            key = (c.expiry, self.right_key(c.right))
+            rows_by_key.setdefault(key, []).append((ChainColumns.extract(c), c))
+            self.count += 1
+
+        for key, rows in rows_by_key.items():
+            rows.sort(key=lambda r: r[0][0])
+            self.columns[key] = ChainColumns(key[0], key[1], [r[1] for r in rows], [r[0] for r in rows])
+            self.strikes[key] = [r[0][0] for r in rows]
+
+        self.expiries = sorted({key[0] for key in self.columns})
+        self.expiry_dte = [self._dte_days_fractional(expiry) for expiry in self.expiries]
+        self._dte_by_expiry = dict(zip(self.expiries, self.expiry_dte))
+
+    def dte_days_fractional(self, expiry) -> float:
+        dte = self._dte_by_expiry.get(expiry)
+        return dte if dte is not None else self._dte_days_fractional(expiry)
+
+    def _dte_days_fractional(self, expiry) -> float:
+        # expiry is a datetime-like; treat expiration as 4:00pm local exchange time
+        expiry_dt = expiry.replace(hour=16, minute=0, second=0, microsecond=0)
+        seconds = (expiry_dt - self.time).total_seconds()
+        return max(seconds / 86400.0, 0.0)
+
+    def expiries_in_dte_window(self, min_dte: float, max_dte: float) -> list:
+        """Expiries with min_dte <= fractional DTE <= max_dte, in expiry order"""
+        # DTE is non-decreasing in expiry, so the window is a contiguous slice
+        lo = bisect_left(self.expiry_dte, min_dte)
+        hi = bisect_right(self.expiry_dte, max_dte)
+        return self.expiries[lo:hi]
+
+    def get_columns(self, expiry, side: str) -> ChainColumns:
+        return self.columns.get((expiry, side))
+
+    def get(self, expiry, side: str) -> list:
+        columns = self.columns.get((expiry, side))
+        return columns.contracts if columns is not None else []
+
+    def calls(self, expiry) -> list:
+        return self.get(expiry, self.CALL)
+
+    def puts(self, expiry) -> list:
+        return self.get(expiry, self.PUT)
+
+    def contracts(self, expiry) -> list:
+        return self.calls(expiry) + self.puts(expiry)
+
+    def find_strike(self, expiry, side: str, strike: float):
+        """Exact strike match within one (expiry, right) partition, or None."""
+        strikes = self.strikes.get((expiry, side))
+        if not strikes:
+            return None
+        i = bisect_left(strikes, strike)
+        if i < len(strikes) and strikes[i] == strike:
+            return self.columns[(expiry, side)].contracts[i]
+        return None
+
+    def get_by_symbol(self, symbol):
+        """Contract for an option Symbol, or None. O(1) after the first call of the slice."""
+        if self._by_symbol is None:
+            self._by_symbol = {}
+            for columns in self.columns.values():
+                for c in columns.contracts:
+                    self._by_symbol[c.symbol] = c
+        return self._by_symbol.get(symbol)
+
+    def get_by_strike(self, expiry, side: str, strike: float):
+        """Contract for an exact (expiry, right, strike), or None. O(1) after the first call of the slice."""
+        if self._by_strike is None:
+            self._by_strike = {}
+            for key, columns in self.columns.items():
+                for strike_i, c in zip(self.strikes[key], columns.contracts):
+                    self._by_strike[(key[0], key[1], strike_i)] = c
+        return self._by_strike.get((expiry, side, float(strike)))
+
+    def nearest_row(self, expiry, side: str, strike: float):
+        """Row of the strike closest to `strike`, lower strike wins ties."""
+        strikes = self.strikes.get((expiry, side))
+        if not strikes:
+            return None
+        return nearest_index(strikes, strike)
+
+    def nearest_strike(self, expiry, side: str, strike: float):
+        i = self.nearest_row(expiry, side, strike)
+        if i is None:
+            return None
+        return self.columns[(expiry, side)].contracts[i]
+
+    def get_ladder(self, expiry, side: str, name, mask_fn) -> "StrikeLadder":
+        """
+        Strike-sorted ladder of the rows in one (expiry, right) selected by
+        the boolean mask `mask_fn(columns)`. Built on first use and cached under
+        `name` for the rest of the slice.
+        """
+        key = (expiry, side, name)
+        ladder = self._ladders.get(key)
+        if ladder is None:
+            columns = self.columns.get((expiry, side))
+            if columns is None:
+                ladder = StrikeLadder(None, [], [])
+            else:
+                rows = np.flatnonzero(mask_fn(columns)).tolist()
+                strikes = self.strikes[(expiry, side)]
+                ladder = StrikeLadder(columns, [strikes[i] for i in rows], rows)
+            self._ladders[key] = ladder
+        return ladder
+
+
+class StrikeLadder:
+    """Strike-sorted subset of a ChainColumns partition with O(log n) nearest-strike lookups"""
+    def __init__(self, columns: ChainColumns, strikes: list[float], rows: list[int]):
+        self.columns = columns
+        self.strikes = strikes
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.strikes)
+
+    def nearest_row(self, strike: float):
+        if not self.strikes:
+            return None
+        return self.rows[nearest_index(self.strikes, strike)]
+
+    def nearest(self, strike: float):
+        i = self.nearest_row(strike)
+        if i is None:
+            return None
+        return self.columns.contracts[i]
+
+
+class DeltaIndex:
+    """
+    Rows of a ChainColumns partition with a known delta, sorted by |delta|.
+    Answers nearest-delta queries for a whole list of targets with one searchsorted.
+    """
+    def __init__(self, columns: ChainColumns, mask: np.ndarray):
+        self.columns = columns
+        rows = np.flatnonzero(mask & ~np.isnan(columns.delta))
+        abs_delta = np.abs(columns.delta[rows])
+        order = np.argsort(abs_delta, kind="stable")
+        self.rows: np.ndarray = rows[order]
+        self.abs_delta: np.ndarray = abs_delta[order]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def nearest_rows(self, delta_targets) -> np.ndarray:
+        """
+        Row closest in |delta| to each target (targets are unsigned).
+        Equal distances resolve to the lower row, i.e. the lower strike.
+        """
+        targets = np.abs(np.asarray(delta_targets, dtype=np.float64))
+        n = len(self.rows)
+        hi = np.clip(np.searchsorted(self.abs_delta, targets), 0, n - 1)
+        lo = np.clip(hi - 1, 0, n - 1)
+        # first of any run of equal |delta| so ties keep strike order
+        lo = np.searchsorted(self.abs_delta, self.abs_delta[lo])
+        d_hi = np.abs(self.abs_delta[hi] - targets)
+        d_lo = np.abs(self.abs_delta[lo] - targets)
+        r_hi = self.rows[hi]
+        r_lo = self.rows[lo]
+        pick_hi = (d_hi < d_lo) | ((d_hi == d_lo) & (r_hi < r_lo))
+        return np.where(pick_hi, r_hi, r_lo)
+
+
+def nearest_index(strikes: list[float], strike: float) -> int:
+    """Index of the value in sorted `strikes` closest to `strike`, lower index wins ties."""
+    i = bisect_left(strikes, strike)
+    if i == 0:
+        return 0
+    if i == len(strikes):
+        return len(strikes) - 1
+    if strikes[i] - strike < strike - strikes[i - 1]:
+        return i
+    return i - 1
+
+
+def _float_or_nan(x) -> float:
+    return float(x) if x is not None else np.nan
+
+
+def _none_if_nan(x):
+    return None if np.isnan(x) else float(x)
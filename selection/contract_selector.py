@@ -1,28 +1,23 @@
 # region imports
 from AlgorithmImports import *
 from strategy.config import ContractSelectionConfig
-from option_chain_analyzer import OptionChainAnalyzer
-from analytics.option_metrics import OptionMetrics
-from models import VerticalCandidate, ContractSelectorResult
+from models import ContractSelectorResult, OptionChainFinderResult, VerticalSpreadArrays
+from selection.selection_strategies import SelectionStrategy, get_selection_strategy
 from utils.position_finder_exception import PositionFinderException
+import numpy as np
 # endregion
 
-# in future make this an interface
-# then have several "contractSelectoryStrategies" like "(DeltaStrategy, IVWeightedStrategy, ProbabilityStrategy)"
-# to test other strats with same algo
-
 class ContractSelector:
     def __init__(self, logger):
         self.logger = logger
 
-    def select_vertical_spreads_fixed_width(self, sel_cfg, call_spreads, put_spreads, symbol, expiry) -> ContractSelectorResult:
+    def select_vertical_spreads_fixed_width(self, sel_cfg, call_spreads, put_spreads, 
+        call_columns, put_columns) -> ContractSelectorResult:
+        """call_spreads / put_spreads map a short row to its long rows, all rows of the side's columns."""
         selector_result = ContractSelectorResult()
         try:
-            put_verticals = self.get_vertical_candidates(put_spreads, "put")
-            call_verticals = self.get_vertical_candidates(call_spreads, "call")
-
-            selector_result.call_verticals = call_verticals
-            selector_result.put_verticals = put_verticals
+            selector_result.put_spreads = self.spreads_from_rows(put_columns, put_spreads, "put")
+            selector_result.call_spreads = self.spreads_from_rows(call_columns, call_spreads, "call")
 
         except Exception as e:
             selector_result.had_error = True
@@ -30,47 +25,37 @@ class ContractSelector:
         
         return selector_result
 
-    def select_vertical_spreads(self, sel_cfg, calls, puts) -> ContractSelectorResult:
+    def select_vertical_spreads(self, sel_cfg, candidates: OptionChainFinderResult,
+        strategy: SelectionStrategy = None) -> ContractSelectorResult:
+        """
+        Short legs are picked by `strategy` (sel_cfg.selection_strategy by default),
+        long legs are every same-side row within spread_width_range.
+        """
         selector_result = ContractSelectorResult()
         try:
             spread_width_range = sel_cfg.spread_width_range
-            call_low, call_high = sel_cfg.short_call_delta_range
-            put_low, put_high = sel_cfg.short_put_delta_range           
-            spread_min, spread_max = spread_width_range
+            call_columns = candidates.call_columns
+            put_columns = candidates.put_columns
 
-            short_call_candidates = [c for c in calls
-                            if c.greeks and c.greeks.delta is not None
-                            and call_low <= c.greeks.delta <= call_high]
+            call_rows = np.asarray(candidates.call_rows, dtype=np.intp)
+            put_rows = np.asarray(candidates.put_rows, dtype=np.intp)
 
-            short_put_candidates = [p for p in puts
-                            if p.greeks and p.greeks.delta is not None
-                            and put_low <= p.greeks.delta <= put_high]
+            short_call_rows, short_put_rows = self.select_short_rows(sel_cfg, candidates, strategy)
+            n_shorts = len(short_call_rows) + len(short_put_rows)
+            selector_result.funnel_counts["shorts_in"] = len(call_rows) + len(put_rows)
+            selector_result.funnel_counts["shorts_filtered"] = len(call_rows) + len(put_rows) - n_shorts
 
-            if not short_call_candidates or not short_put_candidates:
-                msg = "ContractSelector.select_vertical_spreads couldn't find short calls in desired delta range"
+            if len(short_call_rows) == 0 or len(short_put_rows) == 0:
+                msg = "ContractSelector.select_vertical_spreads couldn't find short legs for the selection strategy"
                 raise PositionFinderException(msg)
 
-            call_spreads = {}
-            for short_call in short_call_candidates:
-                longs = self.long_legs_for_short(
-                    short_call, calls, spread_width_range, "call"
-                )
-                if longs:
-                    call_spreads[short_call] = longs
-
-            put_spreads = {}
-            for short_put in short_put_candidates:
-                longs = self.long_legs_for_short(
-                    short_put, puts, spread_width_range, "put"
-                )
-                if longs:
-                    put_spreads[short_put] = longs
-            
-            put_verticals = self.get_vertical_candidates(put_spreads, "put")
-            call_verticals = self.get_vertical_candidates(call_spreads, "call")
-
-            selector_result.call_verticals = call_verticals
-            selector_result.put_verticals = put_verticals
+            call_spreads = self.pairwise_verticals(call_columns, short_call_rows, call_rows, spread_width_range, "call")
+            put_spreads = self.pairwise_verticals(put_columns, short_put_rows, put_rows, spread_width_range, "put")
+            selector_result.funnel_counts["shorts_no_long_leg"] = (n_shorts
+                - len(np.unique(call_spreads.short_rows)) - len(np.unique(put_spreads.short_rows)))
+
+            selector_result.call_spreads = call_spreads
+            selector_result.put_spreads = put_spreads
 
         except Exception as e:
             selector_result.had_error = True
@@ -79,32 +64,55 @@ class ContractSelector:
         return selector_result
         
        
-    def get_vertical_candidates(self, spreads, side):
-        verticals: list[VerticalCandidate] = []
-        for short, longs in spreads.items():
-            for long in longs:
-                vert_cand = OptionMetrics.vertical_candidate(short, long, side)
-                verticals.append(vert_cand)
-        return verticals
-
-    def long_legs_for_short(self, short_contract, same_side_contracts, 
-        width_range: tuple[float, float],
-        direction: str
-    ):
+    def select_short_rows(self, sel_cfg, candidates: OptionChainFinderResult,
+        strategy: SelectionStrategy = None) -> tuple[np.ndarray, np.ndarray]:
+        """(short call rows, short put rows) the strategy keeps out of the candidates' rows"""
+        if strategy is None:
+            strategy = get_selection_strategy(sel_cfg.selection_strategy)
+        call_rows = np.asarray(candidates.call_rows, dtype=np.intp)
+        put_rows = np.asarray(candidates.put_rows, dtype=np.intp)
+        short_call_rows = strategy.short_rows(candidates.call_columns, call_rows, sel_cfg, candidates.expiry_stats)
+        short_put_rows = strategy.short_rows(candidates.put_columns, put_rows, sel_cfg, candidates.expiry_stats)
+        return short_call_rows, short_put_rows
+
+    def spreads_from_rows(self, columns, spreads: dict, side: str) -> VerticalSpreadArrays:
+        """VerticalSpreadArrays for {short_row: [long_row, ...]}, short-major in the dict's order."""
+        short_rows = [short_row for short_row, long_rows in spreads.items() for _ in long_rows]
+        long_rows = [long_row for long_rows in spreads.values() for long_row in long_rows]
+        short_rows = np.asarray(short_rows, dtype=np.intp)
+        long_rows = np.asarray(long_rows, dtype=np.intp)
+        width = np.abs(columns.strike[long_rows] - columns.strike[short_rows])
+        return self._spread_arrays(columns, short_rows, long_rows, width, side)
+
+    def pairwise_verticals(self, columns, short_rows, long_rows,
+        width_range: tuple[float, float], side: str) -> VerticalSpreadArrays:
+        """
+        Every (short, long) pair of rows whose strikes are ordered for a credit spread on
+        `side` and whose width is within width_range, built from the short x long strike
+        difference matrix. Pairs come out short-major, in the order of short_rows then long_rows.
+        """
         min_w, max_w = width_range
+        short_rows = np.asarray(short_rows, dtype=np.intp)
+        long_rows = np.asarray(long_rows, dtype=np.intp)
+        strikes = columns.strike
+
+        width = strikes[long_rows][None, :] - strikes[short_rows][:, None]
+        if side == "put":
+            width = -width
+        si, li = np.nonzero((width > 0) & (min_w <= width) & (width <= max_w))
+        return self._spread_arrays(columns, short_rows[si], long_rows[li], width[si, li], side)
+
+    @staticmethod
+    def _spread_arrays(columns, s_rows, l_rows, width, side: str) -> VerticalSpreadArrays:
+        """Mid credit, conservative credit and credit ratio of the (s_rows, l_rows) spreads"""
+        bid, ask = columns.bid, columns.ask
+        quoted = (bid > 0) & (ask > 0)
+        mid = np.where(quoted, (bid + ask) / 2, 0.0)
+        credit = np.maximum(0.0, mid[s_rows] - mid[l_rows])
+        conservative_credit = np.maximum(0.0, bid[s_rows] - ask[l_rows])
+        credit_ratio = np.where(width > 0, credit / np.where(width > 0, width, 1.0), 0.0)
+        return VerticalSpreadArrays(side, columns, s_rows, l_rows, width, credit, conservative_credit, credit_ratio)
 
-        if direction == "call":
-            return [
-                c for c in same_side_contracts
-                if c.strike > short_contract.strike
-                and min_w <= (c.strike - short_contract.strike) <= max_w
-            ]
-        else:
-            return [
-                p for p in same_side_contracts
-                if p.strike < short_contract.strike
-                and min_w <= (short_contract.strike - p.strike) <= max_w
-            ]
     # What you’re computing is the standard “expected move” (one standard deviation). Great. Later you’ll apply a multiplier (1.0–1.2x).
     
 
@@ -0,0 +1,145 @@
+# region imports
+from AlgorithmImports import *
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from models import ScorerResult, OptionChainFinderResult, ContractSelectorResult
+from selection.chain_diff import IncrementalSelectionCache
+# endregion
+
+class ExpirySelectionJob:
+    """
+    Everything one expiry's select -> prune -> rank stage needs once its short-leg
+    candidates are known (and, in fixed width mode, their long legs resolved), so the
+    stage itself doesn't touch the algorithm or the chain analyzer.
+    """
+    def __init__(self, expiry, contract_candidates: OptionChainFinderResult, underlying_price: float,
+        sel_config, strategy=None, call_spreads: dict = None, put_spreads: dict = None):
+        self.expiry = expiry
+        self.contract_candidates = contract_candidates
+        self.underlying_price = underlying_price
+        self.sel_config = sel_config
+        self.strategy = strategy
+        # fixed width mode: {short_row: [long_row]} per side
+        self.call_spreads = call_spreads
+        self.put_spreads = put_spreads
+        # SelectionFunnel counters of this job, merged by the finder in expiry order
+        self.counts: dict = {}
+
+    def count(self, name: str, count=1):
+        if count:
+            self.counts[name] = self.counts.get(name, 0) + count
+
+
+def rank_selection_job(job: ExpirySelectionJob, contract_selector, scorer,
+    cache: IncrementalSelectionCache = None) -> ScorerResult:
+    """
+    Vertical selection, optional pruning and condor ranking for one expiry, None if nothing ranks.
+    What each stage took in and removed is counted on job.counts.
+    """
+    candidates = job.contract_candidates
+    contract_bundle: ContractSelectorResult = None
+    started = time.perf_counter()
+    if job.sel_config.is_use_fixed_spread_width:
+        contract_bundle = contract_selector.select_vertical_spreads_fixed_width(
+            job.sel_config, job.call_spreads, job.put_spreads, candidates.call_columns, candidates.put_columns)
+    else:
+        contract_bundle = contract_selector.select_vertical_spreads(job.sel_config, candidates, job.strategy)
+        if contract_bundle:
+            for name, count in contract_bundle.funnel_counts.items():
+                job.count(name, count)
+    job.count("seconds_select", time.perf_counter() - started)
+    if not contract_bundle or contract_bundle.had_error or not contract_bundle.is_verticals_populated():
+        job.count("expiries_no_verticals")
+        return None
+
+    # VerticalSpreadArrays; the scorer builds VerticalCandidates only for what it keeps
+    put_verticals, call_verticals = contract_bundle.put_spreads, contract_bundle.call_spreads
+    job.count("verticals_in", len(put_verticals) + len(call_verticals))
+    started = time.perf_counter()
+    prune_counts = None
+    if scorer.config.is_prune_verticals:
+        put_verticals, call_verticals, prune_counts = scorer.prune_verticals(put_verticals, call_verticals)
+        for side, counts in prune_counts.items():
+            for gate in ("width", "min_credit", "min_credit_ratio", "top_n"):
+                job.count(f"verticals_{gate}", counts[gate])
+        if len(put_verticals) == 0 or len(call_verticals) == 0:
+            job.count("seconds_rank", time.perf_counter() - started)
+            job.count("expiries_no_verticals")
+            return None
+    scorer_result = scorer.rank(put_verticals, call_verticals,
+        job.underlying_price, candidates.em, cache, candidates.expiry_stats)
+    job.count("seconds_rank", time.perf_counter() - started)
+    scorer_result.prune_counts = prune_counts
+    if prune_counts:
+        for side, counts in prune_counts.items():
+            for gate in ("width", "min_credit", "min_credit_ratio", "top_n"):
+                scorer_result.add_rejections(f"{side}_vertical_{gate}", counts[gate])
+    job.count("condors_in", scorer_result.scored_count + scorer_result.pruned_pairs)
+    job.count("condors_bound_pruned", scorer_result.pruned_pairs)
+    for gate, count in scorer_result.gate_failures.items():
+        job.count(f"condors_{gate}", count)
+    job.count("condors_gated", scorer_result.gated_pairs)
+    if scorer_result.had_error or not scorer_result.has_candidates():
+        # e.g. every pair failed an enforced gate
+        job.count("expiries_no_condors")
+        return None
+    return scorer_result
+
+
+# per worker process: (scorer config, ContractSelector, IronCondorScorer), reused across jobs
+_process_stage = None
+
+def _rank_selection_job_in_process(job: ExpirySelectionJob, scorer_config) -> tuple[ScorerResult, dict]:
+    """rank_selection_job in a worker; the job is a pickled copy, so its counts go back with the result"""
+    global _process_stage
+    if _process_stage is None or _process_stage[0] != scorer_config:
+        from selection.contract_selector import ContractSelector
+        from selection.iron_condor_scorer import IronCondorScorer
+        _process_stage = (scorer_config, ContractSelector(logger=None), IronCondorScorer(config=scorer_config))
+    scorer_result = rank_selection_job(job, _process_stage[1], _process_stage[2])
+    return scorer_result, job.counts
+
+
+class ExpiryExecutor:
+    """
+    Opt-in fan-out of per-expiry selection jobs.
+    "thread": jobs share the finder's selector, scorer and selection cache; the
+    NumPy kernels release the GIL, so expiries overlap. "process": for offline replay only,
+    jobs and their chain columns are pickled to worker processes, each with its own scorer
+    and no selection cache (LEAN contract objects don't pickle inside the engine).
+    Results always come back in job order, whatever order the workers finish in.
+    """
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __init__(self, mode: str, max_workers: int = None):
+        if mode not in (self.THREAD, self.PROCESS):
+            raise ValueError(f"ExpiryExecutor: unknown mode {mode!r}")
+        self.mode: str = mode
+        self.max_workers: int = max_workers
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            pool_cls = ThreadPoolExecutor if self.mode == self.THREAD else ProcessPoolExecutor
+            self._pool = pool_cls(max_workers=self.max_workers)
+        return self._pool
+
+    def rank_jobs(self, jobs: list[ExpirySelectionJob], contract_selector, scorer,
+        cache: IncrementalSelectionCache = None) -> list[ScorerResult]:
+        """rank_selection_job for every job, in job order; a worker's exception is re-raised"""
+        pool = self._get_pool()
+        if self.mode == self.THREAD:
+            futures = [pool.submit(rank_selection_job, job, contract_selector, scorer, cache) for job in jobs]
+            return [future.result() for future in futures]
+        futures = [pool.submit(_rank_selection_job_in_process, job, scorer.config) for job in jobs]
+        scorer_results = []
+        for job, future in zip(jobs, futures):
+            scorer_result, job.counts = future.result()
+            scorer_results.append(scorer_result)
+        return scorer_results
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -1,5 +1,7 @@
 # region imports
 from AlgorithmImports import *
+import time
+import numpy as np
 from selection.iron_condor_scorer import IronCondorScorer
 from selection.contract_selector import ContractSelector
 from selection.option_chain_analyzer import OptionChainAnalyzer
@@ -7,12 +9,12 @@ from strategy.config import ContractSelectionConfig, IronCondorScoringConfig
 from models import VerticalCandidate, IronCondorCandidate
 from utils.position_finder_exception import PositionFinderException
 from models.selection.scorer_result import ScorerResult, OptionChainFinderResult
-from models.selection.finder_result import FinderResult
+from models.selection.finder_result import FinderResult, ContractSelectorResult
+from selection.chain_diff import IncrementalSelectionCache
+from selection.selection_strategies import SelectionStrategy, get_selection_strategy
+from selection.expiry_executor import ExpiryExecutor, ExpirySelectionJob, rank_selection_job
+from analytics.selection_funnel import SelectionFunnel
 # endregion
-class IronCondorScoreResult:
-    def __init__(self, ic):
-        self.ic = ic
-
 class IronCondorFinder:
     def __init__(self, config, logger, contract_selector: ContractSelector, 
         iron_condor_scorer: IronCondorScorer, option_chain_analyzer: OptionChainAnalyzer):
@@ -21,26 +23,39 @@ class IronCondorFinder:
         self.contract_selector = contract_selector
         self.iron_condor_scorer = iron_condor_scorer
         self.option_chain_analyzer = option_chain_analyzer
+        # verticals / condors reused across ticks for legs whose quotes didn't change
+        self.selection_cache: IncrementalSelectionCache = IncrementalSelectionCache() if config.is_incremental_selection else None
+        # opt-in parallel select -> rank of find_best's expiries, None = one after another
+        self.expiry_executor: ExpiryExecutor = (ExpiryExecutor(config.expiry_executor, config.expiry_executor_workers)
+            if config.expiry_executor else None)
+        # why find_best's ticks did or didn't produce a condor, stage by stage
+        self.funnel: SelectionFunnel = SelectionFunnel()
 
 
-    def _get_valid_expiries(self, chain, now_time, sel_config):
+    def _get_valid_expiries(self, symbol, sel_config) -> list:
+        """Expiries within sel_config.dte_range, in expiry order, from the slice's expiry index"""
+        snapshot = self.option_chain_analyzer.get_snapshot(symbol)
+        if snapshot is None:
+            return []
         min_dte, max_dte = sel_config.dte_range
-        all_expiries = self.option_chain_analyzer.get_all_expiries(chain)
-        valid_expiries = set()
-        for expiry in all_expiries:
-            expiry_dte = self.dte_days_fractional(now_time, expiry)
-            if min_dte <= expiry_dte <= max_dte:
-                valid_expiries.add(expiry)
-        return valid_expiries
+        return snapshot.expiries_in_dte_window(min_dte, max_dte)
 
     
-    def find_best(self, now_time, symbol, underlying_price, chain, sel_config: ContractSelectionConfig) -> FinderResult:
+    def find_best(self, now_time, symbol, underlying_price, sel_config: ContractSelectionConfig) -> FinderResult:
         finder_result = FinderResult()
+        funnel = self.funnel
+        funnel.begin_tick(now_time)
         try:
-            valid_expiries = self._get_valid_expiries(chain, now_time, sel_config)
+            self._begin_tick(symbol)
+            valid_expiries = self._get_valid_expiries(symbol, sel_config)
+            if not valid_expiries:
+                funnel.add("ticks_no_chain" if self.option_chain_analyzer.get_snapshot(symbol) is None else "ticks_no_expiry")
             
-            all_score_results: list[ScorerResult] = []
+            # short-leg candidates and long-leg lookups read the analyzer's per-slice caches,
+            # so they're resolved here; only the select -> rank stage is fanned out
+            jobs = []
             for expiry in valid_expiries:
+                started = time.perf_counter()
                 contract_candidates: OptionChainFinderResult = None
                 if sel_config.is_use_fixed_delta:
                     contract_candidates = self.option_chain_analyzer.find_fixed_delta(
@@ -48,46 +63,148 @@ class IronCondorFinder:
                 else:
                     contract_candidates = self.option_chain_analyzer.find_candidates(
                         symbol, expiry, now_time, underlying_price)
-                if contract_candidates and not contract_candidates.had_error and contract_candidates.is_calls_and_puts_not_empty():
-                    contract_bundle: ContractSelectorResult = None
-                    if sel_config.is_use_fixed_spread_width:
-                        call_spreads, put_spreads = self.find_long_leg_with_fixed_width(contract_candidates.calls, contract_candidates.puts, symbol, expiry, sel_config.fixed_spread_width)
-                        contract_bundle = self.contract_selector.select_vertical_spreads_fixed_width(
-                            sel_config, call_spreads, put_spreads, symbol, expiry)
-                    else:
-                        contract_bundle = self.contract_selector.select_vertical_spreads(
-                            sel_config, contract_candidates.calls, contract_candidates.puts)
-                    if contract_bundle and not contract_bundle.had_error and contract_bundle.is_verticals_populated():
-                        scorer_result = self.iron_condor_scorer.rank(contract_bundle.put_verticals, contract_bundle.call_verticals, underlying_price, contract_candidates.em)
-                        finder_result.add_score_result(expiry,scorer_result)
+                job = self._selection_job(contract_candidates, symbol, expiry, underlying_price, sel_config)
+                funnel.add("seconds_candidates", time.perf_counter() - started)
+                if job:
+                    self._count_contracts(job)
+                    jobs.append(job)
+                else:
+                    funnel.add("expiries_no_candidates")
+
+            if self.expiry_executor is not None and len(jobs) > 1:
+                scorer_results = self.expiry_executor.rank_jobs(jobs, self.contract_selector,
+                    self.iron_condor_scorer, self.selection_cache)
+            else:
+                scorer_results = [self._rank_job(job) for job in jobs]
+            # merged in expiry order whatever order the workers finished in
+            for job, scorer_result in zip(jobs, scorer_results):
+                funnel.add_counts(job.counts)
+                if scorer_result:
+                    finder_result.add_score_result(job.expiry, scorer_result)
         except Exception as e:
             finder_result.had_error = True
             finder_result.exception = e
+            funnel.add("ticks_error")
 
         if not finder_result.has_found_result():
             finder_result.had_error = True
+            funnel.add("ticks_no_result")
+        else:
+            funnel.add("ticks_found")
         return finder_result
 
-    def find_long_leg_with_fixed_width(self, short_calls, short_puts, symbol, expiry, fixed_spread_width):
-        call_spreads = {}
-        for short_call in short_calls:
-            longs = self.option_chain_analyzer.long_legs_for_short_fixed_width(symbol,
-                short_call, expiry, fixed_spread_width, "call"
-            )
-            if longs:
-                call_spreads[short_call] = longs
-
-        put_spreads = {}
-        for short_put in short_puts:
-            longs = self.option_chain_analyzer.long_legs_for_short_fixed_width(symbol,
-                short_put, expiry, fixed_spread_width, "put"
-            )
-            if longs:
-                put_spreads[short_put] = longs
-        return call_spreads, put_spreads
+    def _count_contracts(self, job: ExpirySelectionJob):
+        """Funnel entry counters of the job's expiry: its contracts and how many aren't tradeable"""
+        for columns in (job.contract_candidates.call_columns, job.contract_candidates.put_columns):
+            tradeable = self.option_chain_analyzer.tradeable_mask(columns)
+            job.count("contracts_in", len(columns))
+            job.count("contracts_untradeable", len(columns) - int(np.count_nonzero(tradeable)))
+
+    def find_best_by_delta_targets(self, now_time, symbol, underlying_price,
+        sel_config: ContractSelectionConfig, delta_targets) -> dict[float, FinderResult]:
+        """
+        Runs the fixed-delta pipeline once per delta target, resolving the short legs
+        for every target with a single delta-index lookup per expiry.
+        Used for research logging of what each delta's condor would have looked like.
+        """
+        finder_results = {t: FinderResult() for t in delta_targets}
+        try:
+            self._begin_tick(symbol)
+            valid_expiries = self._get_valid_expiries(symbol, sel_config)
+            for expiry in valid_expiries:
+                candidates_by_target = self.option_chain_analyzer.find_fixed_deltas(
+                    symbol, expiry, now_time, underlying_price, delta_targets)
+                if not candidates_by_target:
+                    continue
+                for t, contract_candidates in candidates_by_target.items():
+                    scorer_result = self._rank_candidates(contract_candidates, symbol, expiry, underlying_price, sel_config)
+                    if scorer_result:
+                        finder_results[t].add_score_result(expiry, scorer_result)
+        except Exception as e:
+            for finder_result in finder_results.values():
+                finder_result.had_error = True
+                finder_result.exception = e
+
+        for finder_result in finder_results.values():
+            if not finder_result.has_found_result():
+                finder_result.had_error = True
+        return finder_results
+
+    def find_best_by_strategies(self, now_time, symbol, underlying_price,
+        sel_config: ContractSelectionConfig, strategy_names) -> dict[str, FinderResult]:
+        """
+        Best condor of each named selection strategy, for side-by-side research logging.
+        Every strategy runs over the same per-expiry chain view, expiry stats and
+        vertical cache, so only short-leg selection and ranking are repeated per strategy.
+        Short legs always come from the strategy (is_use_fixed_delta is ignored).
+        """
+        finder_results = {name: FinderResult() for name in strategy_names}
+        try:
+            strategies = {name: get_selection_strategy(name) for name in strategy_names}
+            self._begin_tick(symbol)
+            valid_expiries = self._get_valid_expiries(symbol, sel_config)
+            for expiry in valid_expiries:
+                contract_candidates = self.option_chain_analyzer.find_candidates(
+                    symbol, expiry, now_time, underlying_price)
+                for name, strategy in strategies.items():
+                    scorer_result = self._rank_candidates(contract_candidates, symbol, expiry, underlying_price, 
+                        sel_config, strategy)
+                    if scorer_result:
+                        finder_results[name].add_score_result(expiry, scorer_result)
+        except Exception as e:
+            for finder_result in finder_results.values():
+                finder_result.had_error = True
+                finder_result.exception = e
+
+        for finder_result in finder_results.values():
+            if not finder_result.has_found_result():
+                finder_result.had_error = True
+        return finder_results
+
+    def _begin_tick(self, symbol):
+        if self.selection_cache is not None:
+            self.selection_cache.begin_tick(self.option_chain_analyzer.get_snapshot(symbol))
 
-    def dte_days_fractional(self, now_time, expiry):
-        # expiry is a datetime-like; treat expiration as 4:00pm local exchange time
-        expiry_dt = expiry.replace(hour=16, minute=0, second=0, microsecond=0)
-        seconds = (expiry_dt - now_time).total_seconds()
-        return max(seconds / 86400.0, 0.0)
+    def _rank_candidates(self, contract_candidates: OptionChainFinderResult, symbol, expiry, 
+        underlying_price, sel_config: ContractSelectionConfig, strategy: SelectionStrategy = None) -> ScorerResult:
+        """
+        Vertical selection and condor ranking for one expiry's short-leg candidates.
+        With a strategy the short legs are the candidates it keeps, in either width mode.
+        """
+        job = self._selection_job(contract_candidates, symbol, expiry, underlying_price, sel_config, strategy)
+        if job is None:
+            return None
+        return self._rank_job(job)
+
+    def _selection_job(self, contract_candidates: OptionChainFinderResult, symbol, expiry,
+        underlying_price, sel_config: ContractSelectionConfig, strategy: SelectionStrategy = None) -> ExpirySelectionJob:
+        """The expiry's select -> rank inputs, with fixed-width long legs resolved, or None"""
+        if not contract_candidates or contract_candidates.had_error or not contract_candidates.is_calls_and_puts_not_empty():
+            return None
+        job = ExpirySelectionJob(expiry, contract_candidates, underlying_price, sel_config, strategy)
+        if sel_config.is_use_fixed_spread_width:
+            short_call_rows, short_put_rows = contract_candidates.call_rows, contract_candidates.put_rows
+            if strategy is not None:
+                short_call_rows, short_put_rows = self.contract_selector.select_short_rows(
+                    sel_config, contract_candidates, strategy)
+            job.call_spreads, job.put_spreads = self.find_long_leg_with_fixed_width(short_call_rows, short_put_rows, symbol, expiry, sel_config.fixed_spread_width)
+            n_rows = len(contract_candidates.call_rows) + len(contract_candidates.put_rows)
+            n_shorts = len(short_call_rows) + len(short_put_rows)
+            job.count("shorts_in", n_rows)
+            job.count("shorts_filtered", n_rows - n_shorts)
+            job.count("shorts_no_long_leg", n_shorts - len(job.call_spreads) - len(job.put_spreads))
+        return job
+
+    def _rank_job(self, job: ExpirySelectionJob) -> ScorerResult:
+        return rank_selection_job(job, self.contract_selector, self.iron_condor_scorer, self.selection_cache)
+
+    def shutdown(self):
+        if self.expiry_executor is not None:
+            self.expiry_executor.shutdown()
+
+    def find_long_leg_with_fixed_width(self, short_call_rows, short_put_rows, symbol, expiry, fixed_spread_width):
+        call_spreads = self.option_chain_analyzer.long_legs_for_shorts_fixed_width(symbol,
+            short_call_rows, expiry, fixed_spread_width, "call")
+        put_spreads = self.option_chain_analyzer.long_legs_for_shorts_fixed_width(symbol,
+            short_put_rows, expiry, fixed_spread_width, "put")
+        return call_spreads, put_spreads
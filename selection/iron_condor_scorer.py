@@ -1,177 +1,571 @@
 # region imports
 from AlgorithmImports import *
+import math
+import numpy as np
 from analytics.option_metrics import OptionMetrics
+from analytics.condor_probability import CondorProbability
 from utils.position_finder_exception import PositionFinderException
-from models import ScorerResult, IronCondorCandidate
+from models import ScorerResult, IronCondorCandidate, CondorGate, VerticalSpreadArrays
+from selection.chain_diff import IncrementalSelectionCache
 # endregion
 
 class IronCondorScorer:
     def __init__(self, config):
         self.config = config
 
-    def get_scores(self, ic: IronCondorCandidate, underlying_price):
+    def get_scores(self, ic: IronCondorCandidate, underlying_price, probability_inputs: tuple = None):
         center = self.get_center_score(ic.put,ic.call,underlying_price, self.config.missing_centering_score, self.config.check_center_score)
-        balance = self.get_delta_balance_score(ic.put, ic.call, self.config.missing_delta_score, self.config.check_delta_balance)
+        balance = self.get_delta_balance_score(ic.put, ic.call, underlying_price, self.config.missing_delta_score, self.config.check_delta_balance)
 
         ic.rr_score = self.config.w_rr * ic.rr
         ic.cushion_score = self.config.w_cushion * ic.cushion
-        ic.center_score = self.config.w_center * center['score']
-        ic.delta_balance_score = self.config.w_balance * balance['score']
+        ic.center_score = self.config.w_center * center
+        ic.delta_balance_score = self.config.w_balance * balance
+        self.set_probability_scores(ic, probability_inputs)
         
         score = (
             self.config.w_rr * ic.rr +
             self.config.w_cushion * ic.cushion +
-            self.config.w_center * center['score'] +
-            self.config.w_balance * balance['score']
+            self.config.w_center * center +
+            self.config.w_balance * balance +
+            ic.pop_score + ic.touch_score + ic.ev_score
         )
         ic.overall_score = score
+
+    def set_probability_scores(self, ic: IronCondorCandidate, probability_inputs: tuple = None):
+        """
+        pop / touch / ev_ratio and their weighted scores for one condor.
+        probability_inputs is (put P(S_T > short), put expected payout, call P(S_T > short),
+        call expected payout) from CondorProbability.vertical_terms; None leaves the terms out.
+        """
+        if probability_inputs is None:
+            return
+        pop, touch, ev_ratio = CondorProbability.pair_terms(*probability_inputs, ic.total_credit, ic.max_loss)
+        ic.pop, ic.touch, ic.ev_ratio = float(pop), float(touch), float(ev_ratio)
+        ic.pop_score = self.config.w_pop * ic.pop
+        ic.touch_score = self.config.w_touch * (1.0 - ic.touch)
+        ic.ev_score = self.config.w_credit * ic.ev_ratio
+
+    def probability_inputs(self, put_arrays: dict, call_arrays: dict, underlying_price, expiry_stats) -> tuple:
+        """
+        Per-vertical lognormal inputs for both sides from their side_arrays, (put_p_above,
+        put_payout, call_p_above, call_payout) as arrays, or None without a usable ATM IV
+        and time to expiry.
+        """
+        if expiry_stats is None or not expiry_stats.iv > 0 or expiry_stats.dte_days is None:
+            return None
+        forward = expiry_stats.forward if expiry_stats.forward else underlying_price
+        t = expiry_stats.dte_days / 365.0
+        put_p_above, put_payout = CondorProbability.vertical_terms(put_arrays["short_strike"],
+            put_arrays["long_strike"], put_arrays["short_iv"], False, forward, t, expiry_stats.iv)
+        call_p_above, call_payout = CondorProbability.vertical_terms(call_arrays["short_strike"],
+            call_arrays["long_strike"], call_arrays["short_iv"], True, forward, t, expiry_stats.iv)
+        return put_p_above, put_payout, call_p_above, call_payout
+
+    @staticmethod
+    def side_arrays(verticals) -> dict:
+        """
+        credit, width, short / long strike, short delta and short IV of one side's verticals
+        as arrays (NaN for a missing delta or IV). Read straight off VerticalSpreadArrays,
+        or gathered from a list of VerticalCandidates.
+        """
+        if isinstance(verticals, VerticalSpreadArrays):
+            return {"credit": verticals.credit, "width": verticals.width,
+                "short_strike": verticals.short_strike, "long_strike": verticals.long_strike,
+                "short_delta": verticals.short_delta, "short_iv": verticals.short_iv}
+        nan = float("nan")
+        return {
+            "credit": np.array([v.credit for v in verticals], dtype=np.float64),
+            "width": np.array([v.width for v in verticals], dtype=np.float64),
+            "short_strike": np.array([v.short_strike for v in verticals], dtype=np.float64),
+            "long_strike": np.array([v.long_strike for v in verticals], dtype=np.float64),
+            "short_delta": np.array([nan if v.short_delta is None else v.short_delta for v in verticals], dtype=np.float64),
+            "short_iv": np.array([v.columns.iv[v.short_row] if v.columns is not None and v.short_row is not None
+                else nan for v in verticals], dtype=np.float64),
+        }
+
+    @staticmethod
+    def _verticals_at(verticals, idx, cache: IncrementalSelectionCache = None) -> dict:
+        """{i: VerticalCandidate} for the indices in idx, built only for VerticalSpreadArrays"""
+        idx = sorted(idx)
+        if isinstance(verticals, VerticalSpreadArrays):
+            return dict(zip(idx, verticals.materialize(idx, cache)))
+        return {i: verticals[i] for i in idx}
+
+    @staticmethod
+    def _pair_probability_inputs(probability_inputs, i: int, j: int) -> tuple:
+        """Inputs of put i / call j, from probability_inputs with its arrays converted to lists"""
+        if probability_inputs is None:
+            return None
+        put_p_above, put_payout, call_p_above, call_payout = probability_inputs
+        return (put_p_above[i], put_payout[i], call_p_above[j], call_payout[j])
      
-    def run_checks(self, ic):
-        is_risk_defined = self.check_is_defined_risk(pv, cv, underlying_price)
-        em_and_max_loss = self.check_em_and_max_loss(ic)
-    
-        ic.defined_risk = is_risk_defined["check_passed"]
-        ic.data["is_risk_defined"] = is_risk_defined
-        ic.data["em_and_max_loss"] = em_and_max_loss
-
-        rr = self.check_rr(ic, self.config.min_rr)
-        ic.data["check_rr"] = rr
-        
+    def rescore(self, ic: IronCondorCandidate, underlying_price, expected_move,
+        probability_inputs: tuple = None) -> IronCondorCandidate:
+        """
+        New candidate for a condor scored at another spot / expected move, recomputing only
+        the terms that depend on them. Credit, max loss, rr and delta balance come from the legs.
+        """
+        lo, hi = OptionMetrics._em_bounds(underlying_price, expected_move, self.config.em_buffer)
+        sp_strike, sc_strike = ic.put.short_strike, ic.call.short_strike
+        cushion = OptionMetrics._cushion(sp_strike, sc_strike, lo, hi)
+        new_ic = IronCondorCandidate(ic.put, ic.call, ic.total_credit, ic.max_loss, ic.rr,
+            OptionMetrics._em_ok(sp_strike, sc_strike, lo, hi), cushion, expected_move)
+
+        center = self.get_center_score(ic.put, ic.call, underlying_price, self.config.missing_centering_score, self.config.check_center_score)
+        new_ic.rr_score = ic.rr_score
+        new_ic.delta_balance_score = ic.delta_balance_score
+        new_ic.cushion_score = self.config.w_cushion * cushion
+        new_ic.center_score = self.config.w_center * center
+        self.set_gates(new_ic, underlying_price)
+        self.set_probability_scores(new_ic, probability_inputs)
+        new_ic.overall_score = (new_ic.rr_score + new_ic.cushion_score + new_ic.center_score + new_ic.delta_balance_score
+            + new_ic.pop_score + new_ic.touch_score + new_ic.ev_score)
+        return new_ic
+
+    def run_checks(self, p_long, p_short, c_short, c_long, underlying_price, em_ok, max_loss, rr) -> np.ndarray:
+        """
+        Gate stage over broadcastable strike / metric arrays (puts along axis 0, calls along
+        axis 1 for the put x call matrix). Returns the uint8 CondorGate mask of failed gates
+        per pair, 0 where a pair passed every gate. Matches check_mask pair for pair.
+        """
+        cfg = self.config
+        defined_risk = (p_long < p_short) & (p_short < underlying_price) & (underlying_price < c_short) & (c_short < c_long)
+        mask = np.where(defined_risk, 0, CondorGate.DEFINED_RISK.value).astype(np.uint8)
+        if cfg.require_em_ok:
+            mask |= np.where(em_ok, 0, CondorGate.EM_OK.value).astype(np.uint8)
+        mask |= np.where(max_loss > 0, 0, CondorGate.MAX_LOSS.value).astype(np.uint8)
+        mask |= np.where(rr >= cfg.min_rr, 0, CondorGate.MIN_RR.value).astype(np.uint8)
+        return mask
+
+    def check_mask(self, ic: IronCondorCandidate, underlying_price) -> int:
+        """CondorGate mask of the gates one condor failed, 0 = passed all"""
+        mask = 0
+        if not self.check_is_defined_risk(ic.put, ic.call, underlying_price):
+            mask |= CondorGate.DEFINED_RISK
+        if self.config.require_em_ok and not ic.em_ok:
+            mask |= CondorGate.EM_OK
+        if not ic.max_loss > 0:
+            mask |= CondorGate.MAX_LOSS
+        if not self.check_rr(ic, self.config.min_rr):
+            mask |= CondorGate.MIN_RR
+        return int(mask)
+
+    def set_gates(self, ic: IronCondorCandidate, underlying_price):
+        ic.gates = self.check_mask(ic, underlying_price)
+        ic.defined_risk = not ic.gates & CondorGate.DEFINED_RISK
+
+    def _is_gated(self, ic: IronCondorCandidate, result: ScorerResult) -> bool:
+        """Counts the pair's failed gates; True when it must be left out of the ranking"""
+        result.add_gate_mask(ic.gates)
+        if self.config.is_enforce_gates and ic.gates:
+            result.gated_pairs += 1
+            return True
+        return False
+
+    def rank(self, put_verticals, call_verticals, underlying_price, expected_move,
+        cache: IncrementalSelectionCache = None, expiry_stats=None) -> ScorerResult:
+        """
+        put_verticals / call_verticals are VerticalSpreadArrays or lists of VerticalCandidates.
+        expiry_stats (forward, ATM IV, DTE) enables the pop / touch / expected value terms.
+        """
+        if self.config.is_vectorized_rank:
+            return self.rank_matrix(put_verticals, call_verticals, underlying_price, expected_move, expiry_stats, cache)
+        # the per-pair paths score VerticalCandidate objects
+        if isinstance(put_verticals, VerticalSpreadArrays):
+            put_verticals = put_verticals.materialize(cache=cache)
+        if isinstance(call_verticals, VerticalSpreadArrays):
+            call_verticals = call_verticals.materialize(cache=cache)
+        return self.rank_pairwise(put_verticals, call_verticals, underlying_price, expected_move, cache, expiry_stats)
+
+    def new_result(self) -> ScorerResult:
+        return ScorerResult(top_k=self.config.top_k, reservoir_size=self.config.reservoir_size,
+            seed=self.config.reservoir_seed)
 
-    def rank(self, put_verticals, call_verticals, underlying_price, expected_move) -> ScorerResult:
-        result = ScorerResult()
+    def rank_matrix(self, put_verticals, call_verticals, underlying_price, expected_move, expiry_stats=None,
+        cache: IncrementalSelectionCache = None) -> ScorerResult:
+        """
+        Scores all put x call pairs as arrays and materializes only the top_k condors,
+        best first. Scores match rank_pairwise; equal scores keep the pairwise (put-major) order.
+        Given VerticalSpreadArrays, VerticalCandidates are only built for the kept condors' legs.
+        With branch-and-bound only the rows and columns whose upper bound reaches the k-th best
+        score of a seed block are scored; score stats and gate counters cover those pairs.
+        """
+        result = self.new_result()
         try:
-            for pv in put_verticals:
-                for cv in call_verticals:
-                    ic = OptionMetrics.iron_condor_candidate(
-                        pv, cv, underlying_price, expected_move, em_buffer=self.config.em_buffer
-                    )
-                    self.get_scores(ic, underlying_price)
-                    result.add_candidate(ic)          
+            cfg = self.config
+            put_arrays, call_arrays = self.side_arrays(put_verticals), self.side_arrays(call_verticals)
+            inputs = self.probability_inputs(put_arrays, call_arrays, underlying_price, expiry_stats)
+            n_puts, n_calls = len(put_verticals), len(call_verticals)
+            rows, cols = np.arange(n_puts), np.arange(n_calls)
+            if self._is_bounded():
+                rows, cols = self._rows_within_bound(put_arrays, call_arrays, underlying_price, expected_move, inputs)
+                result.pruned_pairs = n_puts * n_calls - len(rows) * len(cols)
+            block = self._score_block(put_arrays, call_arrays, rows, cols, underlying_price, expected_move, inputs)
+            result.add_gate_failures(CondorGate.count_failures(block["gates"]))
+            result.scored_count = block["score"].size
+
+            flat = block["score"].ravel()
+            flat_gates = block["gates"].ravel()
+            if cfg.is_enforce_gates:
+                passed = np.flatnonzero(flat_gates == 0)
+                result.gated_pairs = flat.size - len(passed)
+                result.observe_scores(flat[passed])
+                order = passed[np.argsort(-flat[passed], kind="stable")]
+            else:
+                result.observe_scores(flat)
+                order = np.argsort(-flat, kind="stable")
+            top = order if cfg.top_k is None else order[:cfg.top_k]
+            rest = order[len(top):]
+            sampled = rest[result.sample_indices(len(rest))].tolist()
+            kept = top.tolist()
+            # block position k is put rows[k // width], call cols[k % width]
+            width = len(cols)
+            puts = self._verticals_at(put_verticals, {int(rows[k // width]) for k in kept + sampled}, cache)
+            calls = self._verticals_at(call_verticals, {int(cols[k % width]) for k in kept + sampled}, cache)
+            pop = block.get("pop")
+
+            def materialize(k):
+                a, b = divmod(k, width)
+                ic = IronCondorCandidate(
+                    put=puts[int(rows[a])],
+                    call=calls[int(cols[b])],
+                    total_credit=float(block["total_credit"][a, b]),
+                    max_loss=float(block["max_loss"][a, b]),
+                    rr=float(block["rr"][a, b]),
+                    em_ok=bool(block["em_ok"][a, b]),
+                    cushion=float(block["cushion"][a, b]),
+                    em=expected_move
+                )
+                ic.rr_score = float(block["rr_score"][a, b])
+                ic.cushion_score = float(block["cushion_score"][a, b])
+                ic.center_score = float(block["center_score"][a, b])
+                ic.delta_balance_score = float(block["balance_score"][a, b])
+                if pop is not None:
+                    ic.pop, ic.touch, ic.ev_ratio = (float(pop[a, b]), float(block["touch"][a, b]),
+                        float(block["ev_ratio"][a, b]))
+                    ic.pop_score = cfg.w_pop * ic.pop
+                    ic.touch_score = cfg.w_touch * (1.0 - ic.touch)
+                    ic.ev_score = cfg.w_credit * ic.ev_ratio
+                ic.gates = int(flat_gates[k])
+                ic.defined_risk = not ic.gates & CondorGate.DEFINED_RISK
+                ic.overall_score = float(flat[k])
+                return ic
+
+            for k in kept:
+                result.keep_candidate(materialize(k))
+            result.reservoir = [materialize(k) for k in sampled]
         except Exception as e:
             result.had_error = True
-            result.exception = pe
+            result.exception = e
         return result
 
-    def check_rr(self, ic, min_rr):
-        result = {
-            "check_passed": False
-        }
+    def _score_block(self, put_arrays: dict, call_arrays: dict, rows: np.ndarray, cols: np.ndarray,
+        underlying_price, expected_move, probability_inputs: tuple = None) -> dict:
+        """
+        Every term of the put rows x call cols block as (len(rows), len(cols)) matrices:
+        total_credit, max_loss, rr, em_ok, cushion, the weighted scores, gates, score,
+        and pop / touch / ev_ratio when probability_inputs is given.
+        """
+        cfg = self.config
+        p_credit, p_width = put_arrays["credit"][rows], put_arrays["width"][rows]
+        p_short, p_delta = put_arrays["short_strike"][rows], put_arrays["short_delta"][rows]
+        c_credit, c_width = call_arrays["credit"][cols], call_arrays["width"][cols]
+        c_short, c_delta = call_arrays["short_strike"][cols], call_arrays["short_delta"][cols]
+
+        total_credit = p_credit[:, None] + c_credit[None, :]
+        max_loss = np.maximum(p_width[:, None], c_width[None, :]) - total_credit
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rr = np.where(max_loss > 0, total_credit / max_loss, 0.0)
+
+        lo, hi = OptionMetrics._em_bounds(underlying_price, expected_move, cfg.em_buffer)
+        em_ok = (p_short <= lo)[:, None] & (c_short >= hi)[None, :]
+        cushion = np.minimum((lo - p_short)[:, None], (c_short - hi)[None, :])
+
+        if cfg.check_center_score:
+            center = OptionMetrics._ic_centering_score_matrix(p_short, c_short, underlying_price)
+        else:
+            center = np.full(rr.shape, float(cfg.missing_centering_score))
+        if cfg.check_delta_balance:
+            balance = OptionMetrics._ic_delta_balance_score_matrix(p_delta, c_delta, missing_score=cfg.missing_delta_score)
+        else:
+            balance = np.full(rr.shape, float(cfg.missing_delta_score))
+
+        block = {"total_credit": total_credit, "max_loss": max_loss, "rr": rr, "em_ok": em_ok, "cushion": cushion,
+            "rr_score": cfg.w_rr * rr, "cushion_score": cfg.w_cushion * cushion,
+            "center_score": cfg.w_center * center, "balance_score": cfg.w_balance * balance}
+        score = block["rr_score"] + block["cushion_score"] + block["center_score"] + block["balance_score"]
+
+        p_long, c_long = put_arrays["long_strike"][rows], call_arrays["long_strike"][cols]
+        block["gates"] = self.run_checks(p_long[:, None], p_short[:, None], c_short[None, :], c_long[None, :],
+            underlying_price, em_ok, max_loss, rr)
+
+        if probability_inputs is not None:
+            put_p_above, put_payout, call_p_above, call_payout = probability_inputs
+            pop, touch, ev_ratio = CondorProbability.pair_terms(put_p_above[rows, None], put_payout[rows, None],
+                call_p_above[None, cols], call_payout[None, cols], total_credit, max_loss)
+            score = score + cfg.w_pop * pop + cfg.w_touch * (1.0 - touch) + cfg.w_credit * ev_ratio
+            block.update(pop=pop, touch=touch, ev_ratio=ev_ratio)
+        block["score"] = score
+        return block
+
+    def _rows_within_bound(self, put_arrays: dict, call_arrays: dict, underlying_price, expected_move,
+        probability_inputs: tuple = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (put rows, call cols) that can still hold a top_k condor, in index order.
+        Puts are scored in blocks in descending order of their upper bound, against the calls
+        whose bound reaches the k-th best score found so far, until the next put's bound falls
+        below it. A vertical whose bound is below the final k-th best can't be in a top_k pair.
+        """
+        cfg = self.config
+        n_puts, n_calls = len(put_arrays["credit"]), len(call_arrays["credit"])
+        rows, cols = np.arange(n_puts), np.arange(n_calls)
+        block_size = max(8, 2 * math.ceil(math.sqrt(cfg.top_k)))
+        if cfg.top_k < 1 or (n_puts <= block_size and n_calls <= block_size):
+            return rows, cols
+        put_ub, call_ub = self.vertical_upper_bounds(put_arrays, call_arrays, underlying_price, expected_move,
+            probability_inputs)
+        put_order = np.argsort(-put_ub, kind="stable")
+        threshold = -np.inf
+        best = np.empty(0)
+        for start in range(0, n_puts, block_size):
+            block_rows = put_order[start:start + block_size]
+            block_rows = block_rows[put_ub[block_rows] >= threshold]
+            if len(block_rows) == 0:
+                break
+            block = self._score_block(put_arrays, call_arrays, np.sort(block_rows), cols[call_ub >= threshold],
+                underlying_price, expected_move, probability_inputs)
+            scores = block["score"].ravel()
+            if cfg.is_enforce_gates:
+                scores = scores[block["gates"].ravel() == 0]
+            best = np.concatenate([best, scores[~np.isnan(scores)]])
+            if len(best) >= cfg.top_k:
+                best = np.partition(best, len(best) - cfg.top_k)[len(best) - cfg.top_k:]
+                threshold = best.min()
+        if not np.isfinite(threshold):
+            return rows, cols
+        return rows[put_ub >= threshold], cols[call_ub >= threshold]
+
+    def rank_pairwise(self, put_verticals, call_verticals, underlying_price, expected_move,
+        cache: IncrementalSelectionCache = None, expiry_stats=None) -> ScorerResult:
+        """
+        Reference per-pair scorer. Runs branch-and-bound when it can be exact
+        (see _is_bounded), otherwise scores every pair.
+        """
+        if self._is_bounded():
+            return self.rank_branch_and_bound(put_verticals, call_verticals, underlying_price, expected_move, 
+                cache, expiry_stats)
+        result = self.new_result()
         try:
-            result["rule"] = "ic.rr < min_rr"
-            result["data"] = {
-                "rr": ic.rr, "min_rr": min_rr
-            }
-            if ic.rr < min_rr:
-                result["check_passed"] = False
-            else:
-                result["check_passed"] = True
+            inputs = self._probability_input_lists(put_verticals, call_verticals, underlying_price, expiry_stats)
+            for i, pv in enumerate(put_verticals):
+                for j, cv in enumerate(call_verticals):
+                    ic = self._score_pair(pv, cv, underlying_price, expected_move, cache,
+                        self._pair_probability_inputs(inputs, i, j))
+                    if not self._is_gated(ic, result):
+                        result.add_candidate(ic)
+            result.scored_count = len(put_verticals) * len(call_verticals)
         except Exception as e:
-            ex_rf = {"pv":pv,"cv":cv,"und_p": underlying_price, "em":expected_move, 
-                "ic.rr":ic.rr, "config.min_rr": min_rr}
-            raise PositionFinderException("iron_condor_position.check_rr: OptionMetrics had an exception", ex_rf)
+            result.had_error = True
+            result.exception = e
         return result
 
-    def check_em_and_max_loss(self, ic):
-        result = {
-            "check_passed": False
-        }
+    def rank_branch_and_bound(self, put_verticals, call_verticals, underlying_price, expected_move,
+        cache: IncrementalSelectionCache = None, expiry_stats=None) -> ScorerResult:
+        """
+        Same top_k as scoring every pair, skipping pairs whose upper bound can't reach the
+        k-th best score found so far. Each side is walked in descending order of its own
+        per-vertical bound, so once a bound falls below the threshold the rest of that side
+        is skipped. Pairs keep their put-major sequence number, so ties resolve as in the
+        full scan. Skipped pairs are counted in result.pruned_pairs; score stats and gate
+        counters only cover evaluated pairs.
+        """
+        result = self.new_result()
         try:
-            result["rule"] = "ic.em_ok or ic.max_loss <= 0"
-            result["data"] = {
-                "em_ok": ic.em_ok, "max_loss": ic.max_loss
-            }
-            if not ic.em_ok or ic.max_loss <= 0:
-                result["check_passed"] = False
-            else:
-                result["check_passed"] = True
+            n_calls = len(call_verticals)
+            put_arrays, call_arrays = self.side_arrays(put_verticals), self.side_arrays(call_verticals)
+            inputs = self.probability_inputs(put_arrays, call_arrays, underlying_price, expiry_stats)
+            put_ub, call_ub = self.vertical_upper_bounds(put_arrays, call_arrays, underlying_price, expected_move, inputs)
+            put_order = np.argsort(-put_ub, kind="stable").tolist()
+            call_order = np.argsort(-call_ub, kind="stable").tolist()
+            put_ub, call_ub = put_ub.tolist(), call_ub.tolist()
+            inputs = None if inputs is None else tuple(a.tolist() for a in inputs)
+            heap = result._heap
+            top_k = result.top_k
+            evaluated = 0
+            for pi, i in enumerate(put_order):
+                if len(heap) >= top_k and put_ub[i] < heap[0][0]:
+                    # every remaining put is bounded below the k-th best
+                    result.pruned_pairs += (len(put_order) - pi) * n_calls
+                    break
+                pv = put_verticals[i]
+                for cj, j in enumerate(call_order):
+                    if len(heap) >= top_k and call_ub[j] < heap[0][0]:
+                        result.pruned_pairs += n_calls - cj
+                        break
+                    ic = self._score_pair(pv, call_verticals[j], underlying_price, expected_move, cache,
+                        self._pair_probability_inputs(inputs, i, j))
+                    evaluated += 1
+                    if self._is_gated(ic, result):
+                        continue
+                    result.observe_score(ic.overall_score)
+                    result.keep_candidate(ic, seq=i * n_calls + j)
+            result.scored_count = evaluated
         except Exception as e:
-            ex_rf = {"pv":pv,"cv":cv,"und_p": underlying_price, "em":expected_move, 
-                "ic_em":ic.em_ok, "ic.max_loss": ic.max_loss}
-            raise PositionFinderException("iron_condor_position.is_defined_risk: OptionMetrics had an exception", ex_rf)
+            result.had_error = True
+            result.exception = e
         return result
-                
-    def check_is_defined_risk(self, pv, cv, underlying_price, require_brackets_spot=True):
-        result = {
-            "rule_name": "is_defined_risk",
-            "check_passed": False
-        }
+
+    def vertical_upper_bounds(self, put_arrays: dict, call_arrays: dict, underlying_price, expected_move,
+        probability_inputs: tuple = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Upper bound on overall_score of any condor using each vertical, given the other side,
+        from both sides' side_arrays.
+        rr uses the best credit and narrowest width on the other side, cushion is capped by
+        the vertical's own EM distance and the best one on the other side, centering and
+        balance by their maximum. pop and touch use the most favourable short on the other
+        side, ev_ratio its best credit, lowest payout and narrowest width.
+        Only valid with non-negative weights.
+        """
+        cfg = self.config
+        lo, hi = OptionMetrics._em_bounds(underlying_price, expected_move, cfg.em_buffer)
+        center_ub = 1.0 if cfg.check_center_score else cfg.missing_centering_score
+        balance_ub = max(1.0, cfg.missing_delta_score) if cfg.check_delta_balance else cfg.missing_delta_score
+        const = cfg.w_center * center_ub + cfg.w_balance * balance_ub
+
+        p_credit, p_width, p_room = put_arrays["credit"], put_arrays["width"], lo - put_arrays["short_strike"]
+        c_credit, c_width, c_room = call_arrays["credit"], call_arrays["width"], call_arrays["short_strike"] - hi
+
+        def weighted(w, x):
+            # a zero weight drops the term; 0 x inf would be NaN and break the bound ordering
+            return w * x if w else 0.0
+
+        def bound(credit, width, room, other_credit, other_width, other_room):
+            total_credit = credit + other_credit
+            max_loss = np.maximum(width, other_width) - total_credit
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rr = np.where(max_loss > 0, total_credit / max_loss, np.inf)
+            return weighted(cfg.w_rr, rr) + cfg.w_cushion * np.minimum(room, other_room) + const
+
+        put_ub = bound(p_credit, p_width, p_room, c_credit.max(), c_width.min(), c_room.max())
+        call_ub = bound(c_credit, c_width, c_room, p_credit.max(), p_width.min(), p_room.max())
+
+        if probability_inputs is not None:
+            put_p_above, put_payout, call_p_above, call_payout = probability_inputs
+
+            def probability_bound(p_in_range, p_beyond, credit, payout, width, other_credit, other_payout, other_width):
+                # pop = P(above put short) - P(above call short), touch = 2 x P(beyond either short)
+                total_credit = credit + other_credit
+                max_loss = np.maximum(width, other_width) - total_credit
+                ev = total_credit - payout - other_payout
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    ev_ratio = np.where(ev < 0, 0.0, np.where(max_loss > 0, ev / max_loss, np.inf))
+                return (cfg.w_pop * np.maximum(p_in_range, 0.0) + cfg.w_touch * (1.0 - np.minimum(2.0 * p_beyond, 1.0))
+                    + weighted(cfg.w_credit, ev_ratio))
+
+            min_call_p_above, max_put_p_above = call_p_above.min(), put_p_above.max()
+            put_ub = put_ub + probability_bound(put_p_above - min_call_p_above, (1.0 - put_p_above) + min_call_p_above,
+                p_credit, put_payout, p_width, c_credit.max(), call_payout.min(), c_width.min())
+            call_ub = call_ub + probability_bound(max_put_p_above - call_p_above, (1.0 - max_put_p_above) + call_p_above,
+                c_credit, call_payout, c_width, p_credit.max(), put_payout.min(), p_width.min())
+        return put_ub, call_ub
+
+    def _is_bounded(self) -> bool:
+        """
+        Branch-and-bound applies when it is exact for the top_k: top_k set and no negative
+        weight. A reservoir sample needs every pair scored, so it turns the bound off.
+        """
+        cfg = self.config
+        return (cfg.is_branch_and_bound and cfg.top_k is not None and cfg.reservoir_size == 0
+            and self._weights_non_negative())
+
+    def _weights_non_negative(self) -> bool:
+        cfg = self.config
+        return min(cfg.w_rr, cfg.w_cushion, cfg.w_center, cfg.w_balance, cfg.w_credit, cfg.w_pop, cfg.w_touch) >= 0
+
+    def _probability_input_lists(self, put_verticals, call_verticals, underlying_price, expiry_stats) -> tuple:
+        """probability_inputs as plain lists, for the per-pair paths"""
+        inputs = self.probability_inputs(self.side_arrays(put_verticals), self.side_arrays(call_verticals),
+            underlying_price, expiry_stats)
+        return None if inputs is None else tuple(a.tolist() for a in inputs)
+
+    def _score_pair(self, pv, cv, underlying_price, expected_move, cache: IncrementalSelectionCache = None,
+        probability_inputs: tuple = None) -> IronCondorCandidate:
+        cached = cache.get_condor(pv, cv) if cache is not None else None
+        if cached is None:
+            ic = OptionMetrics.iron_condor_candidate(
+                pv, cv, underlying_price, expected_move, em_buffer=self.config.em_buffer
+            )
+            self.set_gates(ic, underlying_price)
+            self.get_scores(ic, underlying_price, probability_inputs)
+        elif cached[0] == underlying_price and cached[1] == expected_move and cached[3] == probability_inputs:
+            ic = cached[2]
+        else:
+            ic = self.rescore(cached[2], underlying_price, expected_move, probability_inputs)
+        if cache is not None:
+            cache.put_condor(pv, cv, underlying_price, expected_move, ic, probability_inputs)
+        return ic
+
+    def check_rr(self, ic, min_rr) -> bool:
+        return ic.rr >= min_rr
+
+    def check_is_defined_risk(self, pv, cv, underlying_price, require_brackets_spot=True) -> bool:
         try:
-            is_defined_risk = OptionMetrics._is_defined_risk(pv, cv, underlying_price, require_brackets_spot=require_brackets_spot)
-            if not is_defined_risk:
-                ex_rf = {"pv":pv,"cv":cv,"und_p": underlying_price, "em":expected_move, "is_defined_risk": is_defined_risk}
-                raise PositionFinderException(
-                    "iron_condor_position.is_defined_risk: is_defined_risk is None", 
-                    ex_rf)
-            result["rule"] = "is_defined_risk = true"
-            result["data"] = {
-                "is_defined_risk": is_defined_risk
-            }
-            result["check_passed"] = True
+            return OptionMetrics._is_defined_risk(pv, cv, underlying_price, require_brackets_spot=require_brackets_spot)
         except Exception as e:
-            ex_rf = {"pv":pv,"cv":cv,"und_p": underlying_price, "em":expected_move}
+            ex_rf = {"pv": pv, "cv": cv, "und_p": underlying_price}
             raise PositionFinderException(
-                "iron_condor_position.is_defined_risk: OptionMetrics threw an exception", 
-                ex_rf) from e
-        return result
-
+                "IronCondorScorer.check_is_defined_risk: OptionMetrics threw an exception", 
+                related_fields=ex_rf) from e
 
-    def get_delta_balance_score(self, pv, cv, underlying_price, missing_delta_score, check_delta_balance=True):
-        result = {
-            "score_name": "check_delta_balance",
-            "score": missing_delta_score,
-            "score_retrieved": False,
-            "missing_delta_score": missing_delta_score,
-            "check_delta_balance": check_delta_balance,
-            "data": {}
-        }
+    def get_delta_balance_score(self, pv, cv, underlying_price, missing_delta_score, check_delta_balance=True) -> float:
         if not check_delta_balance:
-            return result
+            return missing_delta_score
         try:
-            balance = OptionMetrics._ic_delta_balance_score(pv, cv, missing_score=missing_delta_score)
-            result["data"]["balance"] = balance
-            result["score_retrieved"] = True
-            result["score"] = balance
-            
+            return OptionMetrics._ic_delta_balance_score(pv, cv, missing_score=missing_delta_score)
         except Exception as e:
-            ex_rf = {"pv":pv,"cv":cv,"und_p": underlying_price, "balance": balance, "missing_delta_score": missing_delta_score}
+            ex_rf = {"pv": pv, "cv": cv, "und_p": underlying_price, "missing_delta_score": missing_delta_score}
             raise PositionFinderException(
-                "iron_condor_position.get_delta_balance_score: OptionMetrics threw an exception", 
-                ex_rf) from e
-        return result
+                "IronCondorScorer.get_delta_balance_score: OptionMetrics threw an exception", 
+                related_fields=ex_rf) from e
                
-    def get_center_score(self, pv, cv, underlying_price, missing_centering_score, check_center_score = True):
-        result = {
-            "score_name": "check_delta_balance",
-            "score": missing_centering_score,
-            "score_retrieved": False,
-            "missing_centering_score": missing_centering_score,
-            "check_center_score": check_center_score,
-            "data": {}
-        }
-
+    def get_center_score(self, pv, cv, underlying_price, missing_centering_score, check_center_score = True) -> float:
         if not check_center_score:
-            return result
-        
+            return missing_centering_score
         try:
-            center = OptionMetrics._ic_centering_score(pv, cv, underlying_price)
-            result["data"]["center"] = center
-            result["score_retrieved"] = True
-            result["score"] = center
-            
+            return OptionMetrics._ic_centering_score(pv, cv, underlying_price)
         except Exception as e:
-            ex_rf = {"pv":pv,"cv":cv,"und_p": underlying_price, "center": center}
+            ex_rf = {"pv": pv, "cv": cv, "und_p": underlying_price}
             raise PositionFinderException(
-                "iron_condor_position.get_center_score: OptionMetrics threw an exception", 
-                ex_rf) from e
-        return result     
+                "IronCondorScorer.get_center_score: OptionMetrics threw an exception", 
+                related_fields=ex_rf) from e
 
 
     # should only need this for pruning if I have a large number of puts and calls to rank in the IC condor scoring
-    def _filter_and_rank_verticals(verticals, min_credit, min_ratio, top_n):
-        v = [
-            x for x in verticals
-            if x.credit >= min_credit and x.credit_ratio >= min_ratio and x.width > 0
-        ]
-        v.sort(key=lambda x: (x.credit_ratio, x.credit), reverse=True)
-        return v[:top_n]
+    def _filter_and_rank_verticals(self, spreads: VerticalSpreadArrays, min_credit, min_ratio, top_n) -> tuple[VerticalSpreadArrays, dict]:
+        """
+        Gates one side's spreads on width, credit and credit ratio, then keeps the top_n by
+        (credit_ratio, credit), equal keys in generation order. Runs on the arrays, so pruned
+        spreads are never materialized. Returns the kept spreads, best first, and how many
+        each gate pruned.
+        """
+        counts = {"input": len(spreads), "width": 0, "min_credit": 0, "min_credit_ratio": 0, "top_n": 0, "kept": 0}
+        keep = np.ones(len(spreads), dtype=bool)
+        for gate, failed in (("width", ~(spreads.width > 0)), ("min_credit", spreads.credit < min_credit),
+            ("min_credit_ratio", spreads.credit_ratio < min_ratio)):
+            failed &= keep
+            counts[gate] = int(np.count_nonzero(failed))
+            keep &= ~failed
+        survivors = spreads.take(np.flatnonzero(keep))
+        order = survivors.ranked(top_n)
+        counts["top_n"] = len(survivors) - len(order)
+        counts["kept"] = len(order)
+        return survivors.take(order), counts
+
+    def prune_verticals(self, put_spreads: VerticalSpreadArrays, call_spreads: VerticalSpreadArrays) -> tuple:
+        """Pruning stage between vertical selection and condor pairing, per side, before materialization."""
+        put_kept, put_counts = self._filter_and_rank_verticals(put_spreads,
+            self.config.min_vertical_credit, self.config.min_credit_ratio, self.config.top_n_per_side)
+        call_kept, call_counts = self._filter_and_rank_verticals(call_spreads,
+            self.config.min_vertical_credit, self.config.min_credit_ratio, self.config.top_n_per_side)
+        return put_kept, call_kept, {"put": put_counts, "call": call_counts}
@@ -1,5 +1,10 @@
 from AlgorithmImports import *
-from models import IronCondorPosition, OptionChainFinderResult
+from models import IronCondorPosition, OptionChainFinderResult, ExpiryStats
+from selection.chain_snapshot import ChainSnapshot, ChainColumns
+from analytics.black_scholes import BlackScholes
+from analytics.vol_smile import VolSmile
+from utils.position_finder_exception import PositionFinderException
+import numpy as np
 
 class OptionChainAnalyzer:
 
@@ -8,9 +13,11 @@ class OptionChainAnalyzer:
         self.algo = algo
         self.config = config
         self.logger = logger
+        self._snapshot: ChainSnapshot = None
+        self._snapshot_key = None
     
     def get_all_expiries(self, chain):
-        if chain.contracts is None and chain.contracts.values():
+        if chain is None or chain.contracts is None:
             return []
         expiries = set()
 
@@ -20,56 +27,78 @@ class OptionChainAnalyzer:
         return expiries
     
     def find_fixed_delta(self, symbol, expiry, now_time, underlying_price, delta_target) -> OptionChainFinderResult:
-        result = OptionChainFinderResult()
+        results = self.find_fixed_deltas(symbol, expiry, now_time, underlying_price, [delta_target])
+        if results is None:
+            return None
+        return results[delta_target]
+
+    def find_fixed_deltas(self, symbol, expiry, now_time, underlying_price, delta_targets) -> dict[float, OptionChainFinderResult]:
+        """
+        Short call / short put nearest to each of `delta_targets`, resolved for all
+        targets with one vectorized lookup per side. Returns {delta_target: OptionChainFinderResult}.
+        """
+        results = {t: OptionChainFinderResult() for t in delta_targets}
 
         try:
-            chain = self.get_chain(symbol)
-            if not chain or len(chain) == 0:
+            snapshot = self.get_snapshot(symbol)
+            if not snapshot or len(snapshot) == 0:
                 return None
 
-            expiry_contracts = [x for x in chain if x.expiry == expiry]
+            call_columns = snapshot.get_columns(expiry, ChainSnapshot.CALL)
+            put_columns = snapshot.get_columns(expiry, ChainSnapshot.PUT)
 
-            calls = [c for c in expiry_contracts if c.right == OptionRight.CALL 
-                and c.greeks is not None and c.greeks.delta is not None and self._tradeable(c)]
-            puts = [c for c in expiry_contracts if c.right == OptionRight.PUT 
-                and c.greeks is not None and c.greeks.delta is not None and self._tradeable(c)]
-            
-            short_call = min(calls, key=lambda c: abs(c.greeks.delta - delta_target))
-            short_put = min(puts, key=lambda c: abs(abs(c.greeks.delta) - delta_target))
+            short_call_rows = self._nearest_delta_rows(call_columns, delta_targets)
+            short_put_rows = self._nearest_delta_rows(put_columns, delta_targets)
             
-            iv = self.get_implied_volatility(chain, expiry, underlying_price)
-            em = self.get_expected_move(expiry, now_time, underlying_price, iv)
-
-            result.calls = [short_call]
-            result.puts = [short_put]
-            result.iv = iv
-            result.em = em
+            expiry_stats = self._get_expiry_stats(snapshot, expiry, underlying_price)
+
+            for i, t in enumerate(delta_targets):
+                result = results[t]
+                result.set_calls(call_columns, [int(short_call_rows[i])])
+                result.set_puts(put_columns, [int(short_put_rows[i])])
+                result.iv = expiry_stats.iv
+                result.em = expiry_stats.em
+                result.expiry_stats = expiry_stats
         except Exception as e:
-            result.had_error = True
-            result.exception = e
-        return result
+            for result in results.values():
+                result.had_error = True
+                result.exception = e
+        return results
+
+    def _nearest_delta_rows(self, columns: ChainColumns, delta_targets) -> np.ndarray:
+        """Tradeable rows whose |delta| is closest to each delta target"""
+        if columns is None:
+            raise PositionFinderException("OptionChainAnalyzer._nearest_delta_rows: no contracts for expiry")
+        index = self.get_delta_index(columns)
+        if len(index) == 0:
+            raise PositionFinderException(f"OptionChainAnalyzer._nearest_delta_rows: no tradeable {columns.side}s with greeks")
+        return index.nearest_rows(delta_targets)
+
+    def get_delta_index(self, columns: ChainColumns):
+        name = ("tradeable",) + self._tradeable_settings()
+        return columns.delta_index(name, self.tradeable_mask(columns))
 
 
     def find_candidates(self, symbol, expiry, now_time, underlying_price) -> OptionChainFinderResult:
         result = OptionChainFinderResult()
 
         try:
-            chain = self.get_chain(symbol)
-            if not chain or len(chain) == 0:
+            snapshot = self.get_snapshot(symbol)
+            if not snapshot or len(snapshot) == 0:
                 return None
 
-            expiry_contracts = [x for x in chain if x.expiry == expiry]
+            call_columns = snapshot.get_columns(expiry, ChainSnapshot.CALL)
+            put_columns = snapshot.get_columns(expiry, ChainSnapshot.PUT)
 
-            calls = [c for c in expiry_contracts if c.right == OptionRight.CALL]
-            puts = [c for c in expiry_contracts if c.right == OptionRight.PUT]
+            expiry_stats = self._get_expiry_stats(snapshot, expiry, underlying_price)
 
-            iv = self.get_implied_volatility(chain, expiry, underlying_price)
-            em = self.get_expected_move(expiry, now_time, underlying_price, iv)
-
-            result.calls = calls
-            result.puts = puts
-            result.iv = iv
-            result.em = em
+            if call_columns is not None:
+                result.set_calls(call_columns, list(range(len(call_columns))))
+            if put_columns is not None:
+                result.set_puts(put_columns, list(range(len(put_columns))))
+            result.iv = expiry_stats.iv
+            result.em = expiry_stats.em
+            result.expiry_stats = expiry_stats
         except Exception as e:
             result.had_error = True
             result.exception = e
@@ -84,58 +113,69 @@ class OptionChainAnalyzer:
         fixed_width: int,
         direction: str
     ):
-        chain = self.get_chain(symbol)
-        if not chain or len(chain) == 0:
+        snapshot = self.get_snapshot(symbol)
+        if not snapshot or len(snapshot) == 0:
             return None
+        ladder = self.get_tradeable_ladder(snapshot, expiry, direction)
+        long_row = self._long_row_from_ladder(ladder, float(short_contract.strike), fixed_width, direction)
+        if long_row is None:
+            return None
+        return [ladder.columns.contracts[long_row]]
 
-        expiry_contracts = [x for x in chain if x.expiry == expiry]
-        if not expiry_contracts: return None
-
+    def long_legs_for_shorts_fixed_width(self, symbol, short_rows,
+        expiry,
+        fixed_width: int,
+        direction: str
+    ) -> dict:
+        """
+        Batched version of long_legs_for_short_fixed_width over rows of the
+        (expiry, direction) ChainColumns. Resolves every short against a single cached ladder.
+        Returns {short_row: [long_row]} for shorts that have a valid long leg.
+        """
+        spreads = {}
+        snapshot = self.get_snapshot(symbol)
+        if not snapshot or len(snapshot) == 0:
+            return spreads
+        ladder = self.get_tradeable_ladder(snapshot, expiry, direction)
+        if not ladder:
+            return spreads
+        strikes = ladder.columns.strike
+        for short_row in short_rows:
+            long_row = self._long_row_from_ladder(ladder, strikes[short_row], fixed_width, direction)
+            if long_row is not None:
+                spreads[short_row] = [long_row]
+        return spreads
+
+    def get_tradeable_ladder(self, snapshot: ChainSnapshot, expiry, direction: str):
+        name = ("tradeable",) + self._tradeable_settings()
+        return snapshot.get_ladder(expiry, direction, name, self.tradeable_mask)
+
+    def _long_row_from_ladder(self, ladder, short_strike, fixed_width, direction):
+        if not ladder: return None
+        # future allow variable width selection like min and max while being under or over target width
         if direction == "call":
-            # future allow variable width selection like min and max while being under or over target width
-            target_long_strike = short_contract.strike + fixed_width
-            calls = [c for c in expiry_contracts if c.right == OptionRight.CALL 
-                and c.strike is not None and self._tradeable(c)]
-            if not calls: return None
-            long_call = min(
-                calls,
-                key=lambda c: abs(c.strike - target_long_strike)
-            )
-            if long_call.strike <= short_contract.strike:
+            long_row = ladder.nearest_row(short_strike + fixed_width)
+            if ladder.columns.strike[long_row] <= short_strike:
                 return None
-            return [long_call]
         else:
-            target_long_strike = short_contract.strike - fixed_width
-            puts = [c for c in expiry_contracts if c.right == OptionRight.PUT 
-                and c.strike is not None and self._tradeable(c)]
-            if not puts: return None
-            long_put = min(
-                puts,
-                key=lambda c: abs(c.strike - target_long_strike)
-            )
-            if long_put.strike >= short_contract.strike:
+            long_row = ladder.nearest_row(short_strike - fixed_width)
+            if ladder.columns.strike[long_row] >= short_strike:
                 return None
-            return [long_put]
+        return long_row
 
-    def _tradeable(self, c, max_rel_spread: float = 0.50) -> bool:
+    def tradeable_mask(self, columns: ChainColumns):
         """
         Why use a tradeable filter at all?
         Even in “no filters” baseline, this isn’t an alpha filter — it’s data hygiene. It prevents your long leg from landing on a dead strike with a crazy spread that corrupts PnL.
         The one change you should make
         Guard against missing quotes and use mid (or ask) for the denominator. Also, 0.5 (50%) is pretty lenient; for liquid underlyings you can often use 0.25–0.35. Keep it lenient for baseline.
-            if bid is None or ask is None:
-            return False
-        if bid <= 0 or ask <= 0 or ask <= bid:
-            return False
+        Evaluated for a whole (expiry, right) at once and cached on the slice's ChainColumns,
+        so fixed-delta selection and both long-leg finders share one mask.
         """
-        if c.bid_price is None or c.ask_price is None:
-            return False
-        if c.bid_price <= 0 or c.ask_price <= 0 or c.ask_price <= c.bid_price:
-            return False
-        mid = (c.bid_price + c.ask_price) / 2.0
-        rel_spread = (c.ask_price - c.bid_price) / max(mid, 1e-6)
-        return (c.bid_price is not None and c.ask_price is not None and c.bid_price > 0 and c.ask_price > c.bid_price 
-            and rel_spread <= max_rel_spread)
+        return columns.tradeable_mask(*self._tradeable_settings())
+
+    def _tradeable_settings(self) -> tuple:
+        return (self.config.max_rel_spread, self.config.min_open_interest, self.config.min_volume)
 
     def long_legs_for_short(self, short_contract, same_side_contracts, 
         width_range: tuple[float, float],
@@ -162,48 +202,190 @@ class OptionChainAnalyzer:
             return None
         else:
             return self.algo.current_slice.option_chains[symbol]
-        
+
+    def get_snapshot(self, symbol) -> ChainSnapshot:
+        """
+        Indexed view of the current slice's chain, built once per slice time
+        and shared by every analyzer call made during that tick.
+        """
+        key = (symbol, self.algo.time)
+        if self._snapshot is not None and self._snapshot_key == key:
+            return self._snapshot
+        chain = self.get_chain(symbol)
+        if chain is None:
+            return None
+        underlying_price = self.algo.securities[self.config.symbol].price
+        self._snapshot = ChainSnapshot(chain, self.algo.time, underlying_price)
+        if self.config.is_fill_missing_greeks:
+            self.fill_missing_greeks(self._snapshot)
+        self._snapshot_key = key
+        return self._snapshot
+
+    def fill_missing_greeks(self, snapshot: ChainSnapshot) -> int:
+        """
+        Computes Black-Scholes greeks for quoted rows the feed left without a delta or IV.
+        The rows of every (expiry, right) are solved together in one batch. IV is solved from
+        mid when it is missing, otherwise the feed's IV is reused. Only the values the feed
+        left missing are written, so a feed delta is kept on a row that only lacked IV.
+        Rows whose delta came from Black-Scholes are flagged in columns.bs_filled.
+        Returns the number of rows with any value filled.
+        """
+        spot = snapshot.underlying_price
+        if spot is None or not spot > 0:
+            return 0
+
+        parts = []
+        for (expiry, side), columns in snapshot.columns.items():
+            rows = np.flatnonzero(columns.missing_greeks_mask())
+            if len(rows) > 0:
+                t = snapshot.dte_days_fractional(expiry) / 365.0
+                parts.append((columns, rows, t, side == ChainSnapshot.CALL))
+        if not parts:
+            return 0
+
+        strike = np.concatenate([columns.strike[rows] for columns, rows, _, _ in parts])
+        mid = np.concatenate([columns.mid[rows] for columns, rows, _, _ in parts])
+        iv = np.concatenate([columns.iv[rows] for columns, rows, _, _ in parts])
+        t = np.concatenate([np.full(len(rows), t) for _, rows, t, _ in parts])
+        is_call = np.concatenate([np.full(len(rows), is_call) for _, rows, _, is_call in parts])
+
+        r = self.config.risk_free_rate
+        q = self.config.dividend_yield
+        need_iv = ~(iv > 0)
+        if need_iv.any():
+            iv[need_iv] = BlackScholes.implied_vol(mid[need_iv], spot, strike[need_iv], t[need_iv], is_call[need_iv], r, q)
+        greeks = BlackScholes.greeks(spot, strike, t, iv, is_call, r, q)
+
+        filled = 0
+        start = 0
+        for columns, rows, _, _ in parts:
+            end = start + len(rows)
+            ok = iv[start:end] > 0
+            target = rows[ok]
+            written = np.zeros(len(target), dtype=bool)
+            missing = ~(columns.iv[target] > 0)
+            columns.iv[target[missing]] = iv[start:end][ok][missing]
+            written |= missing
+            for name in ("delta", "gamma", "theta", "vega"):
+                column = getattr(columns, name)
+                missing = np.isnan(column[target])
+                column[target[missing]] = greeks[name][start:end][ok][missing]
+                written |= missing
+                if name == "delta":
+                    columns.bs_filled[target[missing]] = True
+            filled += int(np.count_nonzero(written))
+            start = end
+        return filled
         
     def get_contract_from_chain(self, contract, symbol):
+        """
+        Current slice's contract for a position leg: by option Symbol first,
+        then by (expiry, right, strike). Both lookups are hashed on the snapshot.
+        """
         if contract is None:
             return 
-        chain = self.get_chain(symbol)
-        if chain is None:
+        snapshot = self.get_snapshot(symbol)
+        if snapshot is None:
             return
-        contract = next((c for c in chain if c.strike == contract.strike and c.right == contract.get_contract_type()), None)
-        return contract
+        match = snapshot.get_by_symbol(contract.symbol)
+        if match is not None:
+            return match
+        side = ChainSnapshot.right_key(contract.get_contract_type())
+        return snapshot.get_by_strike(contract.expiry, side, contract.strike)
 
     def get_current_contract_legs_from_chain(self, symbol, contracts):
         current_contracts = []
         for c in contracts:
-            current_contracts.append(self.get_contract_from_chain(c))
+            current_contracts.append(self.get_contract_from_chain(c, symbol))
 
         return current_contracts
 
 
-    def get_atm_contracts_and_iv(self, chain, expiry, underlying_price):
-        # expiry = min([x.expiry for x in chain])
-        expiry_contracts = [x for x in chain if x.expiry == expiry]
-
-        # Sort by moneyness (distance from underlying price)
-        sorted_contracts = sorted(expiry_contracts, key=lambda x: abs(underlying_price - x.strike))
-
-        # Find the ATM call and put (they'll be near the top)
-        atm_call = next((c for c in sorted_contracts if c.right == OptionRight.CALL), None)
-        atm_put = next((c for c in sorted_contracts if c.right == OptionRight.PUT), None)
+    def get_atm_contracts_and_iv(self, snapshot: ChainSnapshot, expiry, underlying_price):
+        # strikes are pre-sorted per side, so the ATM contract is a bisect away
+        call_row = snapshot.nearest_row(expiry, ChainSnapshot.CALL, underlying_price)
+        put_row = snapshot.nearest_row(expiry, ChainSnapshot.PUT, underlying_price)
 
-        if atm_call and atm_put:
+        if call_row is not None and put_row is not None:
+            call_columns = snapshot.get_columns(expiry, ChainSnapshot.CALL)
+            put_columns = snapshot.get_columns(expiry, ChainSnapshot.PUT)
             return {
-                'atm_call': atm_call, 'atm_put': atm_put,
-                'atm_call_iv': atm_call.implied_volatility, 'atm_put_iv': atm_put.implied_volatility
+                'atm_call': call_columns.contracts[call_row], 'atm_put': put_columns.contracts[put_row],
+                'atm_call_iv': float(call_columns.iv[call_row]), 'atm_put_iv': float(put_columns.iv[put_row])
             }
         return None
     
 
-    def get_implied_volatility(self, chain, expiry, underlying_price):
-        atm_contracts = self.get_atm_contracts_and_iv(chain, expiry, underlying_price)
-        avg_iv = (atm_contracts['atm_put_iv'] + atm_contracts['atm_call_iv']) / 2
-        return avg_iv
+    def get_implied_volatility(self, snapshot: ChainSnapshot, expiry, underlying_price):
+        return self._get_expiry_stats(snapshot, expiry, underlying_price).iv
+
+    def get_expiry_stats(self, symbol, expiry, underlying_price) -> ExpiryStats:
+        """ATM IV, expected move and fractional DTE for `expiry` at the current slice, or None"""
+        snapshot = self.get_snapshot(symbol)
+        if not snapshot or len(snapshot) == 0:
+            return None
+        try:
+            return self._get_expiry_stats(snapshot, expiry, underlying_price)
+        except PositionFinderException:
+            return None
+
+    def _get_expiry_stats(self, snapshot: ChainSnapshot, expiry, underlying_price) -> ExpiryStats:
+        """
+        Memoized on the snapshot, so selection, scoring and trade snapshots
+        share one computation per (expiry, slice time).
+        """
+        stats = snapshot.expiry_stats.get(expiry)
+        if stats is not None:
+            return stats
+
+        atm_contracts = self.get_atm_contracts_and_iv(snapshot, expiry, underlying_price)
+        if atm_contracts is None:
+            raise PositionFinderException(f"OptionChainAnalyzer._get_expiry_stats: no ATM call/put for {expiry}")
+        atm_call_iv = atm_contracts['atm_call_iv']
+        atm_put_iv = atm_contracts['atm_put_iv']
+
+        # IV interpolated at the forward moves smoothly as spot crosses strikes;
+        # the nearest-strike average is only the fallback for an empty smile
+        smile = self._get_smile(snapshot, expiry, underlying_price)
+        iv = smile.atm_iv
+        if not np.isfinite(iv):
+            iv = (atm_put_iv + atm_call_iv) / 2
+        em = self.get_expected_move(expiry, snapshot.time, underlying_price, iv)
+
+        stats = ExpiryStats(
+            expiry=expiry,
+            time=snapshot.time,
+            dte_days=snapshot.dte_days_fractional(expiry),
+            underlying_price=underlying_price,
+            atm_call_iv=atm_call_iv,
+            atm_put_iv=atm_put_iv,
+            iv=iv,
+            em=em,
+            forward=smile.forward
+        )
+        snapshot.expiry_stats[expiry] = stats
+        return stats
+
+    def get_smile(self, symbol, expiry, underlying_price) -> VolSmile:
+        """VolSmile for `expiry` at the current slice, or None"""
+        snapshot = self.get_snapshot(symbol)
+        if not snapshot or len(snapshot) == 0:
+            return None
+        return self._get_smile(snapshot, expiry, underlying_price)
+
+    def _get_smile(self, snapshot: ChainSnapshot, expiry, underlying_price) -> VolSmile:
+        """Built once per (expiry, slice time) and memoized on the snapshot."""
+        smile = snapshot.smiles.get(expiry)
+        if smile is None:
+            smile = VolSmile.from_columns(
+                expiry,
+                snapshot.get_columns(expiry, ChainSnapshot.CALL),
+                snapshot.get_columns(expiry, ChainSnapshot.PUT),
+                underlying_price,
+                snapshot.dte_days_fractional(expiry) / 365.0,
+                self.config.risk_free_rate)
+            snapshot.smiles[expiry] = smile
+        return smile
 
     def get_expected_move(self, expiry, today_datetime, underlying_price, iv):
         SECONDS_PER_YEAR = 365.0 * 24.0 * 60.0 * 60.0
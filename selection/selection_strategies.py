@@ -0,0 +1,96 @@
+# region imports
+from AlgorithmImports import *
+from abc import ABC, abstractmethod
+import numpy as np
+from scipy.special import ndtr
+from selection.chain_snapshot import ChainColumns
+from analytics.black_scholes import BlackScholes
+from utils.position_finder_exception import PositionFinderException
+# endregion
+
+class SelectionStrategy(ABC):
+    """
+    Picks the short-leg rows for one side of one expiry.
+    short_rows is evaluated over a whole ChainColumns partition at once and returns the
+    subset of `rows` it keeps, in their original order. Strategies hold no per-tick state,
+    so one instance is shared across ticks and several can run against the same snapshot.
+    """
+    name: str = None
+
+    @abstractmethod
+    def short_rows(self, columns: ChainColumns, rows: np.ndarray, sel_cfg, expiry_stats) -> np.ndarray:
+        ...
+
+    @staticmethod
+    def _in_range(values: np.ndarray, value_range: tuple[float, float]) -> np.ndarray:
+        # NaN fails both comparisons
+        low, high = value_range
+        return (low <= values) & (values <= high)
+
+
+SELECTION_STRATEGIES: dict[str, type] = {}
+
+def register_selection_strategy(cls):
+    # fail at import, not mid-tick inside find_best
+    if cls.__abstractmethods__:
+        raise TypeError(f"register_selection_strategy: {cls.__name__} doesn't implement {', '.join(sorted(cls.__abstractmethods__))}")
+    SELECTION_STRATEGIES[cls.name] = cls
+    return cls
+
+def get_selection_strategy(name: str) -> SelectionStrategy:
+    cls = SELECTION_STRATEGIES.get(name)
+    if cls is None:
+        raise PositionFinderException(f"get_selection_strategy: unknown selection strategy {name!r}")
+    return cls()
+
+
+@register_selection_strategy
+class DeltaStrategy(SelectionStrategy):
+    """Shorts whose delta is within short_call_delta_range / short_put_delta_range"""
+    name = "delta"
+
+    def short_rows(self, columns, rows, sel_cfg, expiry_stats):
+        delta_range = sel_cfg.short_call_delta_range if columns.side == "call" else sel_cfg.short_put_delta_range
+        return rows[self._in_range(columns.delta[rows], delta_range)]
+
+
+@register_selection_strategy
+class IVWeightedStrategy(SelectionStrategy):
+    """
+    Shorts whose distance from the forward, measured in expected moves from the expiry's
+    ATM IV, is within em_multiple_range. Strikes move out on high IV days and in on quiet ones.
+    """
+    name = "iv_weighted"
+
+    def short_rows(self, columns, rows, sel_cfg, expiry_stats):
+        if expiry_stats is None or not expiry_stats.em > 0:
+            return rows[:0]
+        forward = expiry_stats.forward if expiry_stats.forward else expiry_stats.underlying_price
+        distance = columns.strike[rows] - forward
+        if columns.side == "put":
+            distance = -distance
+        return rows[self._in_range(distance / expiry_stats.em, sel_cfg.em_multiple_range)]
+
+
+@register_selection_strategy
+class ProbabilityStrategy(SelectionStrategy):
+    """
+    Shorts whose probability of expiring out of the money is within pop_range, from a
+    lognormal terminal price at the forward with each contract's own IV (so skew counts).
+    """
+    name = "probability"
+
+    def short_rows(self, columns, rows, sel_cfg, expiry_stats):
+        if expiry_stats is None:
+            return rows[:0]
+        forward = expiry_stats.forward if expiry_stats.forward else expiry_stats.underlying_price
+        t = max(expiry_stats.dte_days / 365.0, BlackScholes.MIN_T)
+        k = columns.strike[rows]
+        sigma = columns.iv[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vol = sigma * np.sqrt(t)
+            d2 = (np.log(forward / k) - 0.5 * vol * vol) / vol
+        # P(S_T > K) = N(d2): a put expires worthless above K, a call below it
+        pop = ndtr(d2) if columns.side == "put" else ndtr(-d2)
+        pop = np.where(sigma > 0, pop, np.nan)
+        return rows[self._in_range(pop, sel_cfg.pop_range)]
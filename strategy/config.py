@@ -44,11 +44,37 @@ class ShortIronCondorConfig:
     short_put_delta_range: tuple[float, float] = (-0.30, -0.10) 
     is_use_fixed_delta: bool = True
     short_delta_fixed_target: float = 0.15
+    # research: log the best condor at each of these short deltas every tick, () = off
+    research_delta_targets: tuple = ()
+    # short-leg selection in range mode, a name registered in selection.selection_strategies
+    selection_strategy: str = "delta"
+    em_multiple_range: tuple[float, float] = (1.0, 1.5)  # "iv_weighted": short distance from forward in expected moves
+    pop_range: tuple[float, float] = (0.75, 0.90)  # "probability": short's probability of expiring OTM
+    # research: log the best condor of each of these selection strategies every tick, () = off
+    research_selection_strategies: tuple = ()
     call_spread_width: int = 5
     put_spread_width: int = 5
     spread_width_range: tuple[int, int] = (2,10)
     is_use_fixed_spread_width: bool = True
     fixed_spread_width: int = 5
+
+    # reuse verticals / scored condors from the previous tick when their legs' quotes are unchanged
+    # (condors are reused on the per-pair rank path only; the matrix path rescoring is cheaper than
+    # per-pair lookups, and reuses the verticals of the condors it keeps)
+    is_incremental_selection: bool = True
+    # rank find_best's expiries in parallel: None = sequential, "thread", or "process" (offline replay only)
+    expiry_executor: str = None
+    expiry_executor_workers: int = None  # None = the executor's default
+
+    # Liquidity (tradeable) filter
+    max_rel_spread: float = 0.50  # (ask - bid) / mid
+    min_open_interest: int = None  # None = don't filter on open interest
+    min_volume: int = None  # None = don't filter on volume
+
+    # Black-Scholes fallback for contracts the feed leaves without greeks / IV
+    is_fill_missing_greeks: bool = True
+    risk_free_rate: float = 0.0
+    dividend_yield: float = 0.0
     
     # Position Management
     position_size: int = 1  # contracts per trade
@@ -85,16 +111,25 @@ class ContractSelectionConfig:
     fixed_spread_width: int
     is_use_fixed_delta: bool
     short_delta_fixed_target: float
+    selection_strategy: str = "delta"
+    em_multiple_range: tuple[float, float] = (1.0, 1.5)
+    pop_range: tuple[float, float] = (0.75, 0.90)
 
 @dataclass(frozen=True)
 class IronCondorScoringConfig:
     min_vertical_credit: float = 0.15
     min_credit_ratio: float = 0.30
     top_n_per_side: int = 25
+    # gate verticals on the two minimums above and keep top_n_per_side per side before pairing.
+    # Runs on the spread arrays, so pruned verticals are never built; off keeps the full ranking
+    is_prune_verticals: bool = False
 
     em_buffer: float = 1.10
+    # CondorGate checks, counted on every scored pair; only enforced with is_enforce_gates
+    # (off by default: require_em_ok / min_rr then show up in the funnel counters but don't change the ranking)
     require_em_ok: bool = True
     min_rr: float = 0.35
+    is_enforce_gates: bool = False
 
     check_center_score: bool = True
     check_delta_balance: bool = True
@@ -102,12 +137,27 @@ class IronCondorScoringConfig:
     missing_delta_score: float = 0.1
     missing_centering_score: float = 0.1
 
+    # score all put x call pairs as arrays and keep only the top_k condors (None = all)
+    is_vectorized_rank: bool = True
+    top_k: int = 10
+    # research: also keep a uniform sample of this many non-top condors per expiry, 0 = off
+    reservoir_size: int = 0
+    reservoir_seed: int = None
+    # skip pairs whose score bound can't reach the top_k, on the matrix and per-pair paths
+    # (exact; needs top_k set and weights >= 0, off while reservoir_size > 0)
+    is_branch_and_bound: bool = True
+
     # weights
     w_rr: float = 1.0
     w_cushion: float = 1.0
     w_center: float = 0.5
     w_balance: float = 0.5
-    w_credit: float = 1.2
+    # lognormal terms at the expiry's forward, skipped when its forward / IV aren't known.
+    # All default to 0 so ranking is unchanged until one is turned on.
+    # w_credit (1.2 before) was never read until the EV term was wired to it.
+    w_credit: float = 0.0  # expected value of the credit per unit of max loss
+    w_pop: float = 0.0  # probability of expiring between the short strikes
+    w_touch: float = 0.0  # 1 - probability of touching either short strike
     
 @dataclass
 class TradeDayFilterConfig:
@@ -7,17 +7,19 @@ from models import IronCondorPosition, PositionStatus, FinderResult, PositionOrd
 from selection.contract_selector import ContractSelector
 from strategy.config import ContractSelectionConfig
 from selection.iron_condor_finder import IronCondorFinder
+from analytics.trade_snapshots import TradeSnapshots
 # endregion
 
 class ShortIronCondorStrategy:
     def __init__(self, algo, config, logger: Logger, portfolio_manager: PortfolioManager, 
-        trade_manager: TradeManager, iron_condor_finder: IronCondorFinder):
+        trade_manager: TradeManager, iron_condor_finder: IronCondorFinder, trade_snapshots: TradeSnapshots = None):
         self.algo = algo
         self.config = config
         self.logger = logger
         self.portfolio_manager = portfolio_manager
         self.iron_condor_finder = iron_condor_finder
         self.trade_manager = trade_manager
+        self.trade_snapshots = trade_snapshots
         self.start_trading_at_time = None
         self.symbol = self.config.symbol
         self.dte_target = self.config.days_to_expiration
@@ -43,6 +45,11 @@ class ShortIronCondorStrategy:
             for k, current_position in list(current_positions.items()):
                 self.trade_manager.manage_position(current_position, k)
         
+        if can_trade_pm and self.config.research_delta_targets and self.trade_snapshots:
+            self._log_delta_ladder(self.symbol, current_time, underlying_price)
+        if can_trade_pm and self.config.research_selection_strategies and self.trade_snapshots:
+            self._log_selection_strategies(self.symbol, current_time, underlying_price)
+
         if can_trade and can_trade_pm and self.can_open_position():
             self.logger.info(f'no current positions and can open position {self.algo.time}')
             position = self._get_iron_condor_position(self.symbol, current_time, underlying_price)
@@ -58,8 +65,7 @@ class ShortIronCondorStrategy:
   
     def _get_iron_condor_position(self, symbol, now_time, underlying_price):
         sel_cfg = self._get_contract_selector_config()
-        chain = self.get_chain(symbol)
-        finder_result: FinderResult = self.iron_condor_finder.find_best(now_time, symbol, underlying_price, chain, sel_cfg)
+        finder_result: FinderResult = self.iron_condor_finder.find_best(now_time, symbol, underlying_price, sel_cfg)
         if not finder_result.had_error:
             best_ic = finder_result.get_best_ic_overall()
             if best_ic:
@@ -72,6 +78,28 @@ class ShortIronCondorStrategy:
                 return position
         return None
 
+    def _log_delta_ladder(self, symbol, now_time, underlying_price):
+        sel_cfg = self._get_contract_selector_config()
+        delta_targets = list(self.config.research_delta_targets)
+        finder_results = self.iron_condor_finder.find_best_by_delta_targets(
+            now_time, symbol, underlying_price, sel_cfg, delta_targets)
+        for t, finder_result in finder_results.items():
+            best_ic = None if finder_result.had_error else finder_result.get_best_ic_overall()
+            self.trade_snapshots.add_delta_ladder_snapshot(
+                now_time, underlying_price, t,
+                best_ic.get_expiry() if best_ic else None,
+                best_ic.to_summary_dict() if best_ic else None)
+
+    def _log_selection_strategies(self, symbol, now_time, underlying_price):
+        sel_cfg = self._get_contract_selector_config()
+        finder_results = self.iron_condor_finder.find_best_by_strategies(
+            now_time, symbol, underlying_price, sel_cfg, list(self.config.research_selection_strategies))
+        picks = {}
+        for name, finder_result in finder_results.items():
+            best_ic = None if finder_result.had_error else finder_result.get_best_ic_overall()
+            picks[name] = (best_ic.get_expiry() if best_ic else None, best_ic.to_summary_dict() if best_ic else None)
+        self.trade_snapshots.add_strategy_snapshot(now_time, underlying_price, picks)
+
     def _get_contract_selector_config(self) -> ContractSelectionConfig:
         sel_cfg = ContractSelectionConfig(
             dte_range=self.config.dte_range,
@@ -81,7 +109,10 @@ class ShortIronCondorStrategy:
             is_use_fixed_delta=self.config.is_use_fixed_delta,
             short_delta_fixed_target=self.config.short_delta_fixed_target,
             is_use_fixed_spread_width=self.config.is_use_fixed_spread_width,
-            fixed_spread_width=self.config.fixed_spread_width
+            fixed_spread_width=self.config.fixed_spread_width,
+            selection_strategy=self.config.selection_strategy,
+            em_multiple_range=self.config.em_multiple_range,
+            pop_range=self.config.pop_range
         )
         return sel_cfg
   
@@ -90,6 +121,7 @@ class ShortIronCondorStrategy:
 
     
     def on_end_of_algorithm(self):
+        self.iron_condor_finder.shutdown()
         return self.portfolio_manager.calculate_stats()
 
 
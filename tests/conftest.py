@@ -0,0 +1,83 @@
+import os
+import sys
+import types
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _install_lean_fallback():
+    """
+    Outside LEAN, registers minimal AlgorithmImports / QuantConnect modules so the selection
+    and scoring code imports. Only names the tested modules touch at import time are
+    defined; the engine types are placeholders for annotations. With LEAN available this
+    does nothing.
+    """
+    try:
+        import AlgorithmImports  # noqa: F401
+        return
+    except ImportError:
+        pass
+    import datetime as _datetime
+    import enum
+    import json
+    import math
+    import numpy as np
+    from utils.synthetic_option_contract import OptionRight
+
+    class Resolution(enum.IntEnum):
+        TICK = 0
+        SECOND = 1
+        MINUTE = 2
+        HOUR = 3
+        DAILY = 4
+
+    class DataNormalizationMode(enum.IntEnum):
+        ADJUSTED = 0
+        RAW = 1
+
+    class OrderStatus(enum.IntEnum):
+        NEW = 0
+        SUBMITTED = 1
+        PARTIALLY_FILLED = 2
+        FILLED = 3
+        CANCELED = 5
+        INVALID = 7
+
+    algorithm_imports = types.ModuleType("AlgorithmImports")
+    names = {
+        "np": np, "json": json, "math": math,
+        "datetime": _datetime.datetime, "timedelta": _datetime.timedelta,
+        "date": _datetime.date, "time": _datetime.time,
+        "OptionRight": OptionRight, "Resolution": Resolution, "OrderStatus": OrderStatus,
+        "DataNormalizationMode": DataNormalizationMode,
+    }
+    for placeholder in ("OptionContract", "OptionChain", "OptionStrategy", "OptionStrategies", "OrderTicket",
+        "OrderEvent", "Symbol", "Slice", "QCAlgorithm", "TradeBar", "Scheduling"):
+        names[placeholder] = type(placeholder, (), {})
+    algorithm_imports.__dict__.update(names)
+    sys.modules["AlgorithmImports"] = algorithm_imports
+
+    quant_connect = types.ModuleType("QuantConnect")
+    quant_connect.Resolution = Resolution
+    quant_connect.Scheduling = names["Scheduling"]
+    sys.modules["QuantConnect"] = quant_connect
+
+
+_install_lean_fallback()
+
+
+NOW = datetime(2024, 2, 1, 10)
+EXPIRIES = (datetime(2024, 2, 1), datetime(2024, 2, 2), datetime(2024, 2, 5))
+SPOT = 500.3
+
+
+@pytest.fixture
+def synthetic_chain():
+    """Two-sided SPY chain, 101 strikes per expiry and right, with a linear skew"""
+    from utils.synthetic_option_contract import build_synthetic_chain
+    return build_synthetic_chain("SPY", SPOT, list(EXPIRIES), NOW, iv=0.35)
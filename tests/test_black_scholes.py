@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from conftest import NOW, SPOT
+from analytics.black_scholes import BlackScholes
+from utils.synthetic_option_contract import OptionRight, build_synthetic_chain, _black_scholes
+
+
+def _chain_inputs(chain, now_time):
+    """(strike, t in years, sigma, is_call) arrays for every contract of a synthetic chain"""
+    strike = np.array([c.strike for c in chain])
+    seconds = np.array([(c.expiry.replace(hour=16) - now_time).total_seconds() for c in chain])
+    t = np.maximum(seconds, 60.0) / (365.0 * 86400.0)
+    sigma = np.array([c.implied_volatility for c in chain])
+    is_call = np.array([c.right == OptionRight.CALL for c in chain])
+    return strike, t, sigma, is_call
+
+
+@pytest.mark.parametrize("r", [0.0, 0.05])
+def test_batched_price_and_greeks_match_scalar_closed_form(synthetic_chain, r):
+    strike, t, sigma, is_call = _chain_inputs(synthetic_chain, NOW)
+
+    greeks = BlackScholes.greeks(SPOT, strike, t, sigma, is_call, r=r)
+    price = BlackScholes.price(SPOT, strike, t, sigma, is_call, r=r)
+
+    for i in range(len(strike)):
+        expected_price, expected = _black_scholes(SPOT, strike[i], t[i], sigma[i], r, bool(is_call[i]))
+        assert price[i] == pytest.approx(expected_price, rel=1e-9, abs=1e-12)
+        assert greeks["price"][i] == pytest.approx(expected_price, rel=1e-9, abs=1e-12)
+        assert greeks["delta"][i] == pytest.approx(expected.delta, rel=1e-9, abs=1e-12)
+        assert greeks["gamma"][i] == pytest.approx(expected.gamma, rel=1e-9, abs=1e-12)
+        assert greeks["theta"][i] == pytest.approx(expected.theta, rel=1e-9, abs=1e-9)
+        assert greeks["vega"][i] == pytest.approx(expected.vega, rel=1e-9, abs=1e-12)
+
+
+def test_chain_greeks_match_the_feed(synthetic_chain):
+    # the synthetic chain's greeks stand in for the data feed's
+    strike, t, sigma, is_call = _chain_inputs(synthetic_chain, NOW)
+    greeks = BlackScholes.greeks(SPOT, strike, t, sigma, is_call)
+
+    assert np.allclose(greeks["delta"], [c.greeks.delta for c in synthetic_chain], rtol=1e-9, atol=1e-12)
+    assert np.allclose(greeks["vega"], [c.greeks.vega for c in synthetic_chain], rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("now_time", [NOW, datetime(2024, 2, 1, 15, 55)], ids=["intraday", "near_expiry"])
+def test_price_iv_price_round_trip(now_time):
+    # +-40% strikes: deep OTM and ITM wings on both rights
+    chain = build_synthetic_chain("SPY", SPOT, [datetime(2024, 2, 1), datetime(2024, 3, 15)], now_time,
+        strikes_each_side=200, iv=0.35)
+    strike, t, sigma, is_call = _chain_inputs(chain, now_time)
+    price = BlackScholes.price(SPOT, strike, t, sigma, is_call)
+
+    iv = BlackScholes.implied_vol(price, SPOT, strike, t, is_call)
+
+    intrinsic = np.where(is_call, np.maximum(SPOT - strike, 0.0), np.maximum(strike - SPOT, 0.0))
+    has_time_value = price - intrinsic > 1e-9
+    assert np.all(np.isfinite(iv[has_time_value]))
+    repriced = BlackScholes.price(SPOT, strike, t, iv, is_call)
+    assert np.allclose(repriced[has_time_value], price[has_time_value], rtol=0.0, atol=1e-6)
+    # where the price is sensitive to vol, the solver recovers the vol itself
+    _, vega = BlackScholes._price_vega(SPOT, strike, t, sigma, is_call, 1.0, 1.0, 0.0, 0.0)
+    sensitive = has_time_value & (vega > 1e-2)
+    assert sensitive.sum() > 100
+    assert np.allclose(iv[sensitive], sigma[sensitive], rtol=0.0, atol=1e-4)
+
+
+def test_bracket_fallback_when_newton_fails():
+    s, k, t, sigma = 100.0, 300.0, 0.25, 1.5
+    price = float(BlackScholes.price(s, k, t, sigma, True))
+
+    # plain Newton from the solver's own starting point overshoots below zero vol and breaks down
+    newton = np.clip(np.sqrt(2.0 * np.pi / t) * price / s, 0.05, 1.0)
+    with np.errstate(all="ignore"):
+        for _ in range(50):
+            g = BlackScholes.greeks(s, k, t, newton, True)
+            newton = newton - (g["price"] - price) / (g["vega"] * 100.0)
+    assert not (np.isfinite(newton) and abs(newton - sigma) < 1e-4)
+
+    assert float(BlackScholes.implied_vol(price, s, k, t, True)) == pytest.approx(sigma, abs=1e-6)
+
+
+def test_prices_outside_no_arbitrage_bounds_are_nan():
+    iv = BlackScholes.implied_vol([0.5, 120.0, np.nan, 2.0], 100.0, [90.0, 90.0, 100.0, 100.0], 0.1, True)
+
+    # below intrinsic, above the underlying, missing, and a valid price
+    assert np.isnan(iv[:3]).all()
+    assert np.isfinite(iv[3])
+
+
+def test_scalar_inputs_keep_their_shape():
+    assert np.ndim(BlackScholes.implied_vol(2.0, 100.0, 100.0, 0.1, True)) == 0
+    assert BlackScholes.implied_vol(np.full((2, 3), 2.0), 100.0, 100.0, 0.1, True).shape == (2, 3)
@@ -0,0 +1,121 @@
+import numpy as np
+
+from conftest import NOW, EXPIRIES, SPOT
+from models.selection.candidates import VerticalCandidate
+from selection.chain_diff import ChainDiff, IncrementalSelectionCache
+from selection.chain_snapshot import ChainSnapshot
+from utils.synthetic_option_contract import OptionRight, build_synthetic_chain
+
+
+def _snapshot(quote_changes=()):
+    """Fresh snapshot of the synthetic chain; quote_changes are put strikes on EXPIRIES[1] whose bid moves up a cent"""
+    chain = build_synthetic_chain("SPY", SPOT, list(EXPIRIES), NOW, iv=0.35)
+    for c in chain:
+        if c.expiry == EXPIRIES[1] and c.strike in quote_changes and c.right == OptionRight.PUT:
+            c.bid_price += 0.01
+    return ChainSnapshot(chain, NOW, SPOT)
+
+
+def _vertical(columns, short_row, long_row) -> VerticalCandidate:
+    return VerticalCandidate(
+        side=columns.side,
+        short=columns.contracts[short_row],
+        long=columns.contracts[long_row],
+        width=abs(columns.strike[short_row] - columns.strike[long_row]),
+        credit=columns.mid[short_row] - columns.mid[long_row],
+        credit_ratio=0.0,
+        short_delta=columns.delta[short_row],
+        long_delta=columns.delta[long_row],
+        short_strike=columns.strike[short_row],
+        long_strike=columns.strike[long_row],
+        columns=columns,
+        short_row=short_row,
+        long_row=long_row,
+    )
+
+
+def _puts(snapshot):
+    return snapshot.get_columns(EXPIRIES[1], ChainSnapshot.PUT)
+
+
+def test_changed_mask_flags_only_the_requoted_rows():
+    prev = _snapshot()
+    columns = _puts(prev)
+    changed_strike = columns.strike[40]
+    cur = _snapshot(quote_changes=(changed_strike,))
+
+    diff = ChainDiff(prev, cur)
+    mask = diff.changed_mask(EXPIRIES[1], ChainSnapshot.PUT)
+
+    assert np.flatnonzero(mask).tolist() == [40]
+    assert not diff.changed_mask(EXPIRIES[1], ChainSnapshot.CALL).any()
+    assert diff.count_changed() == 1
+    assert not diff.is_unchanged(_puts(cur), 35, 40)
+    assert diff.is_unchanged(_puts(cur), 35, 36)
+    # no previous snapshot: everything is new
+    assert ChainDiff(None, cur).changed_mask(EXPIRIES[1], ChainSnapshot.PUT).all()
+
+
+def test_vertical_hit_rebinds_to_the_new_slice_and_miss_on_a_quote_change():
+    prev = _snapshot()
+    cache = IncrementalSelectionCache()
+    cache.begin_tick(prev)
+    prev_columns = _puts(prev)
+    unchanged = _vertical(prev_columns, 45, 40)
+    requoted = _vertical(prev_columns, 46, 41)
+    cache.put_vertical(prev_columns, 45, 40, unchanged)
+    cache.put_vertical(prev_columns, 46, 41, requoted)
+
+    cur = _snapshot(quote_changes=(prev_columns.strike[41],))
+    cache.begin_tick(cur)
+    columns = _puts(cur)
+
+    hit = cache.get_vertical(columns, 45, 40)
+    assert hit is unchanged
+    assert hit.columns is columns
+    assert hit.short is columns.contracts[45] and hit.long is columns.contracts[40]
+    assert hit.short is not prev_columns.contracts[45]
+    # the long leg's quote moved, so the vertical is rebuilt
+    assert cache.get_vertical(columns, 46, 41) is None
+    assert cache.stats() == {"vertical_hits": 1, "vertical_misses": 1, "condor_hits": 0, "condor_misses": 0}
+    # a second lookup in the same tick hits the current entry
+    assert cache.get_vertical(columns, 45, 40) is unchanged
+
+
+def test_condor_hit_on_reused_verticals():
+    prev = _snapshot()
+    cache = IncrementalSelectionCache()
+    cache.begin_tick(prev)
+    puts, calls = _puts(prev), prev.get_columns(EXPIRIES[1], ChainSnapshot.CALL)
+    pv, cv = _vertical(puts, 45, 40), _vertical(calls, 55, 60)
+    ic = object()
+    cache.put_condor(pv, cv, SPOT, 4.2, ic, (0.1, 0.2))
+
+    cache.begin_tick(_snapshot())
+
+    assert cache.get_condor(pv, cv) == (SPOT, 4.2, ic, (0.1, 0.2))
+    assert cache.get_condor(pv, _vertical(calls, 56, 61)) is None
+    assert (cache.condor_hits, cache.condor_misses) == (1, 1)
+
+
+def test_begin_tick_drops_entries_not_looked_up_and_ignores_the_same_snapshot():
+    first = _snapshot()
+    cache = IncrementalSelectionCache()
+    cache.begin_tick(first)
+    columns = _puts(first)
+    kept, dropped = _vertical(columns, 45, 40), _vertical(columns, 46, 41)
+    cache.put_vertical(columns, 45, 40, kept)
+    cache.put_vertical(columns, 46, 41, dropped)
+
+    second = _snapshot()
+    cache.begin_tick(second)
+    assert cache.get_vertical(_puts(second), 45, 40) is kept
+    # same slice again: nothing rolls over, the counters stay
+    cache.begin_tick(second)
+    assert cache.vertical_hits == 1
+
+    third = _snapshot()
+    cache.begin_tick(third)
+    assert cache.get_vertical(_puts(third), 45, 40) is kept
+    # not looked up during the second tick, so it's gone by the third
+    assert cache.get_vertical(_puts(third), 46, 41) is None
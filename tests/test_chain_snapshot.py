@@ -0,0 +1,74 @@
+import numpy as np
+
+from conftest import NOW, EXPIRIES, SPOT
+from selection.chain_snapshot import ChainSnapshot, ChainColumns
+from utils.synthetic_option_contract import OptionRight, SyntheticOptionContract, build_synthetic_chain
+
+
+def test_partitions_chain_by_expiry_and_right(synthetic_chain):
+    snapshot = ChainSnapshot(synthetic_chain, NOW, SPOT)
+
+    assert len(snapshot) == len(synthetic_chain)
+    assert snapshot.expiries == sorted(EXPIRIES)
+    for expiry in EXPIRIES:
+        for side, right in ((ChainSnapshot.CALL, OptionRight.CALL), (ChainSnapshot.PUT, OptionRight.PUT)):
+            columns = snapshot.get_columns(expiry, side)
+            assert len(columns) == 101
+            assert np.all(np.diff(columns.strike) > 0)
+            assert all(c.expiry == expiry and c.right == right for c in columns.contracts)
+
+
+def test_columns_match_contract_fields(synthetic_chain):
+    snapshot = ChainSnapshot(synthetic_chain, NOW, SPOT)
+    columns = snapshot.get_columns(EXPIRIES[1], ChainSnapshot.PUT)
+
+    for i, c in enumerate(columns.contracts):
+        assert columns.strike[i] == c.strike
+        assert columns.bid[i] == c.bid_price
+        assert columns.ask[i] == c.ask_price
+        assert columns.mid[i] == (c.bid_price + c.ask_price) / 2.0
+        assert columns.delta[i] == c.greeks.delta
+        assert columns.iv[i] == c.implied_volatility
+        assert columns.oi[i] == c.open_interest
+
+
+def test_missing_quotes_and_greeks():
+    c = SyntheticOptionContract("SPY", EXPIRIES[0], OptionRight.CALL, 500.0, 0.0, 0.0)
+    c.bid_price = c.ask_price = None
+    strike, bid, ask, mid, delta, gamma, theta, vega, iv, oi, volume = ChainColumns.extract(c)
+
+    assert (strike, bid, ask, mid) == (500.0, 0.0, 0.0, 0.0)
+    assert all(np.isnan(x) for x in (delta, gamma, theta, vega, iv))
+
+
+def test_tradeable_mask_is_cached_per_settings(synthetic_chain):
+    columns = ChainSnapshot(synthetic_chain, NOW, SPOT).get_columns(EXPIRIES[0], ChainSnapshot.CALL)
+
+    mask = columns.tradeable_mask(0.10)
+    rel_spread = (columns.ask - columns.bid) / columns.mid
+    assert np.array_equal(mask, rel_spread <= 0.10)
+    assert columns.tradeable_mask(0.10) is mask
+    assert columns.tradeable_mask(0.50) is not mask
+
+
+def test_expiries_in_dte_window(synthetic_chain):
+    snapshot = ChainSnapshot(synthetic_chain, NOW, SPOT)
+
+    assert snapshot.expiries_in_dte_window(0, 0.5) == [EXPIRIES[0]]
+    assert snapshot.expiries_in_dte_window(0, 2) == list(EXPIRIES[:2])
+    assert snapshot.expiries_in_dte_window(1, 7) == list(EXPIRIES[1:])
+    assert snapshot.expiries_in_dte_window(10, 20) == []
+
+
+def test_strike_and_symbol_lookups():
+    chain = build_synthetic_chain("SPY", SPOT, [EXPIRIES[0]], NOW, strikes_each_side=5)
+    snapshot = ChainSnapshot(chain, NOW, SPOT)
+    expiry = EXPIRIES[0]
+
+    assert snapshot.find_strike(expiry, ChainSnapshot.CALL, 503.0).strike == 503.0
+    assert snapshot.find_strike(expiry, ChainSnapshot.CALL, 503.5) is None
+    assert snapshot.nearest_strike(expiry, ChainSnapshot.PUT, 501.6).strike == 502.0
+    # ties go to the lower strike
+    assert snapshot.nearest_strike(expiry, ChainSnapshot.PUT, 501.5).strike == 501.0
+    for c in chain:
+        assert snapshot.get_by_symbol(c.symbol) is c
@@ -0,0 +1,183 @@
+import copy
+import dataclasses
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from conftest import NOW
+from models import ExpiryStats
+from selection.chain_snapshot import ChainSnapshot
+from selection.contract_selector import ContractSelector
+from selection.iron_condor_scorer import IronCondorScorer
+from strategy.config import IronCondorScoringConfig
+from utils.synthetic_option_contract import build_synthetic_chain
+
+# (spot, iv, skew, expiry): calm / skewed / high vol / longer dated
+CHAINS = [
+    (500.3, 0.15, 0.5, datetime(2024, 2, 2)),
+    (498.7, 0.35, 1.5, datetime(2024, 2, 2)),
+    (501.2, 0.60, 0.2, datetime(2024, 2, 1)),
+    (500.0, 0.25, 0.8, datetime(2024, 2, 9)),
+]
+
+
+def _spreads(spot, iv, skew, expiry):
+    """Every put / call credit spread 1-4 wide with a short leg between 0.02 and 0.5 delta"""
+    chain = build_synthetic_chain("SPY", spot, [expiry], NOW, strikes_each_side=25, iv=iv, skew=skew)
+    snapshot = ChainSnapshot(chain, NOW, spot)
+    selector = ContractSelector(logger=None)
+    spreads = []
+    for side in (ChainSnapshot.PUT, ChainSnapshot.CALL):
+        columns = snapshot.get_columns(expiry, side)
+        rows = np.arange(len(columns))
+        shorts = rows[(np.abs(columns.delta) >= 0.02) & (np.abs(columns.delta) <= 0.5)]
+        spreads.append(selector.pairwise_verticals(columns, shorts, rows, (1.0, 4.0), side))
+    dte = snapshot.dte_days_fractional(expiry)
+    em = spot * iv * math.sqrt(dte / 365.0)
+    stats = ExpiryStats(expiry, NOW, dte, spot, iv, iv, iv, em, forward=spot)
+    return spreads[0], spreads[1], em, stats
+
+
+def _verticals(spot, iv, skew, expiry):
+    put_spreads, call_spreads, em, stats = _spreads(spot, iv, skew, expiry)
+    return put_spreads.materialize(), call_spreads.materialize(), em, stats
+
+
+def _pairwise_config(**overrides):
+    # the plain reference scorer: every pair
+    return dataclasses.replace(IronCondorScoringConfig(), is_branch_and_bound=False, **overrides)
+
+
+def _ranked(result, put_verticals, call_verticals):
+    put_index = {id(v): i for i, v in enumerate(put_verticals)}
+    call_index = {id(v): j for j, v in enumerate(call_verticals)}
+    return [(put_index[id(ic.put)], call_index[id(ic.call)], ic.overall_score) for ic in result.all_candidates]
+
+
+def _assert_same_ranking(matrix, pairwise, put_verticals, call_verticals):
+    assert not matrix.had_error and not pairwise.had_error, (matrix.exception, pairwise.exception)
+    m = _ranked(matrix, put_verticals, call_verticals)
+    p = _ranked(pairwise, put_verticals, call_verticals)
+    assert [pair[:2] for pair in m] == [pair[:2] for pair in p]
+    assert [pair[2] for pair in m] == pytest.approx([pair[2] for pair in p], rel=1e-9, abs=1e-9)
+    assert matrix.scored_count == pairwise.scored_count
+    assert matrix.gate_failures == pairwise.gate_failures
+    assert matrix.score_count == pairwise.score_count
+    assert matrix.score_max == pytest.approx(pairwise.score_max, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("chain", CHAINS)
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"top_k": None},
+    {"is_enforce_gates": True},
+    {"check_center_score": False, "check_delta_balance": False},
+    {"w_pop": 2.0, "w_touch": 0.5},
+], ids=["default", "all", "gated", "no_center_balance", "probability"])
+@pytest.mark.parametrize("with_stats", [False, True], ids=["no_stats", "stats"])
+def test_rank_matrix_matches_rank_pairwise(chain, overrides, with_stats):
+    put_verticals, call_verticals, em, stats = _verticals(*chain)
+    spot = chain[0]
+    stats = stats if with_stats else None
+    assert len(put_verticals) * len(call_verticals) > 1000
+
+    scorer = IronCondorScorer(_pairwise_config(**overrides))
+    matrix = scorer.rank_matrix(put_verticals, call_verticals, spot, em, stats)
+    pairwise = scorer.rank_pairwise(put_verticals, call_verticals, spot, em, None, stats)
+
+    _assert_same_ranking(matrix, pairwise, put_verticals, call_verticals)
+
+
+def _legs(result):
+    return [(ic.put.short_row, ic.put.long_row, ic.call.short_row, ic.call.long_row) for ic in result.all_candidates]
+
+
+@pytest.mark.parametrize("chain", CHAINS)
+def test_rank_on_spread_arrays_builds_only_the_kept_legs(chain):
+    put_spreads, call_spreads, em, stats = _spreads(*chain)
+    spot = chain[0]
+    scorer = IronCondorScorer(_pairwise_config(w_pop=2.0, reservoir_size=5, reservoir_seed=7))
+
+    from_arrays = scorer.rank_matrix(put_spreads, call_spreads, spot, em, stats)
+    from_objects = scorer.rank_matrix(put_spreads.materialize(), call_spreads.materialize(), spot, em, stats)
+
+    assert _legs(from_arrays) == _legs(from_objects)
+    assert [ic.overall_score for ic in from_arrays.all_candidates] == pytest.approx(
+        [ic.overall_score for ic in from_objects.all_candidates], rel=1e-12, abs=1e-12)
+    assert len(from_arrays.reservoir) == 5
+    # condors sharing a leg share its VerticalCandidate
+    kept = from_arrays.all_candidates + from_arrays.reservoir
+    assert len({id(ic.put) for ic in kept}) == len({(ic.put.short_row, ic.put.long_row) for ic in kept})
+
+    # the per-pair path materializes the arrays itself
+    pairwise = IronCondorScorer(_pairwise_config(w_pop=2.0, is_vectorized_rank=False))
+    ranked = pairwise.rank(put_spreads, call_spreads, spot, em, None, stats)
+    assert _legs(ranked) == _legs(from_arrays)
+
+
+@pytest.mark.parametrize("chain", CHAINS)
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"is_enforce_gates": True, "require_em_ok": False, "min_rr": 0.2},
+    {"w_pop": 2.0, "w_touch": 0.5, "w_credit": 1.2},
+], ids=["default", "gated", "probability"])
+@pytest.mark.parametrize("with_stats", [False, True], ids=["no_stats", "stats"])
+def test_bounded_rankings_match_the_full_scan(chain, overrides, with_stats):
+    put_verticals, call_verticals, em, stats = _verticals(*chain)
+    spot = chain[0]
+    stats = stats if with_stats else None
+    bounded = IronCondorScorer(dataclasses.replace(IronCondorScoringConfig(), **overrides))
+    full = IronCondorScorer(_pairwise_config(**overrides)).rank_matrix(put_verticals, call_verticals, spot, em, stats)
+
+    for result in (bounded.rank_matrix(put_verticals, call_verticals, spot, em, stats),
+        bounded.rank_branch_and_bound(put_verticals, call_verticals, spot, em, None, stats)):
+        assert not result.had_error, result.exception
+        assert result.pruned_pairs > 0
+        assert len(result.all_candidates) == 10
+        assert result.scored_count + result.pruned_pairs == full.scored_count
+        r = _ranked(result, put_verticals, call_verticals)
+        f = _ranked(full, put_verticals, call_verticals)
+        assert [pair[:2] for pair in r] == [pair[:2] for pair in f]
+        assert [pair[2] for pair in r] == pytest.approx([pair[2] for pair in f], rel=1e-9, abs=1e-9)
+
+
+def test_equal_scores_keep_the_first_pair():
+    put_verticals, call_verticals, em, stats = _verticals(*CHAINS[0])
+    spot = CHAINS[0][0]
+    # every put vertical twice in a row: each score is tied with its copy
+    doubled = [v for pv in put_verticals for v in (pv, copy.copy(pv))]
+
+    scorer = IronCondorScorer(_pairwise_config(top_k=20))
+    matrix = scorer.rank_matrix(doubled, call_verticals, spot, em, stats)
+    pairwise = scorer.rank_pairwise(doubled, call_verticals, spot, em, None, stats)
+
+    _assert_same_ranking(matrix, pairwise, doubled, call_verticals)
+    ranked = _ranked(matrix, doubled, call_verticals)
+    assert any(a[2] == b[2] for a, b in zip(ranked, ranked[1:]))
+    for (i, j, score), (next_i, next_j, next_score) in zip(ranked, ranked[1:]):
+        if score == next_score:
+            # the original (even index) ranks before its copy
+            assert (i, j) < (next_i, next_j)
+    assert ranked[0][0] % 2 == 0
+
+
+@pytest.mark.parametrize("chain", CHAINS)
+def test_prune_verticals_on_arrays_matches_filtering_the_objects(chain):
+    put_spreads, call_spreads, em, stats = _spreads(*chain)
+    config = IronCondorScoringConfig()
+    scorer = IronCondorScorer(config)
+
+    put_kept, call_kept, counts = scorer.prune_verticals(put_spreads, call_spreads)
+
+    for spreads, kept, side_counts in ((put_spreads, put_kept, counts["put"]), (call_spreads, call_kept, counts["call"])):
+        verticals = spreads.materialize()
+        passed = [(v.credit_ratio, v.credit, -seq, v) for seq, v in enumerate(verticals)
+            if v.width > 0 and v.credit >= config.min_vertical_credit and v.credit_ratio >= config.min_credit_ratio]
+        expected = [item[3] for item in sorted(passed, reverse=True)[:config.top_n_per_side]]
+        assert [(v.short_row, v.long_row) for v in kept.materialize()] == [(v.short_row, v.long_row) for v in expected]
+        assert side_counts["input"] == len(verticals)
+        assert side_counts["kept"] == len(kept) == min(len(passed), config.top_n_per_side)
+        assert side_counts["top_n"] == len(passed) - len(kept)
+        assert side_counts["min_credit"] + side_counts["min_credit_ratio"] + side_counts["width"] == len(verticals) - len(passed)
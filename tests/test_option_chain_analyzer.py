@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from conftest import NOW, EXPIRIES, SPOT
+from selection.chain_snapshot import ChainSnapshot
+from selection.option_chain_analyzer import OptionChainAnalyzer
+from strategy.config import ShortIronCondorConfig
+
+
+def test_fill_missing_greeks_writes_only_missing_values(synthetic_chain):
+    snapshot = ChainSnapshot(synthetic_chain, NOW, SPOT)
+    columns = snapshot.get_columns(EXPIRIES[1], ChainSnapshot.CALL)
+    feed = {name: getattr(columns, name).copy() for name in ("iv", "delta", "gamma", "theta", "vega")}
+    no_greeks, no_iv, no_either = 40, 50, 60
+    for name in ("delta", "gamma", "theta", "vega"):
+        getattr(columns, name)[[no_greeks, no_either]] = np.nan
+    columns.iv[[no_iv, no_either]] = np.nan
+    # a feed delta that Black-Scholes wouldn't reproduce
+    columns.delta[no_iv] = 0.123
+
+    filled = OptionChainAnalyzer(None, ShortIronCondorConfig(), None).fill_missing_greeks(snapshot)
+
+    assert filled == 3
+    assert np.flatnonzero(columns.bs_filled).tolist() == [no_greeks, no_either]
+    # the feed's IV prices the greeks of a row that only lacked greeks
+    assert columns.iv[no_greeks] == feed["iv"][no_greeks]
+    for name in ("delta", "gamma", "theta", "vega"):
+        assert getattr(columns, name)[no_greeks] == pytest.approx(feed[name][no_greeks], rel=1e-9, abs=1e-12)
+    # a row that only lacked IV keeps its feed greeks
+    # quotes are rounded to the cent, so IV solved from mid is close but not exact
+    assert columns.iv[no_iv] == pytest.approx(feed["iv"][no_iv], abs=5e-3)
+    assert columns.delta[no_iv] == 0.123
+    assert columns.gamma[no_iv] == feed["gamma"][no_iv]
+    # IV solved from mid, then the greeks from it
+    assert columns.iv[no_either] == pytest.approx(feed["iv"][no_either], abs=5e-3)
+    assert columns.delta[no_either] == pytest.approx(feed["delta"][no_either], abs=5e-3)
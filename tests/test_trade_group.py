@@ -0,0 +1,80 @@
+from models.position.trade_group import TradeGroup
+
+
+STATUSES = ("SUBMITTED", "PARTIALLY_FILLED", "FILLED", "CANCELED")
+
+
+def _recount(group: TradeGroup, phase: str) -> dict:
+    orders = group.opening_orders if phase == "OPEN" else group.closing_orders
+    counts = {}
+    for order in orders:
+        if order.status is not None:
+            counts[order.status] = counts.get(order.status, 0) + 1
+    return counts
+
+
+def _assert_counts_match(group: TradeGroup):
+    for phase in ("OPEN", "CLOSE"):
+        recount = _recount(group, phase)
+        for status in STATUSES:
+            assert group.count_orders_of_status(phase, status) == recount.get(status, 0), (phase, status)
+
+
+def test_status_counts_follow_each_transition():
+    group = TradeGroup("tg-1", 4, "SPY", "short_iron_condor")
+    for order_id in range(4):
+        group.add_opening_order(order_id)
+    _assert_counts_match(group)
+    assert not group.are_all_opening_filled()
+
+    for status in ("SUBMITTED", "PARTIALLY_FILLED", "FILLED"):
+        group.set_order_status(0, "OPEN", status)
+        _assert_counts_match(group)
+    # setting the same status again doesn't count the order twice
+    group.set_order_status(0, "OPEN", "FILLED")
+    assert group.count_orders_of_status("OPEN", "FILLED") == 1
+
+    for order_id in (1, 2, 3):
+        group.set_order_status(order_id, "OPEN", "SUBMITTED")
+        _assert_counts_match(group)
+    group.set_order_status(3, "OPEN", "CANCELED")
+    _assert_counts_match(group)
+    assert group.count_orders_of_status("OPEN", "SUBMITTED") == 2
+    assert group.count_orders_of_status("OPEN", "CANCELED") == 1
+
+    for order_id in (1, 2, 3):
+        group.set_order_status(order_id, "OPEN", "FILLED")
+        _assert_counts_match(group)
+    assert group.are_all_opening_filled()
+    assert group.count_orders_of_status("OPEN", "CANCELED") == 0
+
+    # unknown orders and phases are ignored
+    group.set_order_status(99, "OPEN", "FILLED")
+    group.set_order_status(0, "CLOSE", "FILLED")
+    _assert_counts_match(group)
+    assert group.count_orders_of_status("OPEN", "FILLED") == 4
+
+
+def test_closing_phase_is_counted_separately():
+    group = TradeGroup("tg-2", 2, "SPY", "short_iron_condor")
+    for order_id in (1, 2):
+        group.add_opening_order(order_id)
+        group.set_order_status(order_id, "OPEN", "FILLED")
+
+    # an opening order id isn't re-added as a closing one
+    assert group.add_closing_order(1) is None
+    assert not group.is_order_in_closing(1)
+    for order_id in (11, 12):
+        group.add_closing_order(order_id)
+    group.set_order_status(11, "CLOSE", "SUBMITTED")
+    group.set_order_status(12, "CLOSE", "FILLED")
+    _assert_counts_match(group)
+    assert group.are_all_opening_filled() and not group.are_all_closing_filled()
+
+    group.set_order_status(11, "CLOSE", "FILLED")
+    _assert_counts_match(group)
+    assert group.are_all_closing_filled()
+    assert group.count_orders_of_status("OPEN", "FILLED") == 2
+    # adding an order that's already tracked returns it without resetting its status
+    assert group.add_closing_order(12).status == "FILLED"
+    assert group.count_orders_of_status("CLOSE", "FILLED") == 2
@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytz")
+
+from conftest import NOW, EXPIRIES
+from AlgorithmImports import OrderStatus
+from execution.trade_manager import TradeManager
+from models import ArchivedPosition, IronCondorLegs, IronCondorPosition, PositionStatus, TradeGroup
+from portfolio.portfolio_manager import PortfolioManager
+from strategy.config import ShortIronCondorConfig
+from utils.logger import Logger
+from utils.synthetic_option_contract import OptionRight
+
+
+class _Transactions:
+    def __init__(self):
+        self.canceled = []
+
+    def cancel_order(self, order_id):
+        self.canceled.append(order_id)
+
+
+def _managers():
+    algo = SimpleNamespace(time=NOW, transactions=_Transactions())
+    config = ShortIronCondorConfig()
+    trade_manager = TradeManager(algo, config, Logger(), None, None)
+    portfolio_manager = PortfolioManager(algo, config, Logger())
+    trade_manager.on_position_opened = portfolio_manager.on_position_opened
+    trade_manager.on_position_closed = portfolio_manager.on_position_closed
+    trade_manager.on_order_cancelled = portfolio_manager.on_order_cancelled
+    trade_manager.on_order_submitted = portfolio_manager.on_order_submitted
+    trade_manager.on_trade_group_archived = portfolio_manager.on_trade_group_archived
+    return algo, trade_manager, portfolio_manager
+
+
+def _legs(synthetic_chain):
+    """long put, short put, short call, long call around the spot on EXPIRIES[1]"""
+    by_key = {(c.right, c.strike): c for c in synthetic_chain if c.expiry == EXPIRIES[1]}
+    return (by_key[(OptionRight.PUT, 490.0)], by_key[(OptionRight.PUT, 495.0)],
+        by_key[(OptionRight.CALL, 505.0)], by_key[(OptionRight.CALL, 510.0)])
+
+
+def _submitted_group(trade_manager: TradeManager, synthetic_chain):
+    """What open_position leaves behind once the combo order is sent"""
+    position = IronCondorPosition("SPY", *_legs(synthetic_chain))
+    trade_group = TradeGroup("tg-1", position.total_legs, position.symbol, position.name)
+    trade_manager.trade_groups[trade_group.trade_group_id] = trade_group
+    trade_manager.on_order_submitted(position, trade_group)
+    return position, trade_group
+
+
+def _event(order_id, status, tag, symbol=None, fill_price=0.0):
+    return SimpleNamespace(order_id=order_id, symbol=symbol, fill_price=fill_price,
+        ticket=SimpleNamespace(status=status, tag=tag))
+
+
+def _assert_archived(trade_manager, portfolio_manager, trade_group, order_ids, records):
+    trade_group_id = trade_group.trade_group_id
+    assert trade_group_id not in trade_manager.trade_groups
+    assert not any(order_id in trade_manager.order_to_group for order_id in order_ids)
+    assert trade_group_id not in portfolio_manager.all_positions
+    assert trade_group_id not in portfolio_manager.open_positions
+    assert isinstance(records[trade_group_id], ArchivedPosition)
+    assert portfolio_manager.archived_count == 1
+
+
+def test_closed_group_is_archived(synthetic_chain):
+    algo, trade_manager, portfolio_manager = _managers()
+    position, trade_group = _submitted_group(trade_manager, synthetic_chain)
+    legs = position.opening_legs
+    open_fills = {1: (legs.get_long_put(), 1.0), 2: (legs.get_short_put(), -2.0),
+        3: (legs.get_short_call(), -2.5), 4: (legs.get_long_call(), 1.1)}
+    for order_id, (leg, _) in open_fills.items():
+        trade_manager.on_order_event(_event(order_id, OrderStatus.SUBMITTED, "tg-1:OPEN", leg.symbol))
+    for order_id, (leg, price) in open_fills.items():
+        trade_manager.on_order_event(_event(order_id, OrderStatus.FILLED, "tg-1:OPEN", leg.symbol, price))
+    assert position.status == PositionStatus.OPENED
+    assert "tg-1" in portfolio_manager.open_positions
+
+    position.set_closing_legs(IronCondorLegs("LONG", *_legs(synthetic_chain)))
+    legs = position.closing_legs
+    close_fills = {11: (legs.get_long_put(), -0.5), 12: (legs.get_short_put(), 1.0),
+        13: (legs.get_short_call(), 1.2), 14: (legs.get_long_call(), -0.6)}
+    for order_id, (leg, _) in close_fills.items():
+        trade_manager.on_order_event(_event(order_id, OrderStatus.SUBMITTED, "tg-1:CLOSE", leg.symbol))
+    for order_id, (leg, price) in close_fills.items():
+        assert "tg-1" in trade_manager.trade_groups
+        trade_manager.on_order_event(_event(order_id, OrderStatus.FILLED, "tg-1:CLOSE", leg.symbol, price))
+
+    _assert_archived(trade_manager, portfolio_manager, trade_group, [*open_fills, *close_fills],
+        portfolio_manager.closed_positions)
+    archived = portfolio_manager.closed_positions["tg-1"]
+    assert archived.status == PositionStatus.CLOSED
+    assert archived.exit_pnl == position.get_exit_pnl()
+    assert archived.opening_total_fill_price == position.get_opening_total_fill_price()
+    assert trade_group.are_all_closing_filled()
+    # events for an archived group's orders are ignored
+    trade_manager.on_order_event(_event(11, OrderStatus.FILLED, "tg-1:CLOSE", legs.get_long_put().symbol, -0.5))
+    assert portfolio_manager.archived_count == 1
+
+
+def test_canceled_open_is_archived_once_every_leg_is_canceled(synthetic_chain):
+    algo, trade_manager, portfolio_manager = _managers()
+    position, trade_group = _submitted_group(trade_manager, synthetic_chain)
+    order_ids = [1, 2, 3, 4]
+    for order_id in order_ids:
+        trade_manager.on_order_event(_event(order_id, OrderStatus.SUBMITTED, "tg-1:OPEN"))
+
+    trade_manager.on_order_event(_event(1, OrderStatus.CANCELED, "tg-1:OPEN"))
+    # the legs that didn't fill get a cancel request; the group waits for their confirmations
+    assert algo.transactions.canceled == [2, 3, 4]
+    assert "tg-1" in trade_manager.trade_groups
+    assert portfolio_manager.canceled_positions["tg-1"] is position
+    assert portfolio_manager.archived_count == 0
+
+    for order_id in (2, 3, 4):
+        trade_manager.on_order_event(_event(order_id, OrderStatus.CANCELED, "tg-1:OPEN"))
+
+    assert all(o.status == "CANCELED" for o in trade_group.opening_orders)
+    assert trade_group.count_orders_of_status("OPEN", "CANCELED") == 4
+    _assert_archived(trade_manager, portfolio_manager, trade_group, order_ids, portfolio_manager.canceled_positions)
+    assert portfolio_manager.canceled_positions["tg-1"].status == PositionStatus.CANCELED
+    assert portfolio_manager.canceled_positions["tg-1"].exit_pnl is None
@@ -1,5 +1,2 @@
-# region imports
-from AlgorithmImports import *
-# endregion
-
-# Your New Python File
+# utils is imported without LEAN by the synthetic chain and the tests,
+# so this package init stays free of AlgorithmImports.
@@ -0,0 +1,130 @@
+# region imports
+from datetime import datetime
+import math
+try:
+    from AlgorithmImports import OptionRight
+except ImportError:
+    # outside LEAN, with the same values as QuantConnect's OptionRight
+    from enum import IntEnum
+
+    class OptionRight(IntEnum):
+        CALL = 0
+        PUT = 1
+# endregion
+
+# Pure-Python stand-ins for LEAN's OptionContract and OptionChain.
+# They expose the attributes the selection / scoring code reads so ChainSnapshot
+# and the rest of the pipeline can be exercised and benchmarked off a live slice.
+# Importable without LEAN; tests/conftest.py uses this module's OptionRight then.
+
+class SyntheticGreeks:
+    def __init__(self, delta=None, gamma=None, theta=None, vega=None):
+        self.delta = delta
+        self.gamma = gamma
+        self.theta = theta
+        self.vega = vega
+
+    @property
+    def theta_per_day(self):
+        return self.theta / 365.0 if self.theta is not None else None
+
+
+class SyntheticSymbol:
+    def __init__(self, value: str, canonical: str):
+        self.value = value
+        self.canonical = canonical
+
+    def __str__(self):
+        return self.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __eq__(self, other):
+        return isinstance(other, SyntheticSymbol) and self.value == other.value
+
+    def equals(self, other):
+        return self == other
+
+
+class SyntheticOptionContract:
+    def __init__(self, underlying: str, expiry: datetime, right, strike: float,
+        bid_price: float, ask_price: float, implied_volatility: float = None,
+        greeks: SyntheticGreeks = None, open_interest: float = 0, volume: float = 0):
+        self.expiry = expiry
+        self.right = right
+        self.strike = strike
+        self.bid_price = bid_price
+        self.ask_price = ask_price
+        self.last_price = (bid_price + ask_price) / 2.0
+        self.bid_size = 10
+        self.ask_size = 10
+        self.implied_volatility = implied_volatility
+        self.greeks = greeks
+        self.open_interest = open_interest
+        self.volume = volume
+        cp = "C" if right == OptionRight.CALL else "P"
+        self.symbol = SyntheticSymbol(f"{underlying} {expiry:%y%m%d}{cp}{int(round(strike * 1000)):08d}", underlying)
+
+    # PascalCase aliases some helpers fall back to
+    @property
+    def BidPrice(self):
+        return self.bid_price
+
+    @property
+    def AskPrice(self):
+        return self.ask_price
+
+
+class SyntheticOptionChain(list):
+    @property
+    def contracts(self):
+        return {c.symbol: c for c in self}
+
+
+def build_synthetic_chain(underlying: str, underlying_price: float, expiries: list[datetime], now_time: datetime,
+    strikes_each_side: int = 50, strike_step: float = 1.0, iv: float = 0.15, skew: float = 0.5,
+    rel_spread: float = 0.05, rate: float = 0.0) -> SyntheticOptionChain:
+    """
+    Black-Scholes priced chain with a simple linear skew and proportional bid/ask spread.
+    Quotes are floored at one cent so far wings stay quoted.
+    """
+    chain = SyntheticOptionChain()
+    center = round(underlying_price / strike_step) * strike_step
+    for expiry in expiries:
+        seconds = (expiry.replace(hour=16, minute=0, second=0, microsecond=0) - now_time).total_seconds()
+        t = max(seconds, 60.0) / (365.0 * 86400.0)
+        for k in range(-strikes_each_side, strikes_each_side + 1):
+            strike = center + k * strike_step
+            sigma = max(0.01, iv + skew * (underlying_price - strike) / underlying_price)
+            for right in (OptionRight.CALL, OptionRight.PUT):
+                price, greeks = _black_scholes(underlying_price, strike, t, sigma, rate, right == OptionRight.CALL)
+                half = max(0.01, price * rel_spread / 2.0)
+                bid = max(0.01, round(price - half, 2))
+                ask = max(bid + 0.01, round(price + half, 2))
+                chain.append(SyntheticOptionContract(underlying, expiry, right, strike, bid, ask, sigma, greeks,
+                    open_interest=1000, volume=100))
+    return chain
+
+
+def _norm_cdf(x: float) -> float:
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+def _black_scholes(s, k, t, sigma, r, is_call) -> tuple[float, SyntheticGreeks]:
+    sqrt_t = math.sqrt(t)
+    d1 = (math.log(s / k) + (r + 0.5 * sigma * sigma) * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    pdf = math.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+    disc = math.exp(-r * t)
+    if is_call:
+        price = s * _norm_cdf(d1) - k * disc * _norm_cdf(d2)
+        delta = _norm_cdf(d1)
+        theta = -s * pdf * sigma / (2.0 * sqrt_t) - r * k * disc * _norm_cdf(d2)
+    else:
+        price = k * disc * _norm_cdf(-d2) - s * _norm_cdf(-d1)
+        delta = _norm_cdf(d1) - 1.0
+        theta = -s * pdf * sigma / (2.0 * sqrt_t) + r * k * disc * _norm_cdf(-d2)
+    gamma = pdf / (s * sigma * sqrt_t)
+    vega = s * pdf * sqrt_t / 100.0
+    return price, SyntheticGreeks(delta, gamma, theta, vega)